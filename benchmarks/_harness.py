@@ -0,0 +1,66 @@
+"""
+Shared harness for the benchmarks: command-line options, best-of-N timing,
+and the run that times a vectorized implementation against the reference
+implementation it replaced (src/testing/reference_impls.py) and checks
+that both give the same output.
+"""
+
+import argparse
+import time
+from typing import Callable, Optional
+
+import pandas as pd
+
+
+def benchmark_parser(doc: str, **sizes: int) -> argparse.ArgumentParser:
+    """Parser with one integer option per workload size, plus --repeat and --skip-loop."""
+    parser = argparse.ArgumentParser(description=doc, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for name, default in sizes.items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-loop", action="store_true", help="time only the vectorized implementation")
+    return parser
+
+
+def timed(fn: Callable, df: pd.DataFrame, repeat: int):
+    """Best wall time over `repeat` calls of fn(df), and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def compare(
+    args: argparse.Namespace,
+    fast: tuple,
+    reference: tuple,
+    df: pd.DataFrame,
+    reference_frame: Optional[Callable[[], pd.DataFrame]] = None,
+    check: Optional[Callable] = None,
+    summary: Optional[Callable] = None,
+) -> None:
+    """
+    Time fast = (label, fn) on `df` and, unless --skip-loop, the
+    reference = (label, fn) once on reference_frame() (default `df`),
+    then check the two outputs match. `check(result, expected)` defaults
+    to an equality assert; `summary(result)` adds a note to the fast line.
+    """
+    fast_label, fast_fn = fast
+    reference_label, reference_fn = reference
+
+    fast_s, result = timed(fast_fn, df, args.repeat)
+    note = f"  ({summary(result)})" if summary else ""
+    print(f"{fast_label:<20}: {fast_s:8.3f}s{note}")
+
+    if args.skip_loop:
+        return
+
+    frame = reference_frame() if reference_frame else df
+    reference_s, expected = timed(reference_fn, frame, 1)
+    if check:
+        check(result, expected)
+    else:
+        assert result == expected, f"{fast_label} differs from {reference_label}"
+    print(f"{reference_label:<20}: {reference_s:8.3f}s  ({reference_s / fast_s:.1f}x, identical output)")
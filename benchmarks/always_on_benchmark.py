@@ -0,0 +1,37 @@
+"""
+detect_always_on_high_cost benchmark: one joined per-service table
+filtered as a whole vs the original loop that masks the normalized frame
+once per qualifying service.
+
+Usage:
+    python -m benchmarks.always_on_benchmark               # 200,000 rows, 500 services
+    python -m benchmarks.always_on_benchmark --rows 1000000 --services 2000
+"""
+
+from functools import partial
+
+from benchmarks._harness import benchmark_parser, compare
+from src.intelligence.feature_engineering.cost_features import daily_cost_per_service
+from src.intelligence.leak_detection.rule_based import detect_always_on_high_cost
+from src.testing.generators import service_rows
+from src.testing.reference_impls import always_on_per_service
+
+
+def main() -> None:
+    args = benchmark_parser(__doc__, rows=200_000, services=500).parse_args()
+
+    df = service_rows(args.rows, args.services)
+    print(f"{args.rows:,} rows, {args.services:,} services")
+
+    compare(
+        args,
+        ("joined table", partial(detect_always_on_high_cost, daily_cost_per_service(df))),
+        ("per-service mask", lambda raw: always_on_per_service(raw, daily_cost_per_service(raw))),
+        df,
+        reference_frame=lambda: service_rows(args.rows, args.services, categorical=False),
+        summary=lambda leaks: f"{len(leaks):,} always-on",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+compute_30day_forecast benchmark: batched closed-form least squares vs
+the original per-service np.polyfit loop.
+
+Usage:
+    python -m benchmarks.forecast_benchmark                # 50,000 series x 30 days
+    python -m benchmarks.forecast_benchmark --series 10000 --days 90
+"""
+
+from benchmarks._harness import benchmark_parser, compare
+from src.intelligence.feature_engineering.anomaly_features import compute_30day_forecast
+from src.testing.generators import trending_costs
+from src.testing.reference_impls import forecast_per_service
+
+
+def main() -> None:
+    args = benchmark_parser(__doc__, series=50_000, days=30).parse_args()
+
+    df = trending_costs(args.series, args.days)
+    print(f"{args.series:,} series x {args.days} days = {len(df):,} rows")
+
+    compare(
+        args,
+        ("batched OLS", compute_30day_forecast),
+        ("per-service polyfit", forecast_per_service),
+        df,
+    )
+
+
+if __name__ == "__main__":
+    main()
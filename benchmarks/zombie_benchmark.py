@@ -0,0 +1,34 @@
+"""
+detect_zombie_resources benchmark: per-service p25 thresholds computed
+once vs the original loop that rescans every ratio for each resource.
+
+Usage:
+    python -m benchmarks.zombie_benchmark                  # 5,000 resources, 20 services
+    python -m benchmarks.zombie_benchmark --resources 20000 --services 50
+"""
+
+from functools import partial
+
+from benchmarks._harness import benchmark_parser, compare
+from src.intelligence.leak_detection.rule_based import detect_zombie_resources
+from src.testing.generators import resource_table
+from src.testing.reference_impls import zombie_per_resource
+
+
+def main() -> None:
+    args = benchmark_parser(__doc__, resources=5_000, services=20).parse_args()
+
+    df = resource_table(args.resources, args.services)
+    print(f"{args.resources:,} resources across {args.services} services")
+
+    percentiles = {"_": 1}  # only its presence switches on the per-service thresholds
+    compare(
+        args,
+        ("grouped thresholds", partial(detect_zombie_resources, cost_percentiles=percentiles)),
+        ("per-resource rescan", partial(zombie_per_resource, cost_percentiles=percentiles)),
+        df,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+compute_cost_zscore benchmark: grouped rolling windows vs the original
+one-group-at-a-time loop.
+
+Usage:
+    python -m benchmarks.zscore_benchmark                  # 10,000 series x 30 days
+    python -m benchmarks.zscore_benchmark --series 50000 --days 60
+"""
+
+import pandas as pd
+
+from benchmarks._harness import benchmark_parser, compare
+from src.intelligence.feature_engineering.anomaly_features import compute_cost_zscore
+from src.testing.generators import daily_costs
+from src.testing.reference_impls import zscore_per_service
+
+
+def main() -> None:
+    args = benchmark_parser(__doc__, series=10_000, days=30).parse_args()
+
+    df = daily_costs(args.series, args.days)
+    print(f"{args.series:,} series x {args.days} days = {len(df):,} rows")
+
+    compare(
+        args,
+        ("grouped windows", compute_cost_zscore),
+        ("per-service loop", zscore_per_service),
+        df,
+        check=pd.testing.assert_frame_equal,
+    )
+
+
+if __name__ == "__main__":
+    main()
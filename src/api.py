@@ -3,22 +3,34 @@ FastAPI backend for Smart Cost Leak Detector.
 
 Security policy: AWS credentials are NEVER stored to disk or logged.
 They are used only to create an in-memory boto3 session, then discarded.
+
+Billing data can touch disk in two places:
+- Uploads larger than UPLOAD_SPOOL_BYTES spill to a temporary file, which
+  is deleted when the request ends.
+- The normalized-data cache writes the unified frame (costs, resource IDs,
+  tags) to disk. It is off unless the server sets LEAK_DETECTOR_CACHE_DIR,
+  and then only requests with use_cache=true read or write it.
 """
 
-import io
 import logging
 import math
-from datetime import datetime, timedelta
+import os
+import tempfile
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 import pandas as pd
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field, SecretStr
 
-from src.pipeline import run_pipeline_from_df
+from src.ingestion.cache import cache_key, load_cached, store_cached
+from src.ingestion.csv_loader import CSV_ENGINES, read_billing_source
+from src.normalization.normalize import normalize_billing_df
+from src.pipeline import BACKENDS, run_pipeline_from_df
 
 
 # ===================== HELPERS =====================
@@ -35,6 +47,44 @@ def sanitize_floats(obj):
 
 logger = logging.getLogger(__name__)
 
+# ===================== UPLOAD LIMITS =====================
+
+# Uploads are copied in UPLOAD_CHUNK_BYTES pieces into a spooled buffer that
+# stays in memory up to UPLOAD_SPOOL_BYTES and rolls over to a temp file
+# beyond that, so per-request memory is bounded whatever the upload size.
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+UPLOAD_SPOOL_BYTES = 32 * 1024 * 1024
+MAX_UPLOAD_BYTES   = 10 * 1024 ** 3
+
+# Server-side cache directory; unset keeps normalized billing data off disk
+CACHE_DIR = os.environ.get("LEAK_DETECTOR_CACHE_DIR")
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+) -> tempfile.SpooledTemporaryFile:
+    """
+    Stream an upload into a SpooledTemporaryFile, rewound and ready to read.
+    Writes run in the threadpool, since a rolled-over spool writes to disk.
+
+    Raises:
+        HTTPException(413): upload is larger than max_bytes
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            spool.close()
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload exceeds the {max_bytes // 1024 ** 2:,} MB limit",
+            )
+        await run_in_threadpool(spool.write, chunk)
+    spool.seek(0)
+    return spool
+
 # ===================== APP =====================
 
 app = FastAPI(
@@ -95,37 +145,82 @@ async def analyze_upload(
     api_key: Optional[str] = Form(None),
     no_forecast: bool = Form(False),
     top_untagged: int = Form(20),
+    engine: str = Form("pandas", description="CSV parser engine: pandas / pyarrow"),
+    backend: str = Form("pandas", description="DataFrame backend: pandas / polars"),
+    since: Optional[str] = Form(None, description="Only analyze billing dates on/after YYYY-MM-DD"),
+    until: Optional[str] = Form(None, description="Only analyze billing dates on/before YYYY-MM-DD"),
+    use_cache: bool = Form(False, description="Reuse / store the normalized frame in the server cache, "
+                                              "when the server enables it"),
 ):
     """
-    Analyze billing data from an uploaded CSV or Parquet file.
-    File is parsed in memory — never written to disk.
+    Analyze billing data from an uploaded CSV, Parquet or compressed file.
+
+    The upload is streamed into a size-capped spooled buffer (memory up to
+    UPLOAD_SPOOL_BYTES, then a temp file deleted when the request ends) and
+    parsed chunk by chunk from there; .gz / .zst uploads are decompressed
+    on the fly. With use_cache, on a server with LEAK_DETECTOR_CACHE_DIR
+    set, the normalized frame is also kept in the content-addressed cache
+    on disk so repeat uploads skip parsing.
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
-
-    contents = await file.read()
-    fname = file.filename.lower()
+    if engine not in CSV_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown engine: {engine}")
+    if backend not in BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unknown backend: {backend}")
+    if use_cache and CACHE_DIR is None:
+        raise HTTPException(status_code=400, detail="The normalized-data cache is disabled on this server")
 
     try:
-        if fname.endswith(".parquet") or fname.endswith(".pqt"):
-            df = pd.read_parquet(io.BytesIO(contents))
-        else:
-            df = pd.read_csv(io.BytesIO(contents))
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Failed to parse file: {exc}")
+        since_date = date.fromisoformat(since) if since else None
+        until_date = date.fromisoformat(until) if until else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid date window: {exc}")
 
-    if df.empty:
-        raise HTTPException(status_code=400, detail="Uploaded file contains no data rows")
+    fname = file.filename.lower()
+
+    with await spool_upload(file) as upload:
+        key = None
+        normalized_df = None
+        if use_cache:
+            key = cache_key([upload], provider=provider or None,
+                            since=since_date, until=until_date,
+                            engine=engine, backend=backend)
+            normalized_df = load_cached(key, CACHE_DIR)
+
+        if normalized_df is None:
+            try:
+                # Header is sniffed first — invoices and unknown formats fail fast
+                df = read_billing_source(
+                    upload, fname, engine=engine, provider=provider or None,
+                    since=since_date, until=until_date,
+                )
+            except Exception as exc:
+                raise HTTPException(status_code=400, detail=f"Failed to parse file: {exc}")
+
+            if df.empty:
+                raise HTTPException(status_code=400, detail="Uploaded file contains no data rows")
+
+            try:
+                normalized_df = normalize_billing_df(df, provider or None, backend=backend)
+            except ValueError as exc:
+                raise HTTPException(status_code=422, detail=str(exc))
+
+            if key is not None:
+                store_cached(key, normalized_df, CACHE_DIR)
 
     try:
         result = run_pipeline_from_df(
-            df,
-            provider=provider or None,
+            normalized_df,
+            provider=normalized_df["provider"].iloc[0] if len(normalized_df) else provider,
             use_llm=use_llm,
             llm_max=llm_max,
             api_key=api_key or None,
             no_forecast=no_forecast,
             top_untagged=top_untagged,
+            already_normalized=True,
+            already_daily=True,
+            backend=backend,
         )
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
@@ -268,7 +363,7 @@ def _fetch_cost_explorer(
         resp = ce.get_cost_and_usage(**kwargs)
 
         for result in resp.get("ResultsByTime", []):
-            date_val = pd.to_datetime(result["TimePeriod"]["Start"]).date()
+            date_val = pd.Timestamp(result["TimePeriod"]["Start"])
             for group in result.get("Groups", []):
                 service = group["Keys"][0]
                 cost    = float(group["Metrics"]["BlendedCost"]["Amount"])
@@ -359,7 +454,7 @@ def _fetch_azure_cost_management(
 
         raw_date = str(row_dict.get("UsageDate", ""))
         if len(raw_date) == 8:
-            date_val = pd.to_datetime(raw_date, format="%Y%m%d").date()
+            date_val = pd.to_datetime(raw_date, format="%Y%m%d")
         else:
             continue
 
@@ -0,0 +1,443 @@
+"""
+DuckDB out-of-core engine.
+
+For CURs larger than memory. The raw CSV / Parquet files are scanned by an
+embedded DuckDB database instead of being loaded into pandas: AWS
+normalization and daily pre-aggregation, daily cost per service, the
+per-resource feature table and the orphaned-storage slot join all run
+as SQL, which spills to a local scratch directory when it outgrows
+the memory limit. Only small results — per-service daily costs,
+per-resource features and cost totals, tags and the RI line items — come
+back to pandas, where the other detectors (snapshot sprawl, idle
+databases, untagged resources, ...) and scoring run at resource grain.
+
+Runs fully offline (no DuckDB extensions are used). Optional: requires
+`pip install duckdb`. Importing this module raises ImportError without
+it (see src/pipeline.py).
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+import pandas as pd
+
+from src.ingestion.compression import split_compression
+from src.intelligence.feature_engineering.anomaly_features import compute_cost_zscore
+from src.intelligence.feature_engineering.cost_features import (
+    RESOURCE_FEATURE_COLUMNS,
+    RESOURCE_KEYS,
+)
+from src.intelligence.leak_detection.ri_detector import SAVINGS_PLAN_WASTE_TYPES
+from src.intelligence.leak_detection.structural import (
+    is_block_storage,
+    is_compute,
+    orphaned_storage_leak,
+)
+from src.normalization.aggregation import CREDIT_LINE_ITEM_TYPES, DAILY_GRAIN
+from src.normalization.aws_normalizer import (
+    CUR_TO_UNIFIED,
+    _SLASH_TO_UNDERSCORE,
+    aws_output_columns,
+)
+from src.normalization.schema import (
+    ITEM_TYPE_COLUMN,
+    LINEAGE_COLUMNS,
+    PROVIDER_SIGNALS,
+    RI_EXTRA_COLUMNS,
+    RI_KEY_COLUMNS,
+    RI_SUM_COLUMNS,
+)
+from src.normalization.schema_enforcer import categorize
+from src.normalization.tags import is_tag_column
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+# Table holding the normalized CUR at daily grain
+DAILY_TABLE = "daily"
+
+# DuckDB picks gzip / zstd from the standard extensions only
+_DUCKDB_CODECS = {None: "none", "gzip": "gzip", "zstd": "zstd"}
+
+
+# ===================== SQL HELPERS =====================
+
+def _ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _records(relation) -> List[dict]:
+    """Rows as dicts of plain Python values (NULL → None)."""
+    columns = relation.columns
+    return [dict(zip(columns, row)) for row in relation.fetchall()]
+
+
+def _frame(relation) -> pd.DataFrame:
+    df = relation.df()
+    if "date" in df.columns:
+        df["date"] = df["date"].astype("datetime64[ns]")
+    return categorize(df)
+
+
+# ===================== CONNECTION =====================
+
+def connect(work_dir: str, memory_limit: Optional[str] = None) -> "duckdb.DuckDBPyConnection":
+    """
+    Database file and spill space inside `work_dir`. `memory_limit` is a
+    DuckDB size string ("8GB"); DuckDB's default is 80% of RAM.
+    """
+    con = duckdb.connect(os.path.join(work_dir, "billing.duckdb"))
+    con.execute(f"SET temp_directory = {_literal(os.path.join(work_dir, 'spill'))}")
+    # Lets large aggregations and joins stream instead of buffering to keep row order
+    con.execute("SET preserve_insertion_order = false")
+    if memory_limit:
+        con.execute(f"SET memory_limit = {_literal(memory_limit)}")
+    return con
+
+
+def register_sources(con, paths: Sequence[str]) -> List[str]:
+    """
+    Create the `raw_billing` view over every input file and return its
+    column names. CSV columns are read as text and typed during
+    normalization; parts with different columns are unioned by name.
+    """
+    groups: Dict[Tuple[str, Optional[str]], List[str]] = {}
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        ext, codec = split_compression(path)
+        if codec == "zip":
+            raise ValueError(f"{os.path.basename(path)}: extract zip archives for out-of-core mode")
+        if ext not in (".csv", ".parquet"):
+            raise ValueError(f"{os.path.basename(path)}: out-of-core mode reads CSV or Parquet")
+        groups.setdefault((ext, codec), []).append(path)
+
+    scans = []
+    for (ext, codec), files in groups.items():
+        file_list = "[" + ", ".join(_literal(f) for f in files) + "]"
+        if ext == ".parquet":
+            scans.append(f"SELECT * FROM read_parquet({file_list}, union_by_name = true)")
+        else:
+            scans.append(
+                f"SELECT * FROM read_csv({file_list}, header = true, all_varchar = true, "
+                f"union_by_name = true, compression = {_literal(_DUCKDB_CODECS[codec])})"
+            )
+
+    con.execute("CREATE OR REPLACE VIEW raw_billing AS " + " UNION ALL BY NAME ".join(scans))
+    return con.sql("SELECT * FROM raw_billing LIMIT 0").columns
+
+
+# ===================== NORMALIZATION =====================
+
+def normalize_aws_sql(
+    names: Sequence[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Tuple[str, list]:
+    """
+    (query, parameters) for normalize_aws + aggregate_daily over
+    `raw_billing`: Tax dropped, EBS relabelled, typed, aggregated to
+    DAILY_GRAIN. `line_items` counts the CUR rows behind each daily row.
+    """
+    # CUR column name → raw column, for either header style
+    source = {_SLASH_TO_UNDERSCORE.get(n, n): n for n in names}
+    canonical = {CUR_TO_UNIFIED.get(n, n): raw for n, raw in source.items()}
+
+    def col(name: str) -> str:
+        return _ident(canonical[name])
+
+    service = f"CAST({col('service')} AS VARCHAR)"
+    if "product_product_name" in source:
+        name_col = _ident(source["product_product_name"])
+        service = (
+            f"CASE WHEN {name_col} LIKE '%Elastic Block Store%' THEN 'AmazonEBS' "
+            f"WHEN {service} = 'Amazon Elastic Block Store' THEN 'AmazonEBS' "
+            f"ELSE {service} END"
+        )
+
+    typed = {
+        # ISO 8601 timestamps (and CAST of typed ones) start with the calendar day
+        "date":     f"CAST(TRY_CAST(left(CAST({col('date')} AS VARCHAR), 10) AS DATE) AS TIMESTAMP)",
+        "provider": "'AWS'",
+        "service":  service,
+        "cost":     f"TRY_CAST({col('cost')} AS DOUBLE)",
+    }
+    for name in ("usage",) + RI_SUM_COLUMNS:
+        if name in canonical:
+            typed[name] = f"TRY_CAST({col(name)} AS DOUBLE)"
+        elif name == "usage":
+            typed[name] = "CAST(NULL AS DOUBLE)"
+    for name in ("resource_id", "region"):
+        typed[name] = f"CAST({col(name)} AS VARCHAR)" if name in canonical else "CAST(NULL AS VARCHAR)"
+    for name in aws_output_columns(canonical):
+        if name not in typed:
+            typed[name] = f"CAST({col(name)} AS VARCHAR)"
+
+    where = []
+    if "line_item_line_item_type" in canonical:
+        where.append(f"{col('line_item_line_item_type')} IS DISTINCT FROM 'Tax'")
+    filtered = [f"{_ident(c)} IS NOT NULL" for c in ("date", "service", "cost")]
+    params: list = []
+    if since:
+        filtered.append("date >= ?")
+        params.append(since)
+    if until:
+        filtered.append("date <= ?")
+        params.append(until)
+
+    keys = [c for c in DAILY_GRAIN + RI_KEY_COLUMNS if c in typed]
+    sums = [c for c in ("cost", "usage") + RI_SUM_COLUMNS if c in typed]
+    carried = [c for c in typed if c not in keys and c not in sums]
+
+    # As aggregate_daily: zero-cost rows go only without usage or as credits
+    no_signal = ["coalesce(sum(usage), 0) = 0" if "usage" in sums else "true"]
+    if ITEM_TYPE_COLUMN in keys:
+        credits = ", ".join(_literal(t) for t in CREDIT_LINE_ITEM_TYPES)
+        no_signal.append(f"coalesce({_ident(ITEM_TYPE_COLUMN)} IN ({credits}), false)")
+
+    select = ",\n    ".join(f"{expr} AS {_ident(name)}" for name, expr in typed.items())
+    aggregates = (
+        [_ident(c) for c in keys]
+        + [f"sum({_ident(c)}) AS {_ident(c)}" for c in sums]
+        # any_value skips NULLs: a resource's first non-null tag, as in aggregate_daily
+        + [f"any_value({_ident(c)}) AS {_ident(c)}" for c in carried]
+        + ["count(*) AS line_items"]
+    )
+    query = (
+        f"WITH typed AS (\n  SELECT\n    {select}\n  FROM raw_billing"
+        + (f"\n  WHERE {' AND '.join(where)}" if where else "")
+        + f"\n)\nSELECT {', '.join(aggregates)}\nFROM typed\n"
+        f"WHERE {' AND '.join(filtered)}\n"
+        f"GROUP BY {', '.join(_ident(c) for c in keys)}\n"
+        f"HAVING NOT (sum(cost) = 0 AND ({' OR '.join(no_signal)}))"
+    )
+    return query, params
+
+
+def load_daily(
+    con,
+    paths: Sequence[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Tuple[List[str], int, int]:
+    """
+    Normalize the AWS CUR files into the DAILY_TABLE table. Returns the
+    table's columns, its row count and the number of CUR line items
+    behind it.
+
+    Raises:
+        ValueError: the inputs aren't an AWS CUR or hold no billable rows
+    """
+    names = register_sources(con, paths)
+    found = set(names)
+    if not found & set(PROVIDER_SIGNALS["AWS"]):
+        raise ValueError("Out-of-core mode supports AWS CUR exports only")
+    missing = [c for c in ("line_item_usage_start_date", "product_servicecode", "line_item_unblended_cost")
+               if c not in {_SLASH_TO_UNDERSCORE.get(n, n) for n in names}]
+    if missing:
+        raise ValueError(f"CUR is missing required columns: {missing}")
+
+    query, params = normalize_aws_sql(names, since, until)
+    con.execute(f"CREATE OR REPLACE TABLE {DAILY_TABLE} AS {query}", params)
+
+    rows, line_items = con.sql(
+        f"SELECT count(*), coalesce(sum(line_items), 0) FROM {DAILY_TABLE}"
+    ).fetchone()
+    if not rows:
+        raise ValueError("No data rows in any input")
+    logger.info(f"Out-of-core normalization: {line_items:,} line items → {rows:,} daily rows")
+    columns = [c for c in con.sql(f"SELECT * FROM {DAILY_TABLE} LIMIT 0").columns if c != "line_items"]
+    return columns, int(rows), int(line_items)
+
+
+# ===================== FEATURES =====================
+
+def compute_features(con) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(daily_cost_df with z-scores, resource_features table), as the pandas stages return them."""
+    daily_cost = _frame(con.sql(f"""
+        SELECT date, provider, service, sum(cost) AS daily_cost
+        FROM {DAILY_TABLE}
+        GROUP BY date, provider, service
+        ORDER BY date, provider, service
+    """))
+
+    resources = _frame(con.sql(f"""
+        SELECT provider, service, resource_id,
+               count(DISTINCT date) AS days_active,
+               coalesce(sum(cost), 0) AS total_cost,
+               sum(usage) AS total_usage,
+               sum(usage) / nullif(sum(cost) FILTER (WHERE usage IS NOT NULL), 0)
+                   AS usage_to_cost_ratio,
+               min(date) AS first_seen,
+               max(date) AS last_seen
+        FROM {DAILY_TABLE}
+        WHERE resource_id IS NOT NULL
+        GROUP BY provider, service, resource_id
+        ORDER BY provider, service, resource_id
+    """))
+    for column in ("first_seen", "last_seen"):
+        resources[column] = resources[column].astype("datetime64[ns]")
+    resources = resources.set_index(RESOURCE_KEYS)[RESOURCE_FEATURE_COLUMNS]
+
+    return compute_cost_zscore(daily_cost), resources
+
+
+def resource_totals(con, columns: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Total cost per (provider, service, resource_id) — a unified frame at
+    resource grain, enough for cost percentiles, the untagged detector and
+    the lineage index. Split by region and usage type when the CUR has
+    them, since the lineage index classifies and links resources by them.
+    """
+    keys = ["provider", "service", "resource_id"] + [
+        c for c in ("region",) + LINEAGE_COLUMNS if c in columns
+    ]
+    grouped = ", ".join(_ident(c) for c in keys)
+    return _frame(con.sql(f"""
+        SELECT {grouped}, sum(cost) AS cost
+        FROM {DAILY_TABLE}
+        GROUP BY {grouped}
+        ORDER BY min(date), {grouped}
+    """))
+
+
+def tag_rows(con, columns: Sequence[str]) -> pd.DataFrame:
+    """Distinct resource rows with their tag columns, for build_tag_table."""
+    tags = [c for c in columns if is_tag_column(c)]
+    selected = ", ".join(_ident(c) for c in ["provider", "service", "resource_id"] + tags)
+    return _frame(con.sql(f"SELECT DISTINCT {selected} FROM {DAILY_TABLE}"))
+
+
+def ri_rows(con, columns: Sequence[str]) -> pd.DataFrame:
+    """Daily rows detect_reserved_instance_waste reads: Savings Plan waste and unused RI hours."""
+    conditions = []
+    if "line_item_line_item_type" in columns:
+        types = ", ".join(_literal(t) for t in SAVINGS_PLAN_WASTE_TYPES)
+        conditions.append(f"line_item_line_item_type IN ({types})")
+    if "reservation_unused_quantity" in columns and "reservation_unused_recurring_fee" in columns:
+        conditions.append("reservation_unused_quantity > 0")
+    if not conditions:
+        return pd.DataFrame()
+
+    selected = ", ".join(
+        _ident(c) for c in ["date", "provider", "service", "cost"] if c in columns
+    ) + "".join(f", {_ident(c)}" for c in RI_EXTRA_COLUMNS if c in columns)
+    return _frame(con.sql(
+        f"SELECT {selected} FROM {DAILY_TABLE} WHERE {' OR '.join(conditions)}"
+    ))
+
+
+# ===================== STRUCTURAL DETECTORS =====================
+
+def _register_service_roles(con) -> None:
+    """
+    Classify each distinct (provider, service) with the detectors' own
+    keyword helpers, so the SQL join below matches them exactly.
+    """
+    services = con.sql(f"SELECT DISTINCT provider, service FROM {DAILY_TABLE}").fetchall()
+    roles = pd.DataFrame(
+        [
+            {
+                "provider":         provider,
+                "service":          service,
+                "is_compute":       is_compute(service, provider),
+                "is_block_storage": is_block_storage(service, provider),
+            }
+            for provider, service in services
+        ],
+        columns=["provider", "service", "is_compute", "is_block_storage"],
+    )
+    con.register("service_roles_df", roles)
+    con.execute("CREATE OR REPLACE TEMP TABLE service_roles AS SELECT * FROM service_roles_df")
+    con.unregister("service_roles_df")
+
+
+_RESOURCE_ROWS = f"""
+    SELECT d.*, r.is_compute, r.is_block_storage
+    FROM {DAILY_TABLE} d
+    JOIN service_roles r ON d.provider = r.provider AND d.service = r.service
+    WHERE d.resource_id IS NOT NULL AND d.resource_id <> ''
+"""
+
+
+def detect_orphaned_storage(con) -> List[Dict]:
+    """Block storage whose (provider, date, region) slots never saw compute running."""
+    rows = con.sql(f"""
+        WITH resource_rows AS ({_RESOURCE_ROWS}),
+        slots AS (
+            SELECT *, coalesce(nullif(region, ''), 'unknown') AS slot_region
+            FROM resource_rows
+        ),
+        compute_slots AS (
+            SELECT DISTINCT provider, date, slot_region FROM slots WHERE is_compute
+        )
+        SELECT s.resource_id,
+               arg_min(s.provider, s.date) AS provider,
+               arg_min(s.service, s.date) AS service
+        FROM slots s
+        LEFT JOIN compute_slots c
+          ON s.provider = c.provider AND s.date = c.date AND s.slot_region = c.slot_region
+        WHERE s.is_block_storage AND NOT s.is_compute
+        GROUP BY s.resource_id
+        HAVING count(c.date) = 0
+        ORDER BY s.resource_id
+    """)
+    return [
+        orphaned_storage_leak(r["provider"], r["service"], r["resource_id"])
+        for r in _records(rows)
+    ]
+
+
+# ===================== ANALYSIS =====================
+
+def analyze(
+    paths: Sequence[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    spill_dir: Optional[str] = None,
+    memory_limit: Optional[str] = None,
+) -> dict:
+    """
+    Run every SQL stage over the CUR files and return the small results
+    the pipeline scores in pandas:
+
+        columns, line_items, daily_rows, daily_cost_df, resource_df,
+        resource_totals, tag_rows, ri_rows, orphaned_leaks
+
+    orphaned_leaks are candidates the pipeline still checks against the
+    lineage index built from resource_totals and the tags.
+
+    Scratch data lives in a fresh directory under `spill_dir` (default:
+    the system temp directory) and is removed afterwards.
+    """
+    work_dir = tempfile.mkdtemp(prefix="cost-leak-duckdb-", dir=spill_dir)
+    logger.info(f"Out-of-core analysis: {len(paths)} input(s), scratch space {work_dir}")
+    con = connect(work_dir, memory_limit)
+    try:
+        columns, daily_rows, line_items = load_daily(con, paths, since, until)
+        daily_cost_df, resource_df = compute_features(con)
+        _register_service_roles(con)
+        return {
+            "columns":          columns,
+            "line_items":       line_items,
+            "daily_rows":       daily_rows,
+            "daily_cost_df":    daily_cost_df,
+            "resource_df":      resource_df,
+            "resource_totals":  resource_totals(con, columns),
+            "tag_rows":         tag_rows(con, columns),
+            "ri_rows":          ri_rows(con, columns),
+            "orphaned_leaks":   detect_orphaned_storage(con),
+        }
+    finally:
+        con.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,211 @@
+"""
+PyArrow CSV engine.
+
+Parses billing CSVs with pyarrow's multithreaded reader using explicit
+per-provider column types, so numbers and timestamps are converted once
+in native code instead of being inferred by pandas and re-coerced by the
+normalizers. Column projection matches the pandas engine in chunked_reader.
+"""
+
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from src.ingestion.chunked_reader import (
+    STRING_COLUMNS,
+    date_column,
+    filter_date_window,
+    header_provider,
+    read_header,
+    select_columns,
+    window_bounds,
+)
+
+logger = logging.getLogger(__name__)
+
+# ===================== PROVIDER SCHEMAS =====================
+
+_TS = pa.timestamp("s")
+# CUR timestamps are ISO 8601 in UTC ("2025-01-01T00:00:00Z", sometimes
+# with milliseconds), which only parse into a zone-aware type
+_TS_UTC = pa.timestamp("ms", tz="UTC")
+_F64 = pa.float64()
+_STR = pa.string()
+
+PROVIDER_SCHEMAS: Dict[str, Dict[str, pa.DataType]] = {
+    "AWS": {
+        "line_item_usage_start_date":       _TS_UTC,
+        "lineItem/UsageStartDate":          _TS_UTC,
+        "bill_billing_period_start_date":   _TS_UTC,
+        "line_item_unblended_cost":         _F64,
+        "lineItem/UnblendedCost":           _F64,
+        "line_item_usage_amount":           _F64,
+        "lineItem/UsageAmount":             _F64,
+        "line_item_unblended_rate":         _F64,
+        "reservation_unused_quantity":      _F64,
+        "reservation_unused_recurring_fee": _F64,
+        "line_item_usage_account_id":       _STR,
+        "lineItem/UsageAccountId":          _STR,
+        "bill_payer_account_id":            _STR,
+        "bill/PayerAccountId":              _STR,
+        "line_item_resource_id":            _STR,
+        "lineItem/ResourceId":              _STR,
+        "line_item_line_item_type":         _STR,
+        "lineItem/LineItemType":            _STR,
+        "product_servicecode":              _STR,
+        "product/servicecode":              _STR,
+        "product_region":                   _STR,
+        "product/region":                   _STR,
+    },
+    # Cost Management, EA and MCA exports share one schema — only the
+    # columns actually present in the header are applied.
+    "AZURE": {
+        "UsageDate":              _TS,
+        "Date":                   _TS,
+        "date":                   _TS,
+        "BillingPeriodStartDate": _TS,
+        "billingPeriodStartDate": _TS,
+        "CostInUSD":              _F64,
+        "Cost":                   _F64,
+        "PreTaxCost":             _F64,
+        "CostInBillingCurrency":  _F64,
+        "costInUSD":              _F64,
+        "cost":                   _F64,
+        "Usage":                  _F64,
+        "Quantity":               _F64,
+        "UsageQuantity":          _F64,
+        "quantity":               _F64,
+        "usageQuantity":          _F64,
+        "SubscriptionId":         _STR,
+        "ResourceId":             _STR,
+        "InstanceId":             _STR,
+        "resourceId":             _STR,
+        "Tags":                   _STR,
+    },
+    "GCP": {
+        "usage_start_time":    _TS,
+        "cost":                _F64,
+        "usage_amount":        _F64,
+        "billing_account_id":  _STR,
+        "project_id":          _STR,
+        "service_description": _STR,
+        "resource_name":       _STR,
+        "region":              _STR,
+    },
+}
+
+# Date layouts seen across providers: ISO 8601 (AWS/MCA), GCP flat export
+# with a trailing zone name, and the US-style dates in EA exports.
+TIMESTAMP_PARSERS = [
+    pa_csv.ISO8601,
+    "%Y-%m-%d %H:%M:%S UTC",
+    "%m/%d/%Y",
+]
+
+
+# ===================== HELPERS =====================
+
+def _column_types(
+    header: List[str],
+    columns: Optional[List[str]],
+    provider: Optional[str],
+) -> Dict[str, pa.DataType]:
+    wanted = set(columns if columns is not None else header)
+    types = {c: _STR for c in STRING_COLUMNS if c in wanted}
+    schema = PROVIDER_SCHEMAS.get((provider or "").upper(), {})
+    types.update({c: t for c, t in schema.items() if c in wanted})
+    return types
+
+
+def _read(source, columns, column_types, delimiter) -> pa.Table:
+    return pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types=column_types,
+            timestamp_parsers=TIMESTAMP_PARSERS,
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _filter_window(
+    table: pa.Table,
+    since: Optional[date],
+    until: Optional[date],
+):
+    """
+    Apply the billing-date window to naive or UTC timestamp columns in Arrow.
+    Returns the table and, for any other date column, the column name
+    left for filter_date_window after conversion to pandas.
+    """
+    col = date_column(table.column_names)
+    if col is None or (since is None and until is None):
+        return table, None
+
+    field_type = table.schema.field(col).type
+    if not pa.types.is_timestamp(field_type) or field_type.tz not in (None, "UTC"):
+        return table, col
+
+    lower, upper = window_bounds(since, until)
+    mask = None
+    if lower is not None:
+        mask = pc.greater_equal(table[col], pa.scalar(lower, type=field_type))
+    if upper is not None:
+        below = pc.less(table[col], pa.scalar(upper, type=field_type))
+        mask = below if mask is None else pc.and_(mask, below)
+    return table.filter(mask), None
+
+
+# ===================== READER =====================
+
+def read_csv_arrow(
+    source,
+    provider: Optional[str] = None,
+    project: bool = True,
+    nrows: Optional[int] = None,
+    delimiter: str = ",",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Parse a billing CSV with pyarrow, in parallel, using the provider's
+    column types. Provider is inferred from the header when not given.
+
+    A value that doesn't fit its declared type (e.g. a timestamp with an
+    unexpected zone offset) makes pyarrow reject the whole column; in that
+    case the file is re-read with only identifier columns typed and the
+    normalizers' own coercion takes over.
+
+    Raises:
+        pandas.errors.EmptyDataError: source has no header
+    """
+    header = read_header(source, sep=delimiter)
+    columns = select_columns(header) if project else None
+    provider = provider or header_provider(header)
+
+    column_types = _column_types(header, columns, provider)
+    try:
+        table = _read(source, columns, column_types, delimiter)
+    except pa.ArrowInvalid as exc:
+        logger.warning(f"Typed parse failed ({exc}) — retrying with inferred types")
+        if hasattr(source, "seek"):
+            source.seek(0)
+        fallback = {c: t for c, t in column_types.items() if t == _STR}
+        table = _read(source, columns, fallback, delimiter)
+
+    table, pending_col = _filter_window(table, since, until)
+    if nrows is not None:
+        table = table.slice(0, nrows)
+
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    if pending_col is not None:
+        df = filter_date_window(df, pending_col, since, until)
+    return df
@@ -1,7 +1,14 @@
 import pandas as pd
 import os
 from typing import Tuple, Dict, Optional
-from datetime import datetime
+from datetime import date, datetime
+
+from src.ingestion.compression import split_compression
+from src.ingestion.csv_loader import (
+    PARQUET_EXTENSIONS,
+    load_billing_archive,
+    read_billing_source,
+)
 
 
 # ===================== AWS CUR COLUMN MAPPINGS =====================
@@ -48,22 +55,38 @@ SERVICE_CODE_MAPPING = {
 
 def load_aws_cur_file(
     file_path: str,
-    sample_rows: Optional[int] = None
+    sample_rows: Optional[int] = None,
+    project: bool = True,
+    engine: str = "pandas",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
 ) -> pd.DataFrame:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    file_ext = os.path.splitext(file_path)[1].lower()
+    file_ext, codec = split_compression(file_path)
 
-    if file_ext == ".csv":
-        df = pd.read_csv(file_path, nrows=sample_rows)
-    elif file_ext in [".parquet", ".pqt"]:
-        df = pd.read_parquet(file_path)
-        if sample_rows:
-            df = df.head(sample_rows)
-    else:
+    if file_ext not in (".csv",) + PARQUET_EXTENSIONS and codec != "zip":
         raise ValueError(f"Unsupported file format: {file_ext}. Use CSV or Parquet.")
 
+    try:
+        if codec == "zip":
+            df = load_billing_archive(
+                file_path, engine=engine, since=since, until=until
+            ).get("AWS")
+            if df is None:
+                raise ValueError("Archive contains no AWS CUR export")
+            if sample_rows is not None:
+                df = df.head(sample_rows)
+        else:
+            df = read_billing_source(
+                file_path, file_path, engine=engine, project=project,
+                nrows=sample_rows, provider="AWS",
+                since=since, until=until,
+            )
+    except pd.errors.EmptyDataError:
+        raise ValueError("File contains no data rows")
+
     if df.empty:
         raise ValueError("File contains no data rows")
 
@@ -0,0 +1,211 @@
+"""
+Content-addressed cache of normalized billing data.
+
+Parsing and normalizing a large export dominates run time, yet repeated
+runs over the same file (with different --llm / --top-untagged /
+--no-forecast flags) produce the same unified frame every time. Entries
+here are keyed by a hash of the input bytes, the normalizer version and
+the load parameters (provider, date window, CSV engine, backend), and
+stored as uncompressed Arrow IPC (Feather v2) files. A read maps the file
+and converts it to pandas in one copy, with no parsing or decompression.
+The directory is bounded in size with least-recently-used eviction.
+
+Inspect or purge from the command line:
+    python -m src.ingestion.cache list
+    python -m src.ingestion.cache purge [--older-than-days N]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from src.normalization.schema import NORMALIZER_VERSION
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+DEFAULT_CACHE_DIR = os.path.join("data", "processed", "unified")
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_EXTENSION = ".arrow"
+
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+# ===================== KEYS =====================
+
+def _hash_source(digest, source) -> None:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            _hash_source(digest, f)
+        return
+    source.seek(0)
+    for block in iter(lambda: source.read(_HASH_BLOCK_BYTES), b""):
+        digest.update(block)
+    source.seek(0)
+
+
+def cache_key(sources: Sequence, **params) -> str:
+    """
+    Cache key for the unified frame built from `sources` (paths or
+    seekable binary file objects) with the given load parameters
+    (provider, date window, engine, backend, ...). Parameters set to None
+    are ignored.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"normalizer={NORMALIZER_VERSION}".encode())
+    for name, value in sorted(params.items()):
+        if value is not None:
+            digest.update(f"|{name}={value}".encode())
+    for source in sources:
+        digest.update(b"|source")
+        _hash_source(digest, source)
+    return digest.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, key + CACHE_EXTENSION)
+
+
+# ===================== READ / WRITE =====================
+
+def load_cached(key: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[pd.DataFrame]:
+    """Return the cached unified frame for `key`, or None on a miss."""
+    path = _entry_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid) as exc:
+        logger.warning(f"Discarding unreadable cache entry {key[:12]}: {exc}")
+        os.remove(path)
+        return None
+
+    # Touch so LRU eviction sees the entry as recently used
+    os.utime(path)
+    logger.info(f"Cache hit {key[:12]} — {table.num_rows:,} rows")
+    return table.to_pandas()
+
+
+def store_cached(
+    key: str,
+    df: pd.DataFrame,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+) -> Optional[str]:
+    """
+    Write `df` under `key` and evict old entries past `max_bytes`.
+    Returns the entry path, or None if the frame can't be stored in Arrow.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(key, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Uncompressed so reads map the file without decompressing
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+        logger.warning(f"Normalized frame not cacheable: {exc}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+    os.replace(tmp_path, path)
+    evict(cache_dir, max_bytes)
+    return path
+
+
+# ===================== MAINTENANCE =====================
+
+def cache_entries(cache_dir: str = DEFAULT_CACHE_DIR) -> List[Dict]:
+    """Cache entries, most recently used first."""
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(CACHE_EXTENSION):
+            continue
+        stat = os.stat(os.path.join(cache_dir, name))
+        entries.append({
+            "key":       name[:-len(CACHE_EXTENSION)],
+            "size":      stat.st_size,
+            "last_used": stat.st_mtime,
+        })
+    return sorted(entries, key=lambda e: e["last_used"], reverse=True)
+
+
+def evict(cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> List[str]:
+    """Remove least-recently-used entries until the cache fits `max_bytes`."""
+    entries = cache_entries(cache_dir)
+    total = sum(e["size"] for e in entries)
+    removed = []
+    while entries and total > max_bytes:
+        oldest = entries.pop()
+        os.remove(_entry_path(oldest["key"], cache_dir))
+        total -= oldest["size"]
+        removed.append(oldest["key"])
+    if removed:
+        logger.info(f"Cache eviction: removed {len(removed)} entries")
+    return removed
+
+
+def purge(cache_dir: str = DEFAULT_CACHE_DIR, older_than_days: Optional[float] = None) -> List[str]:
+    """Remove all entries, or only those unused for `older_than_days`."""
+    cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+    removed = []
+    for entry in cache_entries(cache_dir):
+        if cutoff is None or entry["last_used"] < cutoff:
+            os.remove(_entry_path(entry["key"], cache_dir))
+            removed.append(entry["key"])
+    return removed
+
+
+# ===================== CLI =====================
+
+def _format_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} TB"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.ingestion.cache",
+        description="Inspect or purge the normalized billing data cache",
+    )
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List cache entries, most recently used first")
+    purge_cmd = commands.add_parser("purge", help="Delete cache entries")
+    purge_cmd.add_argument("--older-than-days", type=float,
+                           help="Only delete entries unused for this many days")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        entries = cache_entries(args.dir)
+        for e in entries:
+            used = datetime.fromtimestamp(e["last_used"]).strftime("%Y-%m-%d %H:%M")
+            print(f"{e['key'][:16]}  {_format_size(e['size']):>10}  last used {used}")
+        total = sum(e["size"] for e in entries)
+        print(f"{len(entries)} entries, {_format_size(total)} in {args.dir}")
+    else:
+        removed = purge(args.dir, args.older_than_days)
+        print(f"Removed {len(removed)} entries from {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Chunked, column-projected CSV reader.
+
+Monthly CUR exports carry 150+ columns and tens of millions of rows, but the
+normalizers and detectors only ever read a few dozen of those columns.
+This reader streams the file in row chunks and materializes only the
+projected columns, so peak memory grows with the projected width instead
+of the raw file width.
+"""
+
+import logging
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterator, List, Optional, Set
+
+import pandas as pd
+
+from src.normalization.aws_normalizer import _SLASH_TO_UNDERSCORE
+from src.normalization.azure_normalizer import AZURE_COLUMN_CANDIDATES
+from src.normalization.gcp_normalizer import GCP_SOURCE_COLUMNS
+from src.normalization.schema import PROVIDER_SIGNALS, RI_SOURCE_COLUMNS, UNIFIED_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+DEFAULT_CHUNK_ROWS = 250_000
+
+# Ownership metadata lives in free-form tag / label columns whose names
+# vary per account — keep any column that looks like one.
+TAG_COLUMN_PREFIXES = ("resource_tags", "resourcetags", "label", "tags")
+TAG_COLUMN_KEYWORDS = ("owner", "project", "environment")
+
+# Columns coerced to float per chunk — bad values become NaN here rather
+# than being re-parsed by every downstream consumer.
+NUMERIC_COLUMNS = {
+    "line_item_unblended_cost", "lineItem/UnblendedCost",
+    "line_item_usage_amount",   "lineItem/UsageAmount",
+    "reservation_unused_quantity",
+    "reservation_unused_recurring_fee",
+    "cost", "usage", "usage_amount",
+}
+
+# Identifier columns that look numeric but must stay strings
+# (account IDs lose leading zeros when parsed as integers).
+STRING_COLUMNS = {
+    "line_item_usage_account_id", "lineItem/UsageAccountId",
+    "bill_payer_account_id",      "bill/PayerAccountId",
+    "line_item_resource_id",      "lineItem/ResourceId",
+    "billing_account_id", "project_id",
+    "SubscriptionId", "resource_id",
+}
+
+# Billing-date columns in priority order, used for --since/--until filtering
+DATE_COLUMNS = (
+    "date",
+    "line_item_usage_start_date",
+    "lineItem/UsageStartDate",
+    "usage_start_time",
+) + AZURE_COLUMN_CANDIDATES["date"]
+
+
+# ===================== PROJECTION =====================
+
+@lru_cache(maxsize=1)
+def projected_columns() -> frozenset:
+    """
+    Every source column read by a normalizer, the RI detector or
+    provider detection, across all supported export formats.
+    """
+    # Deferred import — aws_cur_loader reads files through this module
+    from src.ingestion.aws_cur_loader import AWS_CUR_COLUMNS, AWS_CUR_COLUMN_ALIASES
+
+    columns: Set[str] = set(UNIFIED_SCHEMA)
+    columns |= set(AWS_CUR_COLUMNS) | set(AWS_CUR_COLUMN_ALIASES)
+    columns |= set(_SLASH_TO_UNDERSCORE) | set(_SLASH_TO_UNDERSCORE.values())
+    columns |= set(RI_SOURCE_COLUMNS)
+    columns |= set(GCP_SOURCE_COLUMNS)
+    for candidates in AZURE_COLUMN_CANDIDATES.values():
+        columns |= set(candidates)
+    for signals in PROVIDER_SIGNALS.values():
+        columns |= set(signals)
+    return frozenset(columns)
+
+
+def keep_column(name: str) -> bool:
+    """True if a source column is needed anywhere downstream."""
+    if name in projected_columns():
+        return True
+    lowered = name.lower()
+    return (
+        lowered.startswith(TAG_COLUMN_PREFIXES)
+        or any(k in lowered for k in TAG_COLUMN_KEYWORDS)
+    )
+
+
+def read_header(source, **read_kw) -> List[str]:
+    """Return the column names of a CSV without reading any data rows."""
+    header = pd.read_csv(source, nrows=0, **read_kw).columns.tolist()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return header
+
+
+def select_columns(header: List[str]) -> Optional[List[str]]:
+    """
+    Projected subset of `header`, or None (read everything) when no column
+    is recognised — lets validation report on unknown formats properly.
+    """
+    selected = [c for c in header if keep_column(c)]
+    if not selected:
+        logger.warning("No known billing columns in header — reading all columns")
+        return None
+    dropped = len(header) - len(selected)
+    if dropped:
+        logger.info(f"Column projection: keeping {len(selected)} of {len(header)} columns")
+    return selected
+
+
+def header_provider(header: List[str]) -> Optional[str]:
+    """Provider whose signal columns appear in `header`, or None if zero or several match."""
+    cols = set(header)
+    matched = [p for p, signals in PROVIDER_SIGNALS.items() if set(signals) & cols]
+    return matched[0] if len(matched) == 1 else None
+
+
+# ===================== DATE WINDOW =====================
+
+def date_column(header: List[str]) -> Optional[str]:
+    """First billing-date column present in `header`, or None."""
+    return next((c for c in DATE_COLUMNS if c in header), None)
+
+
+def window_bounds(since: Optional[date], until: Optional[date]):
+    """
+    Inclusive [since, until] day window as half-open timestamp bounds
+    (lower, upper) — either may be None.
+    """
+    lower = pd.Timestamp(since) if since else None
+    upper = pd.Timestamp(until + timedelta(days=1)) if until else None
+    return lower, upper
+
+
+def filter_date_window(
+    df: pd.DataFrame,
+    column: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> pd.DataFrame:
+    """Keep rows whose billing date falls within [since, until]."""
+    if since is None and until is None:
+        return df
+
+    lower, upper = window_bounds(since, until)
+    dates = pd.to_datetime(df[column], errors="coerce", utc=True).dt.tz_localize(None)
+
+    mask = dates.notna()
+    if lower is not None:
+        mask &= dates >= lower
+    if upper is not None:
+        mask &= dates < upper
+    return df[mask]
+
+
+# ===================== CHUNKED READING =====================
+
+def _coerce_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    for col in NUMERIC_COLUMNS.intersection(chunk.columns):
+        chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+    return chunk
+
+
+def iter_csv_chunks(
+    source,
+    columns: Optional[List[str]] = None,
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+    nrows: Optional[int] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    **read_kw,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield typed DataFrame chunks of at most `chunksize` rows.
+
+    Args:
+        source:       Path or binary/text file object
+        columns:      Columns to materialize (None = all)
+        chunksize:    Rows per chunk
+        nrows:        Optional cap on total rows read
+        since, until: Optional inclusive billing-date window, applied to
+                      each chunk as it is read
+    """
+    dtype = {c: str for c in STRING_COLUMNS if columns is None or c in columns}
+
+    reader = pd.read_csv(
+        source,
+        usecols=columns,
+        dtype=dtype,
+        chunksize=chunksize,
+        nrows=nrows,
+        **read_kw,
+    )
+    with reader:
+        for chunk in reader:
+            chunk = _coerce_chunk(chunk)
+            if since or until:
+                col = date_column(chunk.columns.tolist())
+                if col is not None:
+                    chunk = filter_date_window(chunk, col, since, until)
+            yield chunk
+
+
+def read_csv_projected(
+    source,
+    project: bool = True,
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+    nrows: Optional[int] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    **read_kw,
+) -> pd.DataFrame:
+    """
+    Read a billing CSV chunk by chunk, keeping only projected columns
+    and, when given, rows inside the [since, until] billing-date window.
+
+    Raises:
+        pandas.errors.EmptyDataError: source has no header
+    """
+    columns = select_columns(read_header(source, **read_kw)) if project else None
+
+    chunks = list(iter_csv_chunks(
+        source, columns=columns, chunksize=chunksize, nrows=nrows,
+        since=since, until=until, **read_kw
+    ))
+    if not chunks:
+        return pd.DataFrame(columns=columns or [])
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
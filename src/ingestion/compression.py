@@ -0,0 +1,173 @@
+"""
+Streaming decompression for compressed billing exports.
+
+Exports are delivered as .csv.gz, .csv.zst or .zip archives. Rather than
+inflating them to disk or into memory first, the readers here expose the
+decompressed bytes as a file-like stream that the chunked CSV reader and
+the pyarrow engine consume directly — only one read buffer of
+decompressed data exists at a time.
+
+zstd is decoded with pyarrow's bundled codec, so no extra package is
+needed.
+"""
+
+import io
+import gzip
+import logging
+import os
+import zipfile
+from typing import Callable, Iterator, Optional, Tuple
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+COMPRESSION_EXTENSIONS = {
+    ".gz":   "gzip",
+    ".gzip": "gzip",
+    ".zst":  "zstd",
+    ".zstd": "zstd",
+    ".zip":  "zip",
+}
+
+# Archive members treated as billing exports; anything else is skipped
+ARCHIVE_MEMBER_EXTENSIONS = (".csv", ".parquet", ".pqt") + tuple(
+    ext for ext, codec in COMPRESSION_EXTENSIONS.items() if codec != "zip"
+)
+
+
+def split_compression(name: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a file name into its data extension and compression codec.
+
+    "cur.csv.gz" → (".csv", "gzip"); "cur.parquet" → (".parquet", None);
+    "exports.zip" → ("", "zip").
+    """
+    root, ext = os.path.splitext(name.lower())
+    codec = COMPRESSION_EXTENSIONS.get(ext)
+    if codec is None:
+        return ext, None
+    return os.path.splitext(root)[1], codec
+
+
+# ===================== STREAMS =====================
+
+class RewindableStream(io.RawIOBase):
+    """
+    Read-only decompressed view of a compressed source.
+
+    Compressed streams can't seek, but the CSV readers read the header and
+    then rewind to parse the body. Rewinding here reopens the source and
+    restarts decompression, which costs one header's worth of work instead
+    of buffering the whole file.
+    """
+
+    def __init__(self, opener: Callable[[], object]):
+        self._opener = opener
+        self._stream = opener()
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self._pos += n
+        return n
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._pos
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation("Decompressed streams can only rewind to the start")
+        self._stream.close()
+        self._stream = self._opener()
+        self._pos = 0
+        return 0
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+def _rewound(fileobj):
+    fileobj.seek(0)
+    return fileobj
+
+
+class _KeepOpen(io.RawIOBase):
+    """
+    Proxy that leaves the wrapped file open when closed — pyarrow closes
+    the Python file it reads from, which would break the next rewind.
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._fileobj.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _archive_members(archive: zipfile.ZipFile) -> list:
+    return [
+        info.filename for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and info.filename.lower().endswith(ARCHIVE_MEMBER_EXTENSIONS)
+    ]
+
+
+def open_decompressed(source, codec: str) -> RewindableStream:
+    """
+    Open `source` (path or seekable binary file object) as a stream of
+    decompressed bytes. Zip archives are read with iter_archive_members.
+
+    Raises:
+        ValueError: unsupported codec
+    """
+    is_path = isinstance(source, (str, os.PathLike))
+
+    if codec == "gzip":
+        if is_path:
+            return RewindableStream(lambda: gzip.open(source, "rb"))
+        return RewindableStream(lambda: gzip.GzipFile(fileobj=_rewound(source), mode="rb"))
+
+    if codec == "zstd":
+        if is_path:
+            return RewindableStream(lambda: pa.input_stream(os.fspath(source), compression="zstd"))
+        return RewindableStream(
+            lambda: pa.input_stream(_KeepOpen(_rewound(source)), compression="zstd")
+        )
+
+    raise ValueError(f"Unsupported compression: {codec}")
+
+
+def iter_archive_members(source) -> Iterator[Tuple[str, object]]:
+    """
+    Yield (member name, file object) for every billing export in a zip
+    archive, streamed without extracting. Members keep their own
+    compression (e.g. a .csv.gz inside the zip) — pass the name to
+    split_compression to decode them. Each handle is closed once the
+    caller moves to the next member.
+    """
+    with zipfile.ZipFile(source) as archive:
+        for name in _archive_members(archive):
+            # Zip member handles can rewind, which the CSV and Parquet readers rely on
+            with archive.open(name) as member:
+                yield name, member
@@ -1,9 +1,209 @@
+import logging
+import os
+from datetime import date
+from typing import Dict, Optional
+
 import pandas as pd
 
+from src.ingestion.chunked_reader import DEFAULT_CHUNK_ROWS, header_provider, read_csv_projected
+from src.ingestion.compression import iter_archive_members, open_decompressed, split_compression
+from src.ingestion.sniffer import sniff_csv, sniff_parquet, validate_layout
+
+logger = logging.getLogger(__name__)
+
+CSV_ENGINES = ("pandas", "pyarrow")
+PARQUET_EXTENSIONS = (".parquet", ".pqt")
+
+
+def read_billing_csv(
+    source,
+    engine: str = "pandas",
+    project: bool = True,
+    nrows: Optional[int] = None,
+    provider: Optional[str] = None,
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    delimiter: str = ",",
+) -> pd.DataFrame:
+    """
+    Parse a billing CSV (path or file object) with the selected engine.
+
+    engine="pandas" streams projected chunks through pandas;
+    engine="pyarrow" parses on all cores with per-provider column types.
+    Both keep only rows inside the optional [since, until] date window.
+    """
+    if engine == "pandas":
+        return read_csv_projected(
+            source, project=project, chunksize=chunksize, nrows=nrows,
+            since=since, until=until, sep=delimiter,
+        )
+    if engine == "pyarrow":
+        from src.ingestion.arrow_reader import read_csv_arrow  # deferred — pulls in pyarrow
+        return read_csv_arrow(
+            source, provider=provider, project=project, nrows=nrows,
+            delimiter=delimiter, since=since, until=until,
+        )
+    raise ValueError(f"Unknown CSV engine: {engine}. Use one of {CSV_ENGINES}.")
+
+
+def _check_layout(layout: dict, name: str) -> None:
+    is_valid, message = validate_layout(layout)
+    if not is_valid:
+        raise ValueError(message)
+    logger.info(f"{os.path.basename(str(name))}: {message}")
+
+
+def _read_sniffed_csv(source, name: str, provider: Optional[str], **read_kw) -> pd.DataFrame:
+    layout = sniff_csv(source)
+    _check_layout(layout, name)
+    return read_billing_csv(
+        source, provider=provider or layout["provider"],
+        delimiter=layout["delimiter"], **read_kw,
+    )
+
+
+def read_billing_source(
+    source,
+    name: str,
+    engine: str = "pandas",
+    project: bool = True,
+    nrows: Optional[int] = None,
+    provider: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Read one billing export (path or file object), picking the reader from
+    `name`: Parquet by extension, otherwise CSV — gzip and zstd CSVs are
+    decompressed as they stream through the parser.
+
+    The header (or Parquet footer) is sniffed first, so invoices, empty
+    and unrecognised files are rejected before any data is parsed, and the
+    sniffed delimiter and provider configure the reader.
+
+    Raises:
+        ValueError: rejected layout, zip archive (see load_billing_archive)
+                    or compressed Parquet
+    """
+    ext, codec = split_compression(name)
+    if codec == "zip":
+        raise ValueError("Zip archives hold several exports — use load_billing_archive")
+
+    if ext in PARQUET_EXTENSIONS:
+        if codec:
+            raise ValueError(f"Compressed Parquet is not supported: {name}")
+        from src.ingestion.parquet_reader import read_parquet_projected
+        _check_layout(sniff_parquet(source), name)
+        return read_parquet_projected(
+            source, project=project, nrows=nrows, since=since, until=until
+        )
+
+    read_kw = dict(engine=engine, project=project, nrows=nrows, since=since, until=until)
+    if codec:
+        with open_decompressed(source, codec) as stream:
+            return _read_sniffed_csv(stream, name, provider, **read_kw)
+    return _read_sniffed_csv(source, name, provider, **read_kw)
+
+
+def load_csv(
+    file_path: str,
+    project: bool = True,
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+    engine: str = "pandas",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Reads a CSV file and returns it as a table (DataFrame).
+
+    The file is streamed in chunks of `chunksize` rows and, when `project`
+    is True, only the columns used by normalization and detection are kept.
+    .csv.gz and .csv.zst files are decompressed on the fly.
+    """
+    _, codec = split_compression(file_path)
+    if codec and codec != "zip":
+        with open_decompressed(file_path, codec) as stream:
+            return read_billing_csv(
+                stream, engine=engine, project=project, chunksize=chunksize,
+                since=since, until=until,
+            )
+    return read_billing_csv(
+        file_path, engine=engine, project=project, chunksize=chunksize,
+        since=since, until=until,
+    )
+
+
+def load_billing_archive(
+    source,
+    engine: str = "pandas",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load every billing export in a zip archive, one frame per provider.
+
+    Members are streamed straight out of the archive; exports of the same
+    provider (e.g. several monthly CURs) are concatenated.
 
-def load_csv(file_path: str):
+    Raises:
+        ValueError: archive holds no readable billing export
     """
-    Reads a CSV file and returns it as a table (DataFrame)
+    by_provider: Dict[str, list] = {}
+    for name, stream in iter_archive_members(source):
+        try:
+            df = read_billing_source(stream, name, engine=engine, since=since, until=until)
+        except ValueError as exc:
+            logger.warning(f"Skipping archive member {name}: {exc}")
+            continue
+        provider = header_provider(df.columns.tolist())
+        if provider is None:
+            logger.warning(f"Skipping archive member with unknown provider: {name}")
+            continue
+        logger.info(f"Archive member {name}: {provider}, {len(df)} rows")
+        by_provider.setdefault(provider, []).append(df)
+
+    if not by_provider:
+        raise ValueError("Archive contains no recognised billing export")
+
+    return {
+        provider: frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        for provider, frames in by_provider.items()
+    }
+
+
+def load_billing_file(
+    file_path: str,
+    engine: str = "pandas",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    provider: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Load a billing CSV, Parquet file or compressed export, picking the
+    reader by extension. Parquet reads push the date window down to
+    row-group pruning.
+
+    A zip archive holding several providers' exports needs `provider` to
+    choose which one to analyze.
     """
-    data = pd.read_csv(file_path)
-    return data
\ No newline at end of file
+    _, codec = split_compression(file_path)
+    if codec != "zip":
+        return read_billing_source(
+            file_path, file_path, engine=engine, provider=provider,
+            since=since, until=until,
+        )
+
+    frames = load_billing_archive(file_path, engine=engine, since=since, until=until)
+    if provider:
+        if provider.upper() not in frames:
+            raise ValueError(
+                f"Archive has no {provider.upper()} export (found: {', '.join(frames)})"
+            )
+        return frames[provider.upper()]
+    if len(frames) > 1:
+        raise ValueError(
+            f"Archive holds exports from several providers ({', '.join(frames)}) — "
+            "specify which provider to analyze"
+        )
+    return next(iter(frames.values()))
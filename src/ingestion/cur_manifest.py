@@ -0,0 +1,127 @@
+"""
+Multi-part CUR delivery loader.
+
+AWS delivers each CUR as a manifest JSON plus many gzip CSV or Parquet
+parts. This module resolves every part listed in the manifest against the
+local copy of the delivery, then loads and normalizes the parts in a
+process pool so ingest time scales with cores rather than part count.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import partial
+from typing import List, Optional
+
+import pandas as pd
+
+from src.ingestion.csv_loader import load_billing_file
+from src.normalization.aggregation import aggregate_daily
+from src.normalization.aws_normalizer import normalize_aws
+
+logger = logging.getLogger(__name__)
+
+
+# ===================== MANIFEST PARSING =====================
+
+def _manifest_keys(manifest: dict) -> List[str]:
+    # Legacy CUR: "reportKeys" (S3 keys); CUR 2.0 data exports: "dataFiles" (S3 URIs)
+    keys = manifest.get("reportKeys") or manifest.get("dataFiles") or []
+    if not keys:
+        raise ValueError("Manifest lists no report parts (reportKeys / dataFiles)")
+    return list(keys)
+
+
+def _resolve_part(key: str, base_dir: str) -> str:
+    """
+    Map an S3 key or URI from the manifest onto the local delivery.
+
+    Tries the full key relative to the manifest directory, then drops
+    leading path components until a file matches — so both a mirrored
+    bucket layout and a flat download directory work.
+    """
+    if key.startswith("s3://"):
+        key = key[len("s3://"):].split("/", 1)[-1]
+
+    parts = [p for p in key.split("/") if p]
+    for i in range(len(parts)):
+        candidate = os.path.join(base_dir, *parts[i:])
+        if os.path.isfile(candidate):
+            return candidate
+
+    raise FileNotFoundError(f"Manifest part not found under {base_dir}: {key}")
+
+
+def read_cur_manifest(manifest_path: str) -> List[str]:
+    """Return local paths of every report part listed in a CUR manifest."""
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [_resolve_part(k, base_dir) for k in _manifest_keys(manifest)]
+
+
+# ===================== PARALLEL LOADING =====================
+
+def _load_and_normalize_part(
+    path: str,
+    engine: str = "pandas",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Process-pool worker: load one part, normalize it to the unified schema
+    and pre-aggregate it to daily grain before it is sent back.
+    """
+    raw = load_billing_file(path, engine=engine, since=since, until=until)
+    if raw.empty:
+        return None
+    return aggregate_daily(normalize_aws(raw))
+
+
+def load_cur_manifest(
+    manifest_path: str,
+    max_workers: Optional[int] = None,
+    engine: str = "pandas",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Load and normalize every part of a CUR delivery.
+
+    Args:
+        manifest_path: Path to the delivery's manifest JSON
+        max_workers:   Worker processes (default: one per core)
+        engine:        CSV parser engine for CSV parts
+        since, until:  Optional inclusive billing-date window
+
+    Returns:
+        Unified-schema DataFrame (provider AWS) at daily grain
+
+    Raises:
+        FileNotFoundError: manifest or a listed part is missing
+        ValueError:        manifest lists no parts, or no part has data
+    """
+    paths = read_cur_manifest(manifest_path)
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    logger.info(f"CUR manifest: {len(paths)} parts, {workers} worker(s)")
+
+    load_part = partial(_load_and_normalize_part, engine=engine, since=since, until=until)
+
+    if workers <= 1:
+        parts = [load_part(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(load_part, paths))
+
+    parts = [p for p in parts if p is not None and not p.empty]
+    if not parts:
+        raise ValueError("No data rows in any manifest part")
+
+    # Parts of one delivery overlap in days — collapse them once more
+    return aggregate_daily(pd.concat(parts, ignore_index=True))
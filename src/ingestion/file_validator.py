@@ -2,6 +2,18 @@ import os
 import pandas as pd
 
 
+COST_LIKE_KEYWORDS = ("cost", "amount", "usage", "quantity")
+
+
+def has_cost_columns(columns) -> bool:
+    """True if any column name looks like a cost or usage measure."""
+    return any(
+        keyword in col.lower()
+        for col in columns
+        for keyword in COST_LIKE_KEYWORDS
+    )
+
+
 def validate_csv(file_path: str, df: pd.DataFrame):
     """
     Basic validation for uploaded CSV files.
@@ -17,19 +29,7 @@ def validate_csv(file_path: str, df: pd.DataFrame):
         return False, "CSV file is empty"
 
     # 3. Check if required cost-related columns exist
-    column_names = [col.lower() for col in df.columns]
-
-    cost_like_columns = [
-        "cost",
-        "amount",
-        "usage",
-        "quantity"
-    ]
-
-    has_cost_signal = any(
-        any(keyword in col for keyword in cost_like_columns)
-        for col in column_names
-    )
+    has_cost_signal = has_cost_columns(df.columns)
 
     if not has_cost_signal:
         return False, "CSV does not contain cost or usage data"
@@ -0,0 +1,140 @@
+"""
+Header-only billing format sniffing.
+
+detect_provider, detect_csv_type and validate_csv all look at a fully
+loaded DataFrame, so a wrong file is only rejected after it has been
+parsed end to end. The sniffer reads the header plus a few kilobytes of
+rows (or just the Parquet footer) and reports provider, export variant,
+delimiter and projected columns — enough to reject invoices and unknown
+files immediately and to configure the real reader.
+"""
+
+import csv
+import io
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.ingestion.chunked_reader import date_column, header_provider, select_columns
+from src.ingestion.csv_type_detector import detect_csv_type
+from src.ingestion.file_validator import has_cost_columns
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+SNIFF_BYTES = 64 * 1024
+SNIFF_DELIMITERS = ",;\t|"
+
+# Export variants, checked in order — the first whose signal columns
+# appear in the header wins.
+FORMAT_SIGNALS = (
+    # CUR 2.0 data exports add account names, which legacy CUR never had
+    ("AWS", "CUR2",       ("bill_payer_account_name", "line_item_usage_account_name")),
+    ("AWS", "CUR_SLASH",  ("lineItem/UnblendedCost", "lineItem/UsageStartDate",
+                           "lineItem/LineItemType")),
+    ("AWS", "CUR",        ("line_item_unblended_cost", "line_item_usage_start_date",
+                           "line_item_line_item_type")),
+    ("AZURE", "AZURE_MCA", ("billingAccountId", "billingProfileId",
+                            "costInUSD", "serviceFamily")),
+    ("AZURE", "AZURE_COST_MANAGEMENT", ("UsageDate", "CostInUSD", "ServiceName")),
+    ("AZURE", "AZURE_EA",  ("EnrollmentNumber", "MeterCategory", "InstanceId",
+                            "SubscriptionGuid")),
+    ("GCP",   "GCP_FLAT",  ("usage_start_time", "service_description", "usage_amount")),
+)
+
+
+# ===================== DETECTION =====================
+
+def detect_format(columns: List[str]) -> Tuple[Optional[str], str]:
+    """
+    (provider, variant) for a header. Provider is None and the variant
+    "INVOICE" or "UNKNOWN" when no billing export matches.
+    """
+    cols = set(columns)
+    for provider, variant, signals in FORMAT_SIGNALS:
+        if cols & set(signals):
+            return provider, variant
+
+    provider = header_provider(columns)
+    if provider is not None:
+        return provider, provider
+
+    csv_type = detect_csv_type(pd.DataFrame(columns=columns))
+    return None, "INVOICE" if csv_type == "INVOICE" else "UNKNOWN"
+
+
+def _sniff_delimiter(text: str) -> str:
+    first_line = text.split("\n", 1)[0]
+    try:
+        return csv.Sniffer().sniff(first_line, delimiters=SNIFF_DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+
+def _layout(columns: List[str], delimiter: Optional[str], sample_rows: int) -> Dict:
+    provider, variant = detect_format(columns)
+    return {
+        "provider":    provider,
+        "format":      variant,
+        "delimiter":   delimiter,
+        "columns":     columns,
+        "projected":   select_columns(columns),
+        "date_column": date_column(columns),
+        "sample_rows": sample_rows,
+    }
+
+
+# ===================== SNIFFING =====================
+
+def sniff_csv(source, sample_bytes: int = SNIFF_BYTES) -> Dict:
+    """
+    Sniff a billing CSV (path or binary file object) from its first
+    `sample_bytes` bytes. File objects are rewound afterwards.
+
+    Returns a layout dict: provider, format, delimiter, columns,
+    projected (column list or None), date_column, sample_rows.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            head = f.read(sample_bytes)
+    else:
+        head = source.read(sample_bytes)
+        source.seek(0)
+
+    # Drop the partial last line so the sample parses cleanly
+    if len(head) == sample_bytes and b"\n" in head:
+        head = head[:head.rindex(b"\n") + 1]
+
+    text = head.decode("utf-8-sig", errors="replace")
+    if not text.strip():
+        return _layout([], None, 0)
+
+    delimiter = _sniff_delimiter(text)
+    sample = pd.read_csv(io.StringIO(text), sep=delimiter, dtype=str)
+    return _layout([str(c) for c in sample.columns], delimiter, len(sample))
+
+
+def sniff_parquet(source) -> Dict:
+    """Sniff a Parquet file from its footer metadata alone."""
+    metadata = pq.ParquetFile(source).metadata
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return _layout(list(metadata.schema.to_arrow_schema().names), None, metadata.num_rows)
+
+
+def validate_layout(layout: Dict) -> Tuple[bool, str]:
+    """
+    Fast pre-load check of a sniffed layout.
+    Returns (is_valid: bool, message: str)
+    """
+    if not layout["columns"] or layout["sample_rows"] == 0:
+        return False, "File contains no data rows"
+    if layout["format"] == "INVOICE":
+        return False, "File is an invoice, not a cost and usage export"
+    if layout["provider"] is None and not has_cost_columns(layout["columns"]):
+        return False, "Unknown format: no cost or usage columns"
+    return True, f"{layout['format']} export ({layout['provider'] or 'provider unknown'})"
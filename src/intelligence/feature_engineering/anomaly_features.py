@@ -14,85 +14,128 @@ def compute_cost_zscore(daily_cost_df: pd.DataFrame) -> pd.DataFrame:
     Requires min 3 days of history to emit a z-score.
     Rows with insufficient history get NaN z_score — detectors
     fall back to rule-based logic when z_score is NaN.
+
+    Rows come back ordered by (provider, service, date). The frame is
+    sorted once and every series is windowed in the same grouped pass,
+    so cost scales with rows rather than with the number of services.
     """
     if daily_cost_df.empty:
         return daily_cost_df
 
-    result = []
-    for (provider, service), g in daily_cost_df.groupby(["provider", "service"]):
-        g = g.sort_values("date").copy()
-        shifted = g["daily_cost"].shift(1)
-        g["rolling_mean"] = shifted.rolling(7, min_periods=3).mean()
-        g["rolling_std"]  = shifted.rolling(7, min_periods=3).std()
-        g["z_score"] = (
-            (g["daily_cost"] - g["rolling_mean"])
-            / (g["rolling_std"] + 0.01)
-        )
-        result.append(g)
-
-    if not result:
+    keys = ["provider", "service"]
+    frame = daily_cost_df.dropna(subset=keys)
+    if frame.empty:
         return daily_cost_df
+    frame = frame.sort_values(keys + ["date"], kind="stable", ignore_index=True)
+
+    # Each row's baseline is its service's previous days, never the day itself
+    previous = frame.groupby(keys, observed=True, sort=False)["daily_cost"].shift(1)
+    # Groups come back in sorted key order, which is the frame's row order
+    windows = previous.groupby([frame[k] for k in keys], observed=True).rolling(7, min_periods=3)
 
-    return pd.concat(result, ignore_index=True)
+    frame["rolling_mean"] = windows.mean().to_numpy()
+    frame["rolling_std"]  = windows.std().to_numpy()
+    frame["z_score"] = (
+        (frame["daily_cost"] - frame["rolling_mean"])
+        / (frame["rolling_std"] + 0.01)
+    )
+    return frame
+
+
+FORECAST_HORIZON_DAYS = 30
+FORECAST_MIN_POINTS   = 3
 
 
 def compute_30day_forecast(daily_cost_df: pd.DataFrame) -> list:
     """
     Linear regression forecast per (provider, service).
-    Requires at least 5 data points.
+    Requires at least 3 billed days.
 
     Returns list of dicts:
         provider, service, projected_monthly_cost,
         last_30d_actual, trend_pct
+
+    Every series is fitted at once: billed days are laid out in one
+    (service, date)-sorted array and the closed-form least-squares
+    slope / intercept, CV guard, caps and trend come from per-service
+    sums (np.bincount), with no Python loop over services.
     """
-    forecasts = []
+    keys = ["provider", "service"]
+    frame = daily_cost_df.dropna(subset=keys)
+    if frame.empty:
+        return []
+
+    grouped = frame.groupby(keys, observed=True)
+    series = grouped.size().index
+    group = grouped.ngroup().to_numpy()
+    n_series = len(series)
+
+    cost = frame["daily_cost"].to_numpy(dtype=float)
+    total = np.bincount(group, weights=np.nan_to_num(cost), minlength=n_series)
+
+    # ---- Billed days, in date order within each series ----
+    billed = cost > 0
+    order = np.lexsort((frame["date"].to_numpy()[billed], group[billed]))
+    g = group[billed][order]
+    y = cost[billed][order]
+
+    n = np.bincount(g, minlength=n_series).astype(float)
+    starts = np.concatenate(([0], np.cumsum(n)[:-1])).astype(int)
+    x = np.arange(len(g)) - starts[g]          # day index within the series
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = (n - 1) / 2
+        y_mean = np.bincount(g, weights=y, minlength=n_series) / n
+        x_dev = x - x_mean[g]
+        y_dev = y - y_mean[g]
+        slope = (
+            np.bincount(g, weights=x_dev * y_dev, minlength=n_series)
+            / np.bincount(g, weights=x_dev * x_dev, minlength=n_series)
+        )
+        intercept = y_mean - slope * x_mean
 
-    for (provider, service), g in daily_cost_df.groupby(["provider", "service"]):
-        if g["daily_cost"].sum() < 0.01:
-            continue
-        g = g.sort_values("date").copy()
-        g = g[g["daily_cost"] > 0]
-        if len(g) < 3:
-            continue
+        # CV guard: skip noisy series where std > mean (coefficient of variation > 1)
+        y_std = np.sqrt(np.bincount(g, weights=y_dev * y_dev, minlength=n_series) / n)
+        noisy = (y_mean > 0) & (y_std / y_mean > 1.0)
 
-        x = np.arange(len(g), dtype=float)
-        y = g["daily_cost"].values.astype(float)
+        recent = x >= n[g] - FORECAST_HORIZON_DAYS
+        last_n_mean = (
+            np.bincount(g[recent], weights=y[recent], minlength=n_series)
+            / np.minimum(n, FORECAST_HORIZON_DAYS)
+        )
 
-        try:
-            slope, intercept = np.polyfit(x, y, 1)
-        except Exception as e:
-            logger.debug(f"Forecast failed for {provider}/{service}: {e}")
-            continue
+    keep = (total >= 0.01) & (n >= FORECAST_MIN_POINTS) & ~noisy
 
-        # CV guard: skip noisy series where std > mean (coefficient of variation > 1)
-        mean_cost = float(y.mean())
-        if mean_cost > 0 and float(y.std()) / mean_cost > 1.0:
-            logger.debug(f"Forecast skipped for {provider}/{service}: CV > 1 (noisy series)")
-            continue
+    projected_daily = intercept + slope * (n + FORECAST_HORIZON_DAYS)
+    projected_daily = np.where(projected_daily < 0, y_mean, projected_daily)
+    projected_monthly = np.round(projected_daily * 30, 2)
 
-        projected_daily   = intercept + slope * (len(g) + 30)
-        if projected_daily < 0:
-            projected_daily = mean_cost
-        projected_monthly = round(projected_daily * 30, 2)
+    last_30d_actual = np.round(last_n_mean * 30, 2)
+    baseline = np.maximum(last_30d_actual, 0.01)
 
-        last_n           = y[-min(30, len(y)):]
-        last_30d_actual  = round(float(last_n.mean()) * 30, 2)
-        baseline         = max(last_30d_actual, 0.01)
+    # Cap projected cost at 3x actual to suppress regression runaway
+    projected_monthly = np.round(np.minimum(projected_monthly, baseline * 3), 2)
 
-        # Cap projected cost at 3x actual to suppress regression runaway
-        projected_monthly = round(min(projected_monthly, baseline * 3), 2)
+    raw_trend = ((projected_monthly - last_30d_actual) / baseline) * 100
+    # Clamp trend to ±200% to avoid misleading extreme values
+    trend_pct = np.round(np.clip(raw_trend, -150.0, 150.0), 1)
 
-        raw_trend = ((projected_monthly - last_30d_actual) / baseline) * 100
-        # Clamp trend to ±200% to avoid misleading extreme values
-        trend_pct = round(max(-150.0, min(150.0, raw_trend)), 1)
+    idx = np.flatnonzero(keep)
+    # Stable, so equal projections keep (provider, service) order
+    idx = idx[np.argsort(-projected_monthly[idx], kind="stable")]
 
-        forecasts.append({
+    return [
+        {
             "provider":              provider,
             "service":               service,
-            "projected_monthly_cost": projected_monthly,
-            "last_30d_actual":       last_30d_actual,
-            "trend_pct":             trend_pct,
-        })
-
-    forecasts.sort(key=lambda x: -x["projected_monthly_cost"])
-    return forecasts
+            "projected_monthly_cost": projected,
+            "last_30d_actual":       actual,
+            "trend_pct":             trend,
+        }
+        for (provider, service), projected, actual, trend in zip(
+            series[idx],
+            projected_monthly[idx].tolist(),
+            last_30d_actual[idx].tolist(),
+            trend_pct[idx].tolist(),
+        )
+    ]
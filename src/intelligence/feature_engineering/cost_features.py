@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+
+
 def daily_cost_per_service(df):
     """
     Computes daily cost per service.
@@ -6,7 +10,7 @@ def daily_cost_per_service(df):
     """
 
     grouped = (
-        df.groupby(["date", "provider", "service"], as_index=False)
+        df.groupby(["date", "provider", "service"], as_index=False, observed=True)
           .agg(daily_cost=("cost", "sum"))
     )
 
@@ -21,7 +25,7 @@ def cost_trend_per_service(daily_cost_df):
 
     trends = []
 
-    grouped = daily_cost_df.groupby(["provider", "service"])
+    grouped = daily_cost_df.groupby(["provider", "service"], observed=True)
 
     for (provider, service), group in grouped:
         group = group.sort_values("date")
@@ -47,64 +51,54 @@ def cost_trend_per_service(daily_cost_df):
 
     return trends
 
-def resource_lifespan(df):
-    """
-    Computes lifespan (number of days) a resource has incurred cost.
-    Input: normalized DataFrame
-    Output: DataFrame with resource lifespan in days
-    """
-
-    if "resource_id" not in df.columns:
-        return []
-
-    grouped = df.dropna(subset=["resource_id"]).groupby(
-        ["provider", "service", "resource_id"]
-    )
+RESOURCE_KEYS = ["provider", "service", "resource_id"]
 
-    lifespans = []
-
-    for (provider, service, resource_id), group in grouped:
-        days_active = group["date"].nunique()
-
-        lifespans.append({
-            "provider": provider,
-            "service": service,
-            "resource_id": resource_id,
-            "days_active": days_active
-        })
+RESOURCE_FEATURE_COLUMNS = [
+    "days_active", "total_cost", "total_usage",
+    "usage_to_cost_ratio", "first_seen", "last_seen",
+]
 
-    return lifespans
 
-def usage_cost_ratio(df):
+def resource_features(df):
     """
-    Computes usage-to-cost ratio per resource.
+    Computes per-resource features in one grouped aggregation.
     Input: normalized DataFrame
-    Output: list of usage-to-cost ratios
+    Output: DataFrame indexed by (provider, service, resource_id), sorted, with
+        days_active          number of distinct days the resource incurred cost
+        total_cost           summed cost
+        total_usage          summed usage (NaN when the resource reports none)
+        usage_to_cost_ratio  total usage over the cost of the rows reporting
+                             usage (NaN without usage, or when that cost is 0)
+        first_seen           first billing day
+        last_seen            last billing day
+    Rows with no resource_id are left out.
     """
 
-    if "usage" not in df.columns or "resource_id" not in df.columns:
-        return []
-
-    grouped = df.dropna(subset=["resource_id", "usage"]).groupby(
-        ["provider", "service", "resource_id"]
+    if "resource_id" not in df.columns:
+        index = pd.MultiIndex.from_arrays([[], [], []], names=RESOURCE_KEYS)
+        return pd.DataFrame(columns=RESOURCE_FEATURE_COLUMNS, index=index)
+
+    frame = df.dropna(subset=["resource_id"])
+    usage = frame["usage"] if "usage" in frame.columns else pd.Series(np.nan, index=frame.index)
+    frame = frame.assign(
+        usage=pd.to_numeric(usage, errors="coerce"),
+        # Cost of the rows that report usage — the ratio's denominator
+        usage_cost=frame["cost"].where(usage.notna()),
     )
 
-    ratios = []
-
-    for (provider, service, resource_id), group in grouped:
-        total_cost = group["cost"].sum()
-        total_usage = group["usage"].sum()
-
-        if total_cost == 0:
-            ratio = None
-        else:
-            ratio = total_usage / total_cost
-
-        ratios.append({
-            "provider": provider,
-            "service": service,
-            "resource_id": resource_id,
-            "usage_to_cost_ratio": ratio
-        })
-
-    return ratios
\ No newline at end of file
+    grouped = frame.groupby(RESOURCE_KEYS, observed=True)
+    sums = grouped[["cost", "usage", "usage_cost"]].sum(min_count=1)
+    dates = grouped["date"].agg(["nunique", "min", "max"])
+
+    features = pd.DataFrame({
+        "days_active": dates["nunique"],
+        "total_cost":  sums["cost"].fillna(0.0),
+        "total_usage": sums["usage"],
+        "usage_to_cost_ratio": (
+            sums["usage"] / sums["usage_cost"].where(sums["usage_cost"] != 0)
+        ),
+        "first_seen":  dates["min"],
+        "last_seen":   dates["max"],
+    })
+
+    return features
@@ -0,0 +1,127 @@
+"""
+Lazily computed features shared by the detectors and the scorer.
+
+Several detectors need the same inputs — the daily cost table, the
+resource feature table, the tag table, the lineage index. A FeatureContext
+builds each feature the first time it is read and returns the memoized
+value afterwards, so a feature no consumer reads is never computed. The
+pipeline passes features to the detectors and the scorer as their data
+arguments. Reads made inside `consumer(name)` are recorded per consumer.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+import pandas as pd
+
+from src.intelligence.feature_engineering.anomaly_features import compute_cost_zscore
+from src.intelligence.feature_engineering.cost_features import (
+    cost_trend_per_service,
+    daily_cost_per_service,
+    resource_features,
+)
+from src.intelligence.feature_engineering.lineage import build_lineage_index
+from src.intelligence.severity.cost_context import build_cost_percentiles
+from src.normalization.tags import build_tag_table, ownership_tags
+
+logger = logging.getLogger(__name__)
+
+SERVICE_KEYS = ["provider", "service"]
+
+
+# ===================== SHARED AGGREGATES =====================
+# Per-service aggregates the detectors and the scorer build from their inputs.
+
+def service_avg_daily_cost(daily_cost_df: pd.DataFrame) -> pd.Series:
+    """Mean daily cost per (provider, service)."""
+    return daily_cost_df.groupby(SERVICE_KEYS, observed=True)["daily_cost"].mean()
+
+
+def service_days_present(daily_cost_df: pd.DataFrame) -> pd.Series:
+    """Distinct billing days per (provider, service)."""
+    return daily_cost_df.groupby(SERVICE_KEYS, observed=True)["date"].nunique()
+
+
+def service_has_owner(tag_table: pd.DataFrame) -> pd.Series:
+    """True per (provider, service) with any ownership tag, from a tag table."""
+    owned = ownership_tags(tag_table)
+    if owned.empty:
+        return pd.Series(dtype=bool)
+    return owned.groupby(SERVICE_KEYS, observed=True).size() > 0
+
+
+def service_usage_ratio(resource_df: pd.DataFrame) -> pd.Series:
+    """Mean resource usage-to-cost ratio per (provider, service), NaN dropped."""
+    return (
+        resource_df["usage_to_cost_ratio"]
+        .groupby(level=SERVICE_KEYS, observed=True)
+        .mean()
+        .dropna()
+    )
+
+
+# ===================== FEATURE REGISTRY =====================
+
+# name -> builder(context)
+FEATURES: Dict[str, Callable[["FeatureContext"], object]] = {
+    "normalized":        lambda ctx: ctx.normalized_df,
+    "daily_cost":        lambda ctx: compute_cost_zscore(daily_cost_per_service(ctx.normalized_df)),
+    "cost_trend":        lambda ctx: cost_trend_per_service(ctx.build("daily_cost")),
+    "resource_features": lambda ctx: resource_features(ctx.normalized_df),
+    "tag_table":         lambda ctx: build_tag_table(ctx.normalized_df),
+    "lineage":           lambda ctx: build_lineage_index(ctx.normalized_df, ctx.build("tag_table")),
+    "cost_percentiles":  lambda ctx: build_cost_percentiles(ctx.normalized_df),
+}
+
+
+# ===================== CONTEXT =====================
+
+class FeatureContext:
+    """
+    Memoized features over one normalized frame.
+
+    Args:
+        normalized_df: Unified daily-grain frame the features are built from
+        precomputed:   Feature values already at hand (e.g. from the Polars
+                       or DuckDB backend), keyed by feature name
+
+    Read a feature with `context["daily_cost"]`. `computed` lists the
+    features built so far, in order; `accessed` maps each consumer to the
+    features it read.
+    """
+
+    def __init__(self, normalized_df: pd.DataFrame, **precomputed):
+        unknown = set(precomputed) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown features: {sorted(unknown)}")
+
+        self.normalized_df = normalized_df
+        self.computed: List[str] = []
+        self.accessed: Dict[str, Set[str]] = {}
+        self._values: Dict[str, object] = {"normalized": normalized_df, **precomputed}
+        self._consumer: Optional[str] = None
+
+    def __getitem__(self, name: str):
+        if self._consumer is not None:
+            self.accessed.setdefault(self._consumer, set()).add(name)
+        return self.build(name)
+
+    def build(self, name: str):
+        """Feature value, computed on first use; not recorded as an access."""
+        if name not in FEATURES:
+            raise KeyError(f"Unknown feature: {name}")
+        if name not in self._values:
+            self._values[name] = FEATURES[name](self)
+            self.computed.append(name)
+            logger.debug(f"Feature computed: {name}")
+        return self._values[name]
+
+    @contextmanager
+    def consumer(self, name: str) -> Iterator["FeatureContext"]:
+        """Attribute the reads made inside the block to `name`."""
+        previous, self._consumer = self._consumer, name
+        try:
+            yield self
+        finally:
+            self._consumer = previous
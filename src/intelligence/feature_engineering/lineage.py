@@ -0,0 +1,218 @@
+"""
+Resource lineage index.
+
+Snapshots, volumes and instances bill under different resource IDs, and
+one resource can appear as a bare ID ("vol-0abc") in some line items and
+as an ARN ("arn:aws:ec2:us-east-1:123456789012:volume/vol-0abc") in
+others. build_lineage_index resolves every identifier in a unified frame
+to one integer-coded node, classifies each node from its ID / ARN
+resource type and CUR usage type, and links it to its parent — snapshot →
+source volume or instance, volume → attached instance — when one of its
+lineage tags (LINEAGE_TAG_KEYS) names another resource billed in the same
+frame under the same provider; a volume's instance must also be in the
+volume's region. The CUR has no lineage columns of its own, so a node
+without such a tag has no parent: lineage is tag-based only. Nothing is
+inferred from IDs, ARNs or usage types beyond each node's kind, and an
+untagged export gives an index with no edges, leaving the detectors on
+their plain resource-ID matching.
+
+Detectors resolve parent liveness with array lookups on the index
+instead of scanning rows.
+"""
+
+import logging
+import re
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.normalization.schema import USAGE_TYPE_COLUMN
+from src.normalization.tags import build_tag_table
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+# Node kinds. A node whose rows disagree takes the highest.
+KIND_OTHER, KIND_INSTANCE, KIND_DATABASE, KIND_VOLUME, KIND_SNAPSHOT = range(5)
+
+# ARN resource types and bare-ID prefixes
+ID_KINDS = {
+    "instance": KIND_INSTANCE, "i":    KIND_INSTANCE,
+    "db":       KIND_DATABASE,
+    "volume":   KIND_VOLUME,   "vol":  KIND_VOLUME,
+    "snapshot": KIND_SNAPSHOT, "snap": KIND_SNAPSHOT,
+}
+
+# Usage-type fragments, checked in order ("EBS:SnapshotUsage", "BoxUsage:t3.micro", ...)
+USAGE_TYPE_KINDS = (
+    ("SnapshotUsage", KIND_SNAPSHOT),
+    ("VolumeUsage",   KIND_VOLUME),
+    ("BoxUsage",      KIND_INSTANCE),
+    ("SpotUsage",     KIND_INSTANCE),
+    ("InstanceUsage", KIND_DATABASE),
+)
+
+# Kinds a node of each kind may descend from
+PARENT_KINDS = {
+    KIND_SNAPSHOT: (KIND_VOLUME, KIND_INSTANCE, KIND_DATABASE),
+    KIND_VOLUME:   (KIND_INSTANCE,),
+}
+
+# Tag keys naming a resource's parent — the volume or instance a snapshot
+# was taken from, the instance a volume is attached to. Matched on the key's
+# ending with separators removed: "source-volume", "Source_Volume",
+# "aws_backup_source_resource", "attached_to".
+LINEAGE_TAG_KEYS = (
+    "sourcevolume", "sourceinstance", "sourcedb", "sourceresource",
+    "attachedto", "attachedinstance",
+)
+
+_ALLOWED_EDGES = np.zeros((KIND_SNAPSHOT + 1, KIND_SNAPSHOT + 1), dtype=bool)
+for _child, _parents in PARENT_KINDS.items():
+    _ALLOWED_EDGES[_child, list(_parents)] = True
+
+
+# ===================== IDENTIFIERS =====================
+
+def _parse_ids(values) -> pd.DataFrame:
+    """Canonical ID and ID-derived kind for each identifier (ARN or bare ID)."""
+    ids = pd.Series(np.asarray(values, dtype=object)).astype(str)
+    is_arn = ids.str.startswith("arn:").to_numpy()
+
+    # Bare IDs name their kind by prefix: i-, vol-, snap-, db-
+    canonical = ids.copy()
+    token = ids.str.extract(r"^([A-Za-z]+)-", expand=False)
+
+    if is_arn.any():
+        # arn:partition:service:region:account:<type>/<id> | <type>:<id> | <id>
+        resource = ids[is_arn].str.split(":", n=5).str[5].fillna("")
+        token[is_arn] = resource.str.extract(r"^([^/:]+)[/:]", expand=False)
+        canonical[is_arn] = resource.str.replace(r"^[^/:]+[/:]", "", regex=True)
+
+    kind = token.str.lower().map(ID_KINDS).fillna(KIND_OTHER).astype(np.int8)
+    return pd.DataFrame({"canonical": canonical, "kind": kind})
+
+
+def _usage_type_kinds(values) -> np.ndarray:
+    usage_types = pd.Series(np.asarray(values, dtype=object)).astype(str)
+    kind = np.full(len(usage_types), KIND_OTHER, dtype=np.int8)
+    for fragment, fragment_kind in reversed(USAGE_TYPE_KINDS):
+        kind[usage_types.str.contains(fragment, regex=False).to_numpy()] = fragment_kind
+    return kind
+
+
+def is_lineage_key(key: str) -> bool:
+    """True for tag keys that name a parent resource."""
+    return re.sub(r"[^a-z0-9]", "", str(key).lower()).endswith(LINEAGE_TAG_KEYS)
+
+
+def canonical_resource_ids(resource_ids) -> np.ndarray:
+    """Canonical ID for each resource ID or ARN (each distinct value parsed once)."""
+    codes, uniques = pd.factorize(pd.Series(resource_ids), use_na_sentinel=True)
+    canonical = _parse_ids(uniques)["canonical"].to_numpy()
+    out = np.full(len(codes), None, dtype=object)
+    out[codes >= 0] = canonical[codes[codes >= 0]]
+    return out
+
+
+# ===================== INDEX =====================
+
+def build_lineage_index(df: pd.DataFrame, tag_table: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Lineage index of a unified frame.
+
+    Returns:
+        dict with
+            ids:    pd.Index of canonical resource IDs — node i is ids[i]
+            kind:   int8 array, KIND_* per node
+            parent: int64 array, the parent node per node, -1 when none
+
+    Every node bills in `df`, so a parent, when present, is live.
+    `tag_table` is build_tag_table(df), built here if not given.
+    """
+    empty = {
+        "ids":    pd.Index([], dtype=object),
+        "kind":   np.zeros(0, dtype=np.int8),
+        "parent": np.zeros(0, dtype=np.int64),
+    }
+    if df.empty or "resource_id" not in df.columns:
+        return empty
+
+    ids = df["resource_id"]
+    rows = df[(ids.notna() & (ids != "")).to_numpy()]
+    if rows.empty:
+        return empty
+
+    raw, raw_ids = pd.factorize(rows["resource_id"])
+    parsed = _parse_ids(raw_ids)
+    raw_node, node_ids = pd.factorize(parsed["canonical"])
+    n_nodes = len(node_ids)
+
+    kind = np.zeros(n_nodes, dtype=np.int8)
+    np.maximum.at(kind, raw_node, parsed["kind"].to_numpy())
+
+    if USAGE_TYPE_COLUMN in rows.columns:
+        usage, usage_types = pd.factorize(rows[USAGE_TYPE_COLUMN])
+        # Each distinct (resource, usage type) pair once
+        pairs = pd.unique(raw.astype(np.int64) * (len(usage_types) + 1) + (usage + 1))
+        pair_raw, pair_usage = np.divmod(pairs, len(usage_types) + 1)
+        typed = pair_usage > 0
+        np.maximum.at(
+            kind, raw_node[pair_raw[typed]], _usage_type_kinds(usage_types)[pair_usage[typed] - 1],
+        )
+
+    # Provider and region of each node, from its first row
+    row_node = raw_node[raw]
+    first = pd.Series(row_node).drop_duplicates().index.to_numpy()
+    node_provider = np.zeros(n_nodes, dtype=np.int64)
+    node_region = np.zeros(n_nodes, dtype=np.int64)
+    node_provider[row_node[first]] = pd.factorize(rows["provider"], use_na_sentinel=False)[0][first]
+    if "region" in rows.columns:
+        node_region[row_node[first]] = pd.factorize(rows["region"], use_na_sentinel=False)[0][first]
+
+    parent = np.full(n_nodes, -1, dtype=np.int64)
+    node_index = pd.Index(node_ids)
+    if tag_table is None:
+        tag_table = build_tag_table(rows)
+    if not tag_table.empty:
+        keys = tag_table["key"]
+        tags = tag_table[keys.isin([k for k in keys.unique() if is_lineage_key(k)]).to_numpy()]
+        child  = node_index.get_indexer(canonical_resource_ids(tags["resource_id"]))
+        target = node_index.get_indexer(canonical_resource_ids(tags["value"]))
+        known = (child >= 0) & (target >= 0) & (child != target)
+        child, target = child[known], target[known]
+        linked = (
+            _ALLOWED_EDGES[kind[child], kind[target]]
+            & (node_provider[child] == node_provider[target])
+            # An attached volume sits in its instance's region
+            & ((kind[child] != KIND_VOLUME) | (node_region[child] == node_region[target]))
+        )
+        edges = pd.DataFrame({"child": child[linked], "parent": target[linked]})
+        edges = edges.drop_duplicates("child")
+        parent[edges["child"].to_numpy()] = edges["parent"].to_numpy()
+
+    logger.info(
+        f"Lineage: {n_nodes:,} resources, {int((parent >= 0).sum()):,} linked to a parent"
+    )
+    return {"ids": node_index, "kind": kind, "parent": parent}
+
+
+# ===================== LOOKUPS =====================
+
+def resource_nodes(lineage: Dict, resource_ids) -> np.ndarray:
+    """Node per resource ID or ARN; -1 for IDs not in the index."""
+    codes, uniques = pd.factorize(pd.Series(resource_ids), use_na_sentinel=True)
+    nodes = lineage["ids"].get_indexer(_parse_ids(uniques)["canonical"])
+    # Trailing -1 for missing IDs (code -1)
+    return np.append(nodes, -1)[codes]
+
+
+def has_live_parent(lineage: Dict, nodes: np.ndarray) -> np.ndarray:
+    """True where a node's lineage parent bills in the indexed frame."""
+    nodes = np.asarray(nodes, dtype=np.int64)
+    live = np.zeros(len(nodes), dtype=bool)
+    known = nodes >= 0
+    live[known] = lineage["parent"][nodes[known]] >= 0
+    return live
@@ -7,13 +7,17 @@ logger = logging.getLogger(__name__)
 # Minimum dollar threshold to avoid noisy micro-leaks
 RI_MIN_WASTE_USD = 10.0
 
+# Line item types billing unused Savings Plan commitment
+SAVINGS_PLAN_WASTE_TYPES = ("SavingsPlanNegation", "SavingsPlanRecurringFee")
+
 
 def detect_reserved_instance_waste(raw_df: pd.DataFrame) -> List[Dict]:
     """
     Detect underutilized Reserved Instances and Savings Plans.
 
-    Uses raw (pre-normalized) AWS CUR data because the normalized
-    schema drops the item_type and reservation columns needed here.
+    Works on raw AWS CUR data, or on a normalize_aws frame carrying
+    schema.RI_EXTRA_COLUMNS (cost and service are then read from the unified
+    `cost` / `service` columns).
 
     Detects two patterns:
     1. SavingsPlanNegation — unused savings plan commitment billed anyway
@@ -28,18 +32,17 @@ def detect_reserved_instance_waste(raw_df: pd.DataFrame) -> List[Dict]:
         return leaks
 
     cols = set(raw_df.columns)
+    cost_col = "line_item_unblended_cost" if "line_item_unblended_cost" in cols else "cost"
+    service_col = "product_servicecode" if "product_servicecode" in cols else "service"
 
     # ---- SAVINGS PLAN WASTE ----
-    if "line_item_line_item_type" in cols and "line_item_unblended_cost" in cols:
+    if "line_item_line_item_type" in cols and cost_col in cols:
         sp_rows = raw_df[
-            raw_df["line_item_line_item_type"].isin([
-                "SavingsPlanNegation",
-                "SavingsPlanRecurringFee",
-            ])
+            raw_df["line_item_line_item_type"].isin(SAVINGS_PLAN_WASTE_TYPES)
         ]
         if not sp_rows.empty:
             total = pd.to_numeric(
-                sp_rows["line_item_unblended_cost"], errors="coerce"
+                sp_rows[cost_col], errors="coerce"
             ).sum()
             if total >= RI_MIN_WASTE_USD:
                 leaks.append({
@@ -70,9 +73,9 @@ def detect_reserved_instance_waste(raw_df: pd.DataFrame) -> List[Dict]:
 
             if unused_fee >= RI_MIN_WASTE_USD:
                 # Try to break down by service
-                if "product_servicecode" in cols:
+                if service_col in cols:
                     by_service = (
-                        unused.groupby("product_servicecode")
+                        unused.groupby(service_col, observed=True)
                         .apply(lambda g: pd.to_numeric(
                             g["reservation_unused_recurring_fee"], errors="coerce"
                         ).sum())
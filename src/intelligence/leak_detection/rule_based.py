@@ -1,7 +1,16 @@
+import numpy as np
 import pandas as pd
 import logging
 from typing import List, Dict, Tuple, Optional
 
+from src.intelligence.feature_engineering.feature_context import (
+    service_avg_daily_cost,
+    service_days_present,
+    service_has_owner,
+    service_usage_ratio,
+)
+from src.normalization.tags import build_tag_table
+
 logger = logging.getLogger(__name__)
 
 # ===================== CONFIG =====================
@@ -19,6 +28,9 @@ IDLE_MIN_DAILY_COST         = 1.0
 IDLE_MIN_DAYS_ACTIVE        = 3
 
 ZOMBIE_MIN_DAYS             = 14
+ZOMBIE_MIN_SERVICE_RATIOS   = 4     # ratios a service needs for its own p25
+ZOMBIE_FALLBACK_THRESHOLDS  = {"AWS": 0.05, "AZURE": 0.10}
+ZOMBIE_DEFAULT_THRESHOLD    = 3.0
 
 # ===================== SERVICE CATEGORIES =====================
 
@@ -45,73 +57,86 @@ def get_service_category(service_name: str) -> str:
 
 # ===================== ZOMBIE RESOURCES =====================
 
+def zombie_ratio_thresholds(resource_df: pd.DataFrame) -> pd.Series:
+    """
+    Per-(provider, service) p25 usage-to-cost ratio: the ratio at sorted
+    position max(0, int(n * 0.25) - 1) among the service's n non-null
+    ratios. Services with fewer than ZOMBIE_MIN_SERVICE_RATIOS are left out.
+    """
+    ratios = (
+        resource_df["usage_to_cost_ratio"].dropna()
+        .droplevel("resource_id")
+        .rename("ratio")
+        .reset_index()
+        .sort_values(["provider", "service", "ratio"], kind="stable")
+    )
+    grouped  = ratios.groupby(["provider", "service"], observed=True)
+    position = grouped.cumcount()
+    size     = grouped["ratio"].transform("size")
+
+    p25 = (size >= ZOMBIE_MIN_SERVICE_RATIOS) & (
+        position == np.maximum(0, (size * 0.25).astype(int) - 1)
+    )
+    return ratios[p25].set_index(["provider", "service"])["ratio"]
+
+
 def detect_zombie_resources(
-    lifespan_results: list,
-    usage_ratio_data: list,
+    resource_df: pd.DataFrame,
     cost_percentiles: Optional[dict] = None,
 ) -> Tuple[List[Dict], set]:
     """
     Long-running resources with consistently inefficient usage.
 
+    `resource_df` is the resource_features table.
+
     Threshold logic (priority order):
     1. Percentile-based: flag if usage ratio < 25th percentile for that service
        AND cost percentile > 50th (high cost, low usage)
     2. Fallback: provider-aware fixed thresholds if no percentile data
     """
-    leaks: List[Dict] = []
-    zombie_resource_ids: set = set()
-
-    usage_lookup = {
-        (u["provider"], u["service"], u["resource_id"]): u["usage_to_cost_ratio"]
-        for u in usage_ratio_data
-    }
-
-    for r in lifespan_results:
-        provider    = r["provider"]
-        service     = r["service"]
-        resource_id = r["resource_id"]
-        days_active = r["days_active"]
+    candidates = resource_df[
+        resource_df["usage_to_cost_ratio"].notna()
+        & (resource_df["days_active"] >= ZOMBIE_MIN_DAYS)
+    ]
+    if candidates.empty:
+        return [], set()
+
+    providers = candidates.index.get_level_values("provider")
+    threshold = pd.Series(
+        providers.map(lambda p: ZOMBIE_FALLBACK_THRESHOLDS.get(p, ZOMBIE_DEFAULT_THRESHOLD)),
+        index=candidates.index, dtype=float,
+    )
+    if cost_percentiles:
+        service_p25 = zombie_ratio_thresholds(resource_df).reindex(
+            pd.MultiIndex.from_arrays([providers, candidates.index.get_level_values("service")])
+        )
+        threshold = threshold.where(service_p25.isna().to_numpy(), service_p25.to_numpy())
 
-        usage_ratio = usage_lookup.get((provider, service, resource_id))
-        if usage_ratio is None:
-            continue
+    zombies = candidates["usage_to_cost_ratio"] < threshold
 
-        # Compute service-level p25 threshold from available ratio data
-        if cost_percentiles:
-            service_ratios = [
-                v for (p, s, _), v in usage_lookup.items()
-                if p == provider and s == service
-            ]
-            if len(service_ratios) >= 4:
-                service_ratios_sorted = sorted(service_ratios)
-                p25_idx   = max(0, int(len(service_ratios_sorted) * 0.25) - 1)
-                threshold = service_ratios_sorted[p25_idx]
-            else:
-                threshold = {"AWS": 0.05, "AZURE": 0.10}.get(provider, 3.0)
-        else:
-            threshold = {"AWS": 0.05, "AZURE": 0.10}.get(provider, 3.0)
-
-        if days_active >= ZOMBIE_MIN_DAYS and usage_ratio < threshold:
-            zombie_resource_ids.add(resource_id)
-            leaks.append({
-                "leak_type":   "ZOMBIE_RESOURCE",
-                "provider":    provider,
-                "service":     service,
-                "resource_id": resource_id,
-                "reason": (
-                    f"Active {days_active} days with usage-to-cost ratio of "
-                    f"{usage_ratio:.4f} (below service p25 threshold {threshold:.4f})"
-                ),
-            })
-
-    return leaks, zombie_resource_ids
+    leaks = [
+        {
+            "leak_type":   "ZOMBIE_RESOURCE",
+            "provider":    provider,
+            "service":     service,
+            "resource_id": resource_id,
+            "reason": (
+                f"Active {days} days with usage-to-cost ratio of "
+                f"{usage_ratio:.4f} (below service p25 threshold {limit:.4f})"
+            ),
+        }
+        for (provider, service, resource_id), days, usage_ratio, limit in zip(
+            candidates.index[zombies], candidates["days_active"][zombies],
+            candidates["usage_to_cost_ratio"][zombies], threshold[zombies],
+        )
+    ]
+    return leaks, {leak["resource_id"] for leak in leaks}
 
 
 # ===================== IDLE RESOURCES =====================
 
 def detect_idle_resources(
-    lifespan_data: list,
-    usage_ratio_data: list,
+    resource_df: pd.DataFrame,
     daily_cost_df: pd.DataFrame,
     excluded_resource_ids: set,
 ) -> List[Dict]:
@@ -119,57 +144,44 @@ def detect_idle_resources(
     Shorter-lived, low-usage compute.
     Explicitly excludes zombie resources.
     """
-    leaks: List[Dict] = []
-
-    usage_lookup = {
-        (u["provider"], u["service"], u["resource_id"]): u["usage_to_cost_ratio"]
-        for u in usage_ratio_data
-    }
-
-    avg_cost_lookup = (
-        daily_cost_df
-        .groupby(["provider", "service"])["daily_cost"]
-        .mean()
-        .to_dict()
+    if resource_df.empty or daily_cost_df.empty:
+        return []
+
+    avg_cost = service_avg_daily_cost(daily_cost_df)
+
+    keys = resource_df.index
+    providers = keys.get_level_values("provider")
+    services  = keys.get_level_values("service")
+    ratio     = resource_df["usage_to_cost_ratio"]
+    service_cost = avg_cost.reindex(pd.MultiIndex.from_arrays([providers, services])).to_numpy()
+
+    idle = (
+        ~keys.get_level_values("resource_id").isin(excluded_resource_ids)
+        & (services.map(get_service_category) == "compute")
+        & (resource_df["days_active"].to_numpy() >= IDLE_MIN_DAYS_ACTIVE)
+        & ratio.notna().to_numpy()
+        & (ratio.to_numpy() <= IDLE_USAGE_RATIO_THRESHOLD)
+        & (np.nan_to_num(service_cost) >= IDLE_MIN_DAILY_COST)
     )
 
-    for r in lifespan_data:
-        provider    = r["provider"]
-        service     = r["service"]
-        resource_id = r["resource_id"]
-        days        = r["days_active"]
-
-        if resource_id in excluded_resource_ids:
-            continue
-        if get_service_category(service) != "compute":
-            continue
-        if days < IDLE_MIN_DAYS_ACTIVE:
-            continue
-
-        usage_ratio = usage_lookup.get((provider, service, resource_id))
-        if usage_ratio is None or usage_ratio > IDLE_USAGE_RATIO_THRESHOLD:
-            continue
-
-        daily_cost = avg_cost_lookup.get((provider, service), 0)
-        if daily_cost < IDLE_MIN_DAILY_COST:
-            continue
-
-        leaks.append({
+    return [
+        {
             "leak_type":   "IDLE_RESOURCE",
             "provider":    provider,
             "service":     service,
             "resource_id": resource_id,
             "reason":      f"Low usage detected over {days} days",
-        })
-
-    return leaks
+        }
+        for (provider, service, resource_id), days
+        in resource_df.loc[idle, "days_active"].items()
+    ]
 
 
 # ===================== RUNAWAY COSTS =====================
 
 def detect_runaway_costs(
     daily_cost_df: pd.DataFrame,
-    usage_ratio_data: list,
+    resource_df: Optional[pd.DataFrame] = None,
 ) -> List[Dict]:
     """
     Detects rapid cost growth.
@@ -184,16 +196,10 @@ def detect_runaway_costs(
     has_zscore = "z_score" in daily_cost_df.columns
 
     usage_lookup: dict = {}
-    if usage_ratio_data:
-        usage_df = pd.DataFrame(usage_ratio_data)
-        if not usage_df.empty:
-            usage_lookup = (
-                usage_df.groupby(["provider", "service"])["usage_to_cost_ratio"]
-                .mean()
-                .to_dict()
-            )
-
-    for (provider, service), g in daily_cost_df.groupby(["provider", "service"]):
+    if resource_df is not None and not resource_df.empty:
+        usage_lookup = service_usage_ratio(resource_df).to_dict()
+
+    for (provider, service), g in daily_cost_df.groupby(["provider", "service"], observed=True):
         g = g.sort_values("date")
         costs = g["daily_cost"].values
 
@@ -252,54 +258,41 @@ def detect_runaway_costs(
 def detect_always_on_high_cost(
     daily_cost_df: pd.DataFrame,
     normalized_df: pd.DataFrame,
+    tag_table: Optional[pd.DataFrame] = None,
 ) -> List[Dict]:
     """
     Consistently expensive compute/database services with no ownership tags.
-    """
-    leaks: List[Dict] = []
-
-    total_days = daily_cost_df["date"].nunique()
-
-    days_present = (
-        daily_cost_df
-        .groupby(["provider", "service"])["date"]
-        .nunique()
-        .to_dict()
-    )
 
-    avg_cost = (
-        daily_cost_df
-        .groupby(["provider", "service"])["daily_cost"]
-        .mean()
-        .to_dict()
-    )
-
-    for (provider, service), cost in avg_cost.items():
-        if get_service_category(service) not in {"compute", "database"}:
-            continue
-        if cost < ALWAYS_ON_MIN_DAILY_COST:
-            continue
-
-        presence_ratio = (
-            days_present.get((provider, service), 0) / max(total_days, 1)
-        )
-        if presence_ratio < ALWAYS_ON_PRESENCE_RATIO:
-            continue
-
-        rows = normalized_df[
-            (normalized_df["provider"] == provider) &
-            (normalized_df["service"]  == service)
-        ]
-
-        owner_cols = [
-            c for c in rows.columns
-            if any(k in c.lower() for k in ["owner", "project", "environment"])
-        ]
-
-        if any(rows[c].notna().any() for c in owner_cols):
-            continue
-
-        leaks.append({
+    The per-service daily cost, presence and ownership aggregates are
+    joined into one table and filtered together. `tag_table` is
+    build_tag_table(normalized_df), built here if not given.
+    """
+    if tag_table is None:
+        tag_table = build_tag_table(normalized_df)
+
+    total_days   = daily_cost_df["date"].nunique()
+    days_present = service_days_present(daily_cost_df)
+    avg_cost     = service_avg_daily_cost(daily_cost_df)
+    has_owner    = service_has_owner(tag_table)
+
+    if avg_cost.empty:
+        return []
+
+    # One row per (provider, service), filtered as a whole
+    table = pd.DataFrame({"avg_cost": avg_cost})
+    table["presence_ratio"] = days_present.reindex(table.index).fillna(0) / max(total_days, 1)
+    table["has_owner"] = has_owner.reindex(table.index, fill_value=False).to_numpy()
+    category = table.index.get_level_values("service").map(get_service_category)
+
+    always_on = table[
+        category.isin(["compute", "database"])
+        & (table["avg_cost"] >= ALWAYS_ON_MIN_DAILY_COST)
+        & (table["presence_ratio"] >= ALWAYS_ON_PRESENCE_RATIO)
+        & ~table["has_owner"]
+    ]
+
+    return [
+        {
             "leak_type": "ALWAYS_ON_HIGH_COST",
             "provider":  provider,
             "service":   service,
@@ -307,6 +300,6 @@ def detect_always_on_high_cost(
                 f"Always-on service costing ${cost:.2f}/day "
                 f"with no ownership metadata"
             ),
-        })
-
-    return leaks
+        }
+        for (provider, service), cost in always_on["avg_cost"].items()
+    ]
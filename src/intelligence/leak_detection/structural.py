@@ -1,8 +1,15 @@
+import numpy as np
 import pandas as pd
 import logging
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Optional, Tuple
 
+from src.intelligence.feature_engineering.lineage import (
+    build_lineage_index,
+    has_live_parent,
+    resource_nodes,
+)
 from src.intelligence.leak_detection.rule_based import get_service_category
+from src.normalization.tags import build_tag_table, ownership_tags
 
 logger = logging.getLogger(__name__)
 
@@ -76,9 +83,99 @@ def is_block_storage(service: str, provider: str) -> bool:
     )
 
 
+# ===================== LEAK RECORDS =====================
+# Shared with the out-of-core SQL detectors (src/duckdb_backend.py)
+
+def orphaned_storage_leak(provider: str, service: str, resource_id: str) -> Dict:
+    return {
+        "leak_type":   "ORPHANED_STORAGE",
+        "provider":    provider,
+        "service":     service,
+        "resource_id": resource_id,
+        "reason": (
+            "Storage resource active in regions/dates where no "
+            "compute was running — likely detached or abandoned"
+        ),
+    }
+
+
+def idle_database_leak(
+    provider: str,
+    service: str,
+    resource_id: str,
+    days_active: int,
+    usage_ratio: float,
+    daily_cost: float,
+) -> Dict:
+    return {
+        "leak_type":   "IDLE_DATABASE",
+        "provider":    provider,
+        "service":     service,
+        "resource_id": resource_id,
+        "reason": (
+            f"Database active {days_active} days with minimal usage "
+            f"(ratio {usage_ratio:.4f})"
+        ),
+        "estimated_monthly_waste": round(daily_cost * 30, 2),
+    }
+
+
+def snapshot_sprawl_leak(provider: str, service: str, resource_id: str) -> Dict:
+    return {
+        "leak_type":   "SNAPSHOT_SPRAWL",
+        "provider":    provider,
+        "service":     service,
+        "resource_id": resource_id,
+        "reason": (
+            "Snapshot or backup generating cost with no "
+            "active parent resource"
+        ),
+    }
+
+
 # ===================== ORPHANED STORAGE =====================
 
-def detect_orphaned_storage(normalized_df: pd.DataFrame) -> List[Dict]:
+def _codes(values) -> Tuple[np.ndarray, int]:
+    """(integer code per row, number of codes); missing values get a code of their own."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes.astype(np.int64, copy=False), max(len(uniques), 1)
+
+
+def _first_rows(codes: np.ndarray) -> np.ndarray:
+    """Position of the first row of each code, in code order."""
+    return pd.Series(codes).drop_duplicates().index.to_numpy()
+
+
+def _service_roles(df: pd.DataFrame, *checks) -> List[np.ndarray]:
+    """
+    One boolean row mask per check(service, provider), evaluated once per
+    distinct (provider, service) pair rather than once per row.
+    """
+    provider, n_providers = _codes(df["provider"])
+    service, _ = _codes(df["service"])
+    pair, _ = _codes(service * n_providers + provider)
+
+    first = _first_rows(pair)
+    pairs = list(zip(df["provider"].iloc[first], df["service"].iloc[first]))
+    return [
+        np.array([bool(check(svc, prov)) for prov, svc in pairs])[pair]
+        for check in checks
+    ]
+
+
+def _slot_regions(df: pd.DataFrame) -> pd.Series:
+    """Region per row as a slot key: missing or blank regions become "unknown"."""
+    if "region" not in df.columns:
+        return pd.Series("unknown", index=df.index, dtype="category")
+    region = df["region"].astype("category")
+    if "" in region.cat.categories:
+        region = region.cat.remove_categories([""])
+    if "unknown" not in region.cat.categories:
+        region = region.cat.add_categories(["unknown"])
+    return region.fillna("unknown")
+
+
+def detect_orphaned_storage(normalized_df: pd.DataFrame, lineage: Optional[Dict] = None) -> List[Dict]:
     """
     Detects storage resources billing in date+region windows
     where NO compute was active for the same provider.
@@ -88,56 +185,69 @@ def detect_orphaned_storage(normalized_df: pd.DataFrame) -> List[Dict]:
     true positives. The corrected approach uses (provider, date, region)
     co-occurrence: if a storage resource was active in a date+region slot
     where zero compute ran, it is orphaned.
+
+    Each row's slot is one integer code. The distinct compute slots are
+    semi-joined against the storage rows' slots, and storage resources
+    with no matching slot are orphaned — unless the lineage index links
+    the volume to an attached instance billing in the same frame. Rows
+    without a resource_id are skipped; a missing or blank region counts
+    as "unknown". `lineage` is build_lineage_index(normalized_df), built
+    here if not given.
+    """
+    if normalized_df.empty or "resource_id" not in normalized_df.columns:
+        return []
+
+    ids = normalized_df["resource_id"]
+    df = normalized_df[(ids.notna() & (ids != "")).to_numpy()]
+    if df.empty:
+        return []
+
+    compute, block_storage = _service_roles(df, is_compute, is_block_storage)
+    storage = np.flatnonzero(block_storage & ~compute)
+    if not len(storage):
+        return []
+
+    # (provider, date, region) slot of every row as one integer
+    provider, n_providers = _codes(df["provider"])
+    date, n_dates = _codes(df["date"])
+    region, _ = _codes(_slot_regions(df))
+    slot = (region * n_dates + date) * n_providers + provider
+
+    # Semi-join: storage rows whose slot had compute running
+    compute_slots = pd.unique(slot[compute])
+    covered = pd.Series(slot[storage]).isin(compute_slots).to_numpy()
+
+    resource, n_resources = _codes(df["resource_id"])
+    has_compute = np.zeros(n_resources, dtype=bool)
+    has_compute[resource[storage[covered]]] = True
+
+    # First storage row per resource supplies the leak's provider/service
+    first = storage[_first_rows(resource[storage])]
+    orphaned = first[~has_compute[resource[first]]]
+    if len(orphaned):
+        if lineage is None:
+            lineage = build_lineage_index(normalized_df)
+        nodes = resource_nodes(lineage, df["resource_id"].iloc[orphaned])
+        orphaned = orphaned[~has_live_parent(lineage, nodes)]
+
+    return [
+        orphaned_storage_leak(provider, service, resource_id)
+        for provider, service, resource_id in zip(
+            df["provider"].iloc[orphaned], df["service"].iloc[orphaned],
+            df["resource_id"].iloc[orphaned],
+        )
+    ]
+
+
+def exclude_live_lineage(lineage: Dict, leaks: List[Dict]) -> List[Dict]:
     """
-    leaks: List[Dict] = []
-
-    # Slots where compute was running: {(provider, str(date), region)}
-    compute_slots: Set[tuple] = set()
-
-    # Storage resources and their active slots
-    storage_resources: Dict[str, Dict] = {}
-
-    for _, row in normalized_df.iterrows():
-        provider    = row.get("provider")
-        service     = row.get("service")
-        resource_id = row.get("resource_id")
-        date        = row.get("date")
-        region      = row.get("region", "unknown") or "unknown"
-
-        if not resource_id:
-            continue
-
-        slot = (provider, str(date), region)
-
-        if is_compute(service, provider):
-            compute_slots.add(slot)
-
-        elif is_block_storage(service, provider):
-            if resource_id not in storage_resources:
-                storage_resources[resource_id] = {
-                    "provider":    provider,
-                    "service":     service,
-                    "resource_id": resource_id,
-                    "slots":       set(),
-                }
-            storage_resources[resource_id]["slots"].add(slot)
-
-    for rid, info in storage_resources.items():
-        # Orphaned = none of its active slots had any compute in same provider+region
-        overlap = info["slots"] & compute_slots
-        if not overlap:
-            leaks.append({
-                "leak_type":   "ORPHANED_STORAGE",
-                "provider":    info["provider"],
-                "service":     info["service"],
-                "resource_id": rid,
-                "reason": (
-                    "Storage resource active in regions/dates where no "
-                    "compute was running — likely detached or abandoned"
-                ),
-            })
-
-    return leaks
+    Leaks whose resource the lineage index links to a live parent removed —
+    for storage candidates found without the index (the DuckDB SQL join).
+    """
+    if not leaks:
+        return leaks
+    nodes = resource_nodes(lineage, [leak["resource_id"] for leak in leaks])
+    return [leak for leak, live in zip(leaks, has_live_parent(lineage, nodes)) if not live]
 
 
 # ===================== IDLE DATABASE =====================
@@ -147,112 +257,105 @@ IDLE_DB_USAGE_RATIO_THRESHOLD = 0.2
 IDLE_DB_MIN_DAILY_COST     = 10.0
 
 
-def detect_idle_databases(
-    lifespan_data: list,
-    usage_ratio_data: list,
-    daily_cost_df: pd.DataFrame,
-    normalized_df: pd.DataFrame,
-) -> List[Dict]:
-    leaks: List[Dict] = []
-
-    usage_lookup = {
-        (u["provider"], u["service"], u["resource_id"]): u["usage_to_cost_ratio"]
-        for u in usage_ratio_data
-    }
-
-    avg_daily_cost = (
-        normalized_df
-        .groupby(["provider", "service", "resource_id"])["cost"]
-        .mean()
-        .to_dict()
+def detect_idle_databases(resource_df: pd.DataFrame) -> List[Dict]:
+    """
+    Databases billing for a week or more with minimal usage and a high
+    average daily cost. `resource_df` is the resource_features table.
+
+    The daily cost is total_cost / days_active, the cost per billed day.
+    Before it was the mean cost per row, which undercounted a database
+    whose day is split over several rows (item types, regions), so such
+    databases now clear IDLE_DB_MIN_DAILY_COST and report their full
+    daily waste.
+    """
+    if resource_df.empty:
+        return []
+
+    services = resource_df.index.get_level_values("service")
+    ratio = resource_df["usage_to_cost_ratio"]
+    daily_cost = resource_df["total_cost"] / resource_df["days_active"]
+
+    idle = (
+        (services.map(get_service_category) == "database")
+        & (resource_df["days_active"] >= IDLE_DB_MIN_DAYS)
+        & ratio.notna()
+        & (ratio <= IDLE_DB_USAGE_RATIO_THRESHOLD)
+        & (daily_cost >= IDLE_DB_MIN_DAILY_COST)
     )
 
-    for r in lifespan_data:
-        provider    = r["provider"]
-        service     = r["service"]
-        resource_id = r["resource_id"]
-        days_active = r["days_active"]
-
-        if get_service_category(service) != "database":
-            continue
-        if days_active < IDLE_DB_MIN_DAYS:
-            continue
-
-        usage_ratio = usage_lookup.get((provider, service, resource_id))
-        if usage_ratio is None or usage_ratio > IDLE_DB_USAGE_RATIO_THRESHOLD:
-            continue
-
-        daily_cost = avg_daily_cost.get((provider, service, resource_id), 0)
-        if daily_cost < IDLE_DB_MIN_DAILY_COST:
-            continue
+    return [
+        idle_database_leak(provider, service, resource_id, days_active, usage_ratio, cost)
+        for (provider, service, resource_id), days_active, usage_ratio, cost in zip(
+            resource_df.index[idle], resource_df["days_active"][idle], ratio[idle], daily_cost[idle],
+        )
+    ]
 
-        leaks.append({
-            "leak_type":   "IDLE_DATABASE",
-            "provider":    provider,
-            "service":     service,
-            "resource_id": resource_id,
-            "reason": (
-                f"Database active {days_active} days with minimal usage "
-                f"(ratio {usage_ratio:.4f})"
-            ),
-            "estimated_monthly_waste": round(daily_cost * 30, 2),
-        })
 
-    return leaks
+# ===================== SNAPSHOT / BACKUP SPRAWL =====================
 
+def _is_active_parent(service: str, provider: str) -> bool:
+    return get_service_category(service) in {"compute", "database"}
 
-# ===================== SNAPSHOT / BACKUP SPRAWL =====================
 
-def detect_snapshot_sprawl(normalized_df: pd.DataFrame) -> List[Dict]:
+def detect_snapshot_sprawl(normalized_df: pd.DataFrame, lineage: Optional[Dict] = None) -> List[Dict]:
     """
     Snapshots generating cost with no active parent resource.
+
+    A snapshot has one when its own ID also bills under a compute or
+    database service, or when a lineage tag (see lineage.py) links it to
+    a source volume or instance billing in the same frame. IDs are
+    compared in canonical form, so an ARN and its bare ID are the same
+    resource.
+    `lineage` is build_lineage_index(normalized_df), built here if not given.
     """
-    leaks: List[Dict] = []
-
-    active_resources: Set[str] = set()
-    snapshot_resources: Dict[str, Dict] = {}
-
-    for _, row in normalized_df.iterrows():
-        provider    = row.get("provider")
-        service     = row.get("service")
-        resource_id = row.get("resource_id")
-
-        if not resource_id:
-            continue
-
-        category = get_service_category(service)
-        if category in {"compute", "database"}:
-            active_resources.add(resource_id)
-
-        if is_snapshot(service, provider):
-            snapshot_resources.setdefault(resource_id, {
-                "provider":    provider,
-                "service":     service,
-                "resource_id": resource_id,
-            })
-
-    for rid, info in snapshot_resources.items():
-        if rid not in active_resources:
-            leaks.append({
-                "leak_type":   "SNAPSHOT_SPRAWL",
-                "provider":    info["provider"],
-                "service":     info["service"],
-                "resource_id": rid,
-                "reason": (
-                    "Snapshot or backup generating cost with no "
-                    "active parent resource"
-                ),
-            })
-
-    return leaks
+    if normalized_df.empty or "resource_id" not in normalized_df.columns:
+        return []
+
+    ids = normalized_df["resource_id"]
+    df = normalized_df[(ids.notna() & (ids != "")).to_numpy()]
+    if df.empty:
+        return []
+
+    snapshot, active = _service_roles(df, is_snapshot, _is_active_parent)
+    snapshots = np.flatnonzero(snapshot)
+    if not len(snapshots):
+        return []
+
+    if lineage is None:
+        lineage = build_lineage_index(normalized_df)
+    nodes = resource_nodes(lineage, df["resource_id"])
+
+    # Lineage nodes billed under a compute or database service
+    is_active = np.zeros(len(lineage["ids"]) + 1, dtype=bool)
+    is_active[nodes[active]] = True
+    is_active[-1] = False  # IDs missing from the index
+
+    # First row per snapshot ID supplies the leak's provider/service
+    resource, _ = _codes(df["resource_id"])
+    first = snapshots[_first_rows(resource[snapshots])]
+    parented = is_active[nodes[first]] | has_live_parent(lineage, nodes[first])
+    sprawl = first[~parented]
+
+    return [
+        snapshot_sprawl_leak(provider, service, resource_id)
+        for provider, service, resource_id in zip(
+            df["provider"].iloc[sprawl], df["service"].iloc[sprawl],
+            df["resource_id"].iloc[sprawl],
+        )
+    ]
 
 
 # ===================== UNTAGGED RESOURCES =====================
 
+# Tag values that don't identify an owner
+MISSING_TAG_VALUES = {"", "unknown", "none", "nan"}
+
+
 def detect_untagged_resources(
     normalized_df: pd.DataFrame,
     daily_cost_df: Optional[pd.DataFrame] = None,
     top_n: int = 20,
+    tag_table: Optional[pd.DataFrame] = None,
 ) -> List[Dict]:
     """
     Detect resources with no ownership metadata.
@@ -261,68 +364,60 @@ def detect_untagged_resources(
     producing thousands of LOW-signal findings for large datasets.
     Now capped to `top_n` by total cost — focuses on the untagged
     resources that actually matter financially.
+
+    Ownership is one grouped any() over the tag table's ownership rows;
+    resources are taken from their first row and the top_n picked with a
+    partial sort. Rows without a resource_id are skipped.
+
+    `tag_table` is build_tag_table(normalized_df), built here if not given.
     """
-    candidates: List[Dict] = []
-    seen: Set[str] = set()
-
-    # Build cost lookup per resource_id
-    resource_cost: Dict[str, float] = {}
-    if "resource_id" in normalized_df.columns and "cost" in normalized_df.columns:
-        rc = (
-            normalized_df.dropna(subset=["resource_id"])
-            .groupby("resource_id")["cost"]
-            .sum()
-        )
-        resource_cost = rc.to_dict()
-
-    # Build cost lookup per (provider, service) — fallback for blank resource IDs
-    service_cost: Dict[tuple, float] = {}
-    if "service" in normalized_df.columns and "cost" in normalized_df.columns:
-        sc = (
-            normalized_df.dropna(subset=["service"])
-            .groupby(["provider", "service"])["cost"]
-            .sum()
-        )
-        service_cost = sc.to_dict()
-
-    for _, row in normalized_df.iterrows():
-        resource_id = row.get("resource_id")
-        if not resource_id or resource_id in seen:
-            continue
-        seen.add(resource_id)
-
-        provider = row.get("provider")
-        service  = row.get("service")
-
-        resource_total = resource_cost.get(resource_id, 0.0)
-        service_total  = service_cost.get((provider, service), 0.0)
-        if resource_total < 0.01 and service_total < 0.01:
-            continue
-
-        ownership_found = False
-        for col in row.index:
-            if any(k in col.lower() for k in ["owner", "project", "environment"]):
-                val = row.get(col)
-                if val and str(val).lower() not in {"", "unknown", "none", "nan"}:
-                    ownership_found = True
-                    break
-
-        if not ownership_found:
-            candidates.append({
-                "leak_type":   "UNTAGGED_RESOURCE",
-                "provider":    provider,
-                "service":     service,
-                "resource_id": resource_id,
-                "reason": (
-                    "Resource has no ownership tags "
-                    "(owner / project / environment missing)"
-                ),
-                "_cost": resource_cost.get(resource_id, 0.0),
-            })
-
-    # Cap to top_n by cost — high-cost untagged resources are the priority
-    candidates.sort(key=lambda x: -x["_cost"])
-    top = candidates[:top_n]
+    if normalized_df.empty or "resource_id" not in normalized_df.columns or "cost" not in normalized_df.columns:
+        return []
+
+    if tag_table is None:
+        tag_table = build_tag_table(normalized_df)
+    tags = ownership_tags(tag_table)
+    owned_ids: list = []
+    if not tags.empty:
+        # any() per resource: owned if one of its ownership tags carries a real value
+        has_value = ~tags["value"].str.lower().isin(MISSING_TAG_VALUES)
+        owned_ids = pd.unique(tags["resource_id"][has_value.to_numpy()].dropna())
+
+    # Per-(provider, service) cost, over every row — the fallback for low-cost resources
+    service_cost = (
+        normalized_df.dropna(subset=["service"])
+        .groupby(["provider", "service"], observed=True)["cost"]
+        .sum()
+    )
+
+    ids = normalized_df["resource_id"]
+    df = normalized_df[(ids.notna() & (ids != "")).to_numpy()]
+    if df.empty:
+        return []
+
+    # One entry per resource, from its first row
+    resource, _ = _codes(df["resource_id"])
+    first = _first_rows(resource)
+    resource_ids = df["resource_id"].iloc[first]
+    providers = df["provider"].iloc[first]
+    services = df["service"].iloc[first]
+
+    resource_cost = df["cost"].groupby(resource).sum().to_numpy()
+    service_total = service_cost.reindex(
+        pd.MultiIndex.from_arrays([providers, services])
+    ).fillna(0.0).to_numpy()
+
+    untagged = (
+        ~((resource_cost < 0.01) & (service_total < 0.01))
+        & ~resource_ids.isin(owned_ids).to_numpy()
+    )
+    candidates = np.flatnonzero(untagged)
+
+    # Cap to top_n by cost — high-cost untagged resources are the priority.
+    # Ties keep first-seen order.
+    top = pd.Series(resource_cost[candidates]).nlargest(max(top_n, 0), keep="first").index.to_numpy()
+    top = candidates[np.sort(top)]
+    top = top[np.argsort(-resource_cost[top], kind="stable")]
 
     if len(candidates) > top_n:
         logger.info(
@@ -330,7 +425,18 @@ def detect_untagged_resources(
             f"capped to top {top_n} by cost"
         )
 
-    for c in top:
-        c.pop("_cost", None)
-
-    return top
+    return [
+        {
+            "leak_type":   "UNTAGGED_RESOURCE",
+            "provider":    provider,
+            "service":     service,
+            "resource_id": resource_id,
+            "reason": (
+                "Resource has no ownership tags "
+                "(owner / project / environment missing)"
+            ),
+        }
+        for provider, service, resource_id in zip(
+            providers.iloc[top], services.iloc[top], resource_ids.iloc[top],
+        )
+    ]
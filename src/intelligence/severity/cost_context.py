@@ -8,14 +8,14 @@ def build_cost_percentiles(normalized_df):
 
     df = (
         normalized_df
-        .groupby(["provider", "service", "resource_id"])["cost"]
+        .groupby(["provider", "service", "resource_id"], observed=True)["cost"]
         .sum()
         .reset_index()
     )
 
     percentiles = {}
 
-    for (provider, service), g in df.groupby(["provider", "service"]):
+    for (provider, service), g in df.groupby(["provider", "service"], observed=True):
         g = g.sort_values("cost")
         g["percentile"] = g["cost"].rank(pct=True) * 100
 
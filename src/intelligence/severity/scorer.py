@@ -3,6 +3,8 @@ import pandas as pd
 import logging
 from typing import List, Dict, Optional
 
+from src.intelligence.feature_engineering.feature_context import service_avg_daily_cost
+
 logger = logging.getLogger(__name__)
 
 # ===================== LEAK TYPE WEIGHTS =====================
@@ -119,7 +121,7 @@ def _confidence(
 def score_leaks(
     leaks: List[Dict],
     daily_cost_df: Optional[pd.DataFrame] = None,
-    lifespan_results: Optional[list] = None,
+    resource_df: Optional[pd.DataFrame] = None,
 ) -> List[Dict]:
     """
     Assign severity score, dollar impact, confidence, and recommended action.
@@ -127,7 +129,7 @@ def score_leaks(
     Args:
         leaks:            Raw leak dicts from detectors
         daily_cost_df:    Feature-engineered daily cost DataFrame (for dollar impact)
-        lifespan_results: Resource lifespan list (for confidence scoring)
+        resource_df:      resource_features table (days active, for confidence scoring)
 
     Returns:
         Enriched leak dicts sorted by severity_score DESC, monthly_waste DESC
@@ -135,18 +137,18 @@ def score_leaks(
     # Build lookups
     avg_daily_lookup: dict = {}
     if daily_cost_df is not None and not daily_cost_df.empty:
-        avg_daily_lookup = (
-            daily_cost_df
-            .groupby(["provider", "service"])["daily_cost"]
-            .mean()
-            .to_dict()
-        )
+        avg_daily_lookup = service_avg_daily_cost(daily_cost_df).to_dict()
 
+    # Days active for just the leaked resources, looked up in one reindex
     lifespan_lookup: dict = {}
-    if lifespan_results:
-        for r in lifespan_results:
-            key = (r["provider"], r["service"], r.get("resource_id"))
-            lifespan_lookup[key] = r["days_active"]
+    if resource_df is not None and not resource_df.empty and leaks:
+        keys = list(dict.fromkeys(
+            (l.get("provider"), l.get("service"), l.get("resource_id")) for l in leaks
+        ))
+        days = resource_df["days_active"].reindex(pd.MultiIndex.from_tuples(keys))
+        lifespan_lookup = {
+            key: int(d) for key, d in zip(keys, days) if pd.notna(d)
+        }
 
     scored: List[Dict] = []
 
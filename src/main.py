@@ -8,11 +8,18 @@ Usage:
     python -m src.main --file data/raw/aws/cur.csv --llm --output both
     python -m src.main --file data/raw/aws/cur.parquet --provider aws --output json
     python -m src.main --file data/raw/aws/cur.csv --no-forecast --output console
+    python -m src.main --file data/raw/aws/cur.parquet --since 2024-03-18 --until 2024-03-31
+    python -m src.main --manifest data/raw/aws/cur-Manifest.json --workers 8
+    python -m src.main --file data/raw/aws/cur.csv data/raw/azure/cost.csv data/raw/gcp/billing.csv
+    python -m src.main --manifest data/raw/aws/cur-Manifest.json --out-of-core --memory-limit 8GB
 """
 
 import argparse
 import logging
 import sys
+from datetime import date
+
+import pandas as pd
 
 # ===================== LOGGING =====================
 
@@ -25,10 +32,24 @@ logger = logging.getLogger(__name__)
 
 # ===================== IMPORTS =====================
 
-from src.ingestion.csv_loader import load_csv
+from src.ingestion.cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_MAX_BYTES,
+    cache_key,
+    load_cached,
+    store_cached,
+)
+from src.ingestion.csv_loader import CSV_ENGINES, load_billing_file
+from src.ingestion.cur_manifest import load_cur_manifest, read_cur_manifest
 from src.ingestion.file_validator import validate_csv
+from src.ingestion.multi_cloud import load_multi_cloud
 
-from src.pipeline import run_pipeline_from_df
+from src.normalization.normalize import normalize_billing_df
+from src.pipeline import (
+    BACKENDS,
+    run_pipeline_from_df,
+    run_pipeline_out_of_core,
+)
 from src.output.pretty_printer import print_clean_output
 from src.output.report_writer import save_json_report, save_markdown_report
 
@@ -45,11 +66,20 @@ Examples:
   python -m src.main --file data/raw/aws/cur.csv --llm --output both
   python -m src.main --file data/raw/aws/cur.parquet --provider aws
   python -m src.main --file data/raw/aws/cur.csv --no-forecast --output console
+  python -m src.main --file data/raw/aws/cur.parquet --since 2024-03-18 --until 2024-03-31
+  python -m src.main --manifest data/raw/aws/cur-Manifest.json --workers 8
+  python -m src.main --file data/raw/aws/cur.csv data/raw/azure/cost.csv data/raw/gcp/billing.csv
+  python -m src.main --manifest data/raw/aws/cur-Manifest.json --out-of-core --memory-limit 8GB
         """,
     )
-    parser.add_argument("--file", required=True, help="Path to billing CSV or Parquet file")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", nargs="+",
+                        help="Path to billing CSV, Parquet or compressed export (.gz/.zst/.zip); "
+                             "give several (any mix of providers) for one consolidated run")
+    source.add_argument("--manifest",
+                        help="Path to an AWS CUR manifest JSON; all listed parts are loaded")
     parser.add_argument("--provider", choices=["aws", "azure", "gcp"],
-                        help="Cloud provider override (auto-detected if omitted)")
+                        help="Cloud provider override (auto-detected if omitted; picks the export in a multi-provider zip)")
     parser.add_argument("--output", choices=["json", "markdown", "both", "console"],
                         default="both", help="Output format (default: both)")
     parser.add_argument("--llm", action="store_true",
@@ -61,42 +91,141 @@ Examples:
                         help="Skip 30-day cost forecast computation")
     parser.add_argument("--top-untagged", type=int, default=20,
                         help="Max untagged resource leaks to surface (default: 20)")
+    parser.add_argument("--engine", choices=list(CSV_ENGINES), default="pandas",
+                        help="CSV parser engine (default: pandas; pyarrow parses on all cores)")
+    parser.add_argument("--backend", choices=list(BACKENDS), default="pandas",
+                        help="DataFrame backend for normalization and feature engineering "
+                             "(default: pandas; polars runs multi-threaded lazy queries)")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="Analyze AWS CURs larger than memory with DuckDB SQL that spills to disk "
+                             "(needs pip install duckdb; bypasses the cache)")
+    parser.add_argument("--spill-dir",
+                        help="Scratch directory for --out-of-core (default: system temp directory)")
+    parser.add_argument("--memory-limit", metavar="SIZE",
+                        help="DuckDB memory limit for --out-of-core, e.g. 8GB (default: 80%% of RAM)")
+    parser.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="Only analyze billing dates on or after this day")
+    parser.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="Only analyze billing dates on or before this day")
+    parser.add_argument("--workers", type=int,
+                        help="Worker processes for --manifest parts or multiple --file inputs "
+                             "(default: one per core)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-parse the input instead of using the normalized-data cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Normalized-data cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-max-gb", type=float,
+                        default=DEFAULT_CACHE_MAX_BYTES / 1024 ** 3,
+                        help="Cache size bound; least recently used entries are evicted (default: 2)")
     return parser.parse_args()
 
 
 # ===================== PIPELINE =====================
 
-def run_pipeline(args: argparse.Namespace) -> list:
-    logger.info(f"Starting pipeline — file: {args.file}")
-
+def load_input(args: argparse.Namespace) -> pd.DataFrame:
+    """
+    Load and normalize the --file / --manifest input. Unless --no-cache is
+    set, the unified frame is served from and written to the cache.
+    """
+    if args.file and len(args.file) > 1 and args.provider:
+        raise ValueError("--provider applies to a single --file; providers are detected per input")
+
+    key = None
+    if not args.no_cache:
+        sources = [args.manifest, *read_cur_manifest(args.manifest)] if args.manifest else args.file
+        key = cache_key(
+            sources, provider=args.provider, since=args.since, until=args.until,
+            engine=args.engine, backend=args.backend,
+        )
+        cached = load_cached(key, args.cache_dir)
+        if cached is not None:
+            return cached
+
+    if args.manifest:
+        # Parts are normalized inside the worker processes
+        df = load_cur_manifest(
+            args.manifest, max_workers=args.workers, engine=args.engine,
+            since=args.since, until=args.until,
+        )
+    elif len(args.file) > 1:
+        # Each input is normalized in its own worker process
+        df = load_multi_cloud(
+            args.file, max_workers=args.workers, engine=args.engine,
+            since=args.since, until=args.until,
+        )
+    else:
+        path = args.file[0]
+        raw_df = load_billing_file(
+            path, engine=args.engine, since=args.since, until=args.until,
+            provider=args.provider,
+        )
+        is_valid, message = validate_csv(path, raw_df)
+        logger.info(f"Validation: {message}")
+        if not is_valid:
+            raise ValueError("Invalid input")
+        df = normalize_billing_df(raw_df, args.provider, backend=args.backend)
+
+    if key is not None:
+        store_cached(key, df, args.cache_dir, int(args.cache_max_gb * 1024 ** 3))
+    return df
+
+
+def run_out_of_core(args: argparse.Namespace) -> dict:
+    """Run the DuckDB out-of-core pipeline over the --file / --manifest CUR files."""
     try:
-        df = load_csv(args.file)
+        if args.provider and args.provider != "aws":
+            raise ValueError("--out-of-core supports AWS CUR exports only")
+        paths = read_cur_manifest(args.manifest) if args.manifest else args.file
+        return run_pipeline_out_of_core(
+            paths,
+            use_llm=args.llm,
+            llm_max=args.llm_max,
+            api_key=args.api_key,
+            no_forecast=args.no_forecast,
+            top_untagged=args.top_untagged,
+            since=args.since,
+            until=args.until,
+            spill_dir=args.spill_dir,
+            memory_limit=args.memory_limit,
+        )
     except Exception as e:
-        logger.error(f"Failed to load file: {e}")
+        logger.error(f"Out-of-core analysis failed: {e}")
         sys.exit(1)
 
-    is_valid, message = validate_csv(args.file, df)
-    logger.info(f"Validation: {message}")
-    if not is_valid:
-        logger.error("Invalid input — aborting")
-        sys.exit(1)
 
-    result = run_pipeline_from_df(
-        df,
-        provider=args.provider,
-        use_llm=args.llm,
-        llm_max=args.llm_max,
-        api_key=args.api_key,
-        no_forecast=args.no_forecast,
-        top_untagged=args.top_untagged,
-    )
+def run_pipeline(args: argparse.Namespace) -> list:
+    source = ", ".join(args.file) if args.file else args.manifest
+    logger.info(f"Starting pipeline — {'manifest' if args.manifest else 'file'}: {source}")
+
+    if args.out_of_core:
+        result = run_out_of_core(args)
+    else:
+        try:
+            df = load_input(args)
+        except Exception as e:
+            logger.error(f"Failed to load file: {e}")
+            sys.exit(1)
+
+        result = run_pipeline_from_df(
+            df,
+            # Rows keep the provider they were normalized with
+            provider=None if len(df) else args.provider,
+            use_llm=args.llm,
+            llm_max=args.llm_max,
+            api_key=args.api_key,
+            no_forecast=args.no_forecast,
+            top_untagged=args.top_untagged,
+            already_normalized=True,
+            already_daily=True,
+            backend=args.backend,
+        )
 
     primary_leaks = result["leaks"]
     forecasts     = result["forecasts"]
 
     pipeline_stats = {
         **result["pipeline_stats"],
-        "file": args.file,
+        "file": source,
     }
 
     print_clean_output(primary_leaks)
@@ -1,5 +1,8 @@
-from src.normalization.schema_enforcer import enforce_schema
-import pandas as pd
+from src.normalization.schema import (
+    ACCOUNT_COLUMNS, LINEAGE_COLUMNS, RI_EXTRA_COLUMNS, UNIFIED_SCHEMA,
+)
+from src.normalization.schema_enforcer import enforce_schema, to_billing_days
+from src.normalization.tags import is_tag_column
 
 
 _SLASH_TO_UNDERSCORE = {
@@ -8,12 +11,37 @@ _SLASH_TO_UNDERSCORE = {
     "lineItem/ResourceId":      "line_item_resource_id",
     "lineItem/UsageAmount":     "line_item_usage_amount",
     "lineItem/LineItemType":    "line_item_line_item_type",
+    "lineItem/UsageType":       "line_item_usage_type",
     "lineItem/UsageAccountId":  "line_item_usage_account_id",
     "product/servicecode":      "product_servicecode",
     "product/region":           "product_region",
     "product/ProductName":      "product_product_name",
 }
 
+# CUR column → unified schema column
+CUR_TO_UNIFIED = {
+    "line_item_usage_start_date": "date",
+    "product_servicecode":        "service",
+    "line_item_resource_id":      "resource_id",
+    "line_item_usage_amount":     "usage",
+    "line_item_unblended_cost":   "cost",
+    "product_region":             "region",
+}
+
+
+def aws_output_columns(columns):
+    """
+    Columns normalize_aws keeps: the unified schema, the extras detectors
+    declare (RI item type / reservation columns, the usage type the
+    lineage index reads), the usage account ID and the resource tag
+    columns build_tag_table reads. Everything else in the CUR is dropped.
+    """
+    return [
+        c for c in columns
+        if c in UNIFIED_SCHEMA or c in RI_EXTRA_COLUMNS or c in LINEAGE_COLUMNS
+        or c in ACCOUNT_COLUMNS or is_tag_column(c)
+    ]
+
 
 def normalize_aws(df):
     """
@@ -29,14 +57,7 @@ def normalize_aws(df):
         df = df[df["line_item_line_item_type"] != "Tax"]
 
     # ---- AWS CUR column mapping ----
-    normalized = df.rename(columns={
-        "line_item_usage_start_date": "date",
-        "product_servicecode": "service",
-        "line_item_resource_id": "resource_id",
-        "line_item_usage_amount": "usage",
-        "line_item_unblended_cost": "cost",
-        "product_region": "region",
-    })
+    normalized = df.rename(columns=CUR_TO_UNIFIED)
 
     # ---- EBS service label correction ----
     if "service" in normalized.columns:
@@ -50,11 +71,12 @@ def normalize_aws(df):
         )
         normalized.loc[ebs_mask, "service"] = "AmazonEBS"
 
-    # Convert date properly
+    # ---- Drop the remaining CUR columns: 150+ down to about a dozen ----
+    normalized = normalized[aws_output_columns(normalized.columns)].copy()
+
+    # CUR timestamps are always ISO 8601
     if "date" in normalized.columns:
-        normalized["date"] = pd.to_datetime(
-            normalized["date"], errors="coerce"
-        ).dt.date
+        normalized["date"] = to_billing_days(normalized["date"], "ISO8601")
 
     normalized["provider"] = "AWS"
 
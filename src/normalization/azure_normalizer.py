@@ -1,5 +1,23 @@
 import pandas as pd
-from .schema_enforcer import enforce_schema
+from .schema_enforcer import enforce_schema, to_billing_days
+
+# Source column candidates per unified field, in priority order.
+# Covers Cost Management, EA and MCA exports (see normalize_azure).
+AZURE_COLUMN_CANDIDATES = {
+    "date":        ("UsageDate", "Date", "BillingPeriodStartDate",
+                    "date", "billingPeriodStartDate"),
+    "service":     ("ServiceName", "MeterCategory", "ConsumedService",
+                    "serviceFamily", "serviceName"),
+    "cost":        ("CostInUSD", "Cost", "PreTaxCost",
+                    "CostInBillingCurrency", "costInUSD", "cost"),
+    "usage":       ("Usage", "Quantity", "UsageQuantity",
+                    "quantity", "usageQuantity"),
+    "resource_id": ("ResourceId", "InstanceId", "ResourceName",
+                    "resourceId", "instanceId", "resourceName"),
+    "region":      ("Region", "ResourceLocation", "resourceLocation",
+                    "region", "ResourceRegion"),
+    "tags":        ("Tags", "tags", "TagsDictionary"),
+}
 
 
 def _pick(df: pd.DataFrame, *candidates: str):
@@ -22,27 +40,21 @@ def normalize_azure(df: pd.DataFrame) -> pd.DataFrame:
     normalized = pd.DataFrame()
 
     # ---------------- DATE ----------------
-    date_col = _pick(df, "UsageDate", "Date", "BillingPeriodStartDate",
-                     "date", "billingPeriodStartDate")
-    normalized["date"] = pd.to_datetime(date_col, errors="coerce")
+    date_col = _pick(df, *AZURE_COLUMN_CANDIDATES["date"])
+    normalized["date"] = to_billing_days(date_col)
 
     # ---------------- SERVICE ----------------
-    normalized["service"] = _pick(
-        df, "ServiceName", "MeterCategory", "ConsumedService",
-        "serviceFamily", "serviceName"
-    )
+    normalized["service"] = _pick(df, *AZURE_COLUMN_CANDIDATES["service"])
 
     # ---------------- COST ----------------
     normalized["cost"] = pd.to_numeric(
-        _pick(df, "CostInUSD", "Cost", "PreTaxCost",
-              "CostInBillingCurrency", "costInUSD", "cost"),
+        _pick(df, *AZURE_COLUMN_CANDIDATES["cost"]),
         errors="coerce",
     )
 
     # ---------------- USAGE ----------------
     normalized["usage"] = pd.to_numeric(
-        _pick(df, "Usage", "Quantity", "UsageQuantity",
-              "quantity", "usageQuantity"),
+        _pick(df, *AZURE_COLUMN_CANDIDATES["usage"]),
         errors="coerce",
     )
 
@@ -50,25 +62,12 @@ def normalize_azure(df: pd.DataFrame) -> pd.DataFrame:
     normalized["provider"] = "Azure"
 
     # ---------------- RESOURCE / METADATA ----------------
-    normalized["resource_id"] = _pick(
-        df, "ResourceId", "InstanceId", "ResourceName",
-        "resourceId", "instanceId", "resourceName"
-    )
-    normalized["region"] = _pick(
-        df, "Region", "ResourceLocation", "resourceLocation",
-        "region", "ResourceRegion"
-    )
-
-    # ---------------- TAG EXTRACTION ----------------
-    tags_col = _pick(df, "Tags", "tags", "TagsDictionary")
-    if tags_col is None or tags_col.isna().all():
-        tags = pd.Series([""] * len(df), index=df.index)
-    else:
-        tags = tags_col.fillna("")
+    normalized["resource_id"] = _pick(df, *AZURE_COLUMN_CANDIDATES["resource_id"])
+    normalized["region"] = _pick(df, *AZURE_COLUMN_CANDIDATES["region"])
 
-    normalized["labels.project"] = tags.str.extract(r"[Pp]roject=([^;,]+)")
-    normalized["labels.owner"] = tags.str.extract(r"[Oo]wner=([^;,]+)")
-    normalized["labels.environment"] = tags.str.extract(r"[Ee]nvironment=([^;,]+)")
+    # ---------------- TAGS ----------------
+    # Kept as the raw "k=v;" / JSON string; build_tag_table parses it
+    normalized["tags"] = _pick(df, *AZURE_COLUMN_CANDIDATES["tags"])
 
     # ---------------- FINAL CLEAN ----------------
     normalized = enforce_schema(normalized)
@@ -1,5 +1,17 @@
 import pandas as pd
-from src.normalization.schema_enforcer import enforce_schema
+from src.normalization.schema_enforcer import enforce_schema, to_billing_days
+
+# Flat-export source columns read by normalize_gcp
+GCP_SOURCE_COLUMNS = (
+    "usage_start_time",
+    "service_description",
+    "cost",
+    "usage_amount",
+    "resource_name",
+    "region",
+    "label_environment",
+    "labels",
+)
 
 def normalize_gcp(df):
     """
@@ -7,15 +19,18 @@ def normalize_gcp(df):
     into unified schema
     """
 
+    # Label columns pass through as-is; build_tag_table parses them
+    labels = {c: df[c] for c in df.columns if c == "labels" or c.startswith("label_")}
+
     normalized = pd.DataFrame({
-        "date": pd.to_datetime(df["usage_start_time"]).dt.date,
+        "date": to_billing_days(df["usage_start_time"]),
         "service": df["service_description"],
         "cost": df["cost"],
         "usage": df["usage_amount"],
         "resource_id": df["resource_name"].fillna("unknown"),
         "region": df.get("region"),
-        "labels.environment": df.get("label_environment"),
-        "provider": "GCP"
+        "provider": "GCP",
+        **labels,
     })
 
     # Explicit provider tag
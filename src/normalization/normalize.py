@@ -0,0 +1,99 @@
+"""
+Provider detection and normalization of a raw billing frame.
+
+normalize_billing_df is the single entry point from a raw export to the
+unified daily-grain frame. The pipeline and the multi-cloud loader both
+call it, so every input goes through the same provider dispatch and
+daily pre-aggregation.
+"""
+
+import logging
+from typing import Optional
+
+import pandas as pd
+
+from src.normalization.aggregation import aggregate_daily
+from src.normalization.aws_normalizer import normalize_aws
+from src.normalization.azure_normalizer import normalize_azure
+from src.normalization.gcp_normalizer import normalize_gcp
+from src.normalization.schema import PROVIDER_SIGNALS
+
+logger = logging.getLogger(__name__)
+
+
+# ===================== BACKENDS =====================
+
+def load_polars_backend():
+    """src.polars_backend, or None (with a warning) when polars isn't installed."""
+    try:
+        from src import polars_backend
+    except ImportError:
+        logger.warning(
+            "polars package not installed — using the pandas backend. "
+            "Run: pip install polars"
+        )
+        return None
+    return polars_backend
+
+
+# ===================== PROVIDER DETECTION =====================
+
+def detect_provider(df: pd.DataFrame, override: Optional[str] = None) -> str:
+    if override:
+        return override.upper()
+
+    if "provider" in df.columns:
+        return df["provider"].iloc[0].upper()
+
+    cols = set(df.columns)
+    matches = {
+        name: bool(set(signals) & cols)
+        for name, signals in PROVIDER_SIGNALS.items()
+    }
+
+    matched = [k for k, v in matches.items() if v]
+    if len(matched) != 1:
+        raise ValueError(
+            f"Ambiguous or unknown billing format. Signals found: {matches}. "
+            "Specify provider explicitly."
+        )
+    return matched[0]
+
+
+# ===================== NORMALIZATION =====================
+
+def normalize_billing_df(
+    raw_df: pd.DataFrame,
+    provider: Optional[str] = None,
+    backend: str = "pandas",
+) -> pd.DataFrame:
+    """
+    Detect the provider and normalize a raw billing frame into the unified
+    schema, with the `provider` column set, aggregated to daily grain.
+    backend="polars" runs AWS normalization as a Polars lazy query.
+
+    Raises:
+        ValueError: provider can't be determined or normalization fails
+    """
+    detected_provider = detect_provider(raw_df, provider)
+    logger.info(f"Provider: {detected_provider}")
+
+    polars_backend = load_polars_backend() if backend == "polars" else None
+
+    try:
+        if detected_provider == "AWS" and polars_backend is not None:
+            # Already aggregated to daily grain inside the lazy query
+            return polars_backend.normalize_aws(raw_df)
+        if detected_provider == "AWS":
+            normalized_df = normalize_aws(raw_df)
+        elif detected_provider == "AZURE":
+            normalized_df = normalize_azure(raw_df)
+        elif detected_provider == "GCP":
+            normalized_df = normalize_gcp(raw_df)
+        else:
+            raise ValueError(f"Unsupported provider: {detected_provider}")
+    except Exception as exc:
+        raise ValueError(f"Normalization failed: {exc}") from exc
+
+    normalized_df["provider"] = detected_provider
+    return aggregate_daily(normalized_df)
@@ -6,4 +6,59 @@ UNIFIED_SCHEMA = {
     "usage": {"required": False},
     "resource_id": {"required": False},
     "region": {"required": False},
-}
\ No newline at end of file
+}
+
+# Low-cardinality string columns stored as pandas categoricals (dictionary
+# encoded) so groupbys hash integer codes instead of repeated strings.
+# Group on them with observed=True — otherwise pandas emits every
+# combination of categories, including ones with no rows.
+CATEGORICAL_COLUMNS = ("provider", "service", "region", "resource_id")
+
+# Non-unified AWS CUR columns normalize_aws carries for the detectors and
+# per-account reporting, declared here so normalization doesn't depend on
+# the detector modules.
+ITEM_TYPE_COLUMN  = "line_item_line_item_type"
+USAGE_TYPE_COLUMN = "line_item_usage_type"
+ACCOUNT_COLUMN    = "line_item_usage_account_id"
+
+# Raw CUR columns read by detect_reserved_instance_waste
+RI_SOURCE_COLUMNS = (
+    ITEM_TYPE_COLUMN,
+    "line_item_unblended_cost",
+    "reservation_unused_quantity",
+    "reservation_unused_recurring_fee",
+    "product_servicecode",
+)
+
+# RI columns the detector reads from a normalize_aws frame. Daily
+# pre-aggregation keeps item types apart and sums the reservation amounts.
+RI_KEY_COLUMNS = (ITEM_TYPE_COLUMN,)
+RI_SUM_COLUMNS = (
+    "reservation_unused_quantity",
+    "reservation_unused_recurring_fee",
+)
+RI_EXTRA_COLUMNS = RI_KEY_COLUMNS + RI_SUM_COLUMNS
+
+# Columns the lineage index reads (src/intelligence/feature_engineering/lineage.py)
+LINEAGE_COLUMNS = (USAGE_TYPE_COLUMN,)
+
+# The linked account each line item bills to, carried so results can be
+# attributed per account in consolidated (payer) CURs
+ACCOUNT_COLUMNS = (ACCOUNT_COLUMN,)
+
+# Columns whose presence identifies the billing export's provider.
+# Used by detect_provider and by the projected readers in src/ingestion.
+PROVIDER_SIGNALS = {
+    "AWS": (
+        "line_item_usage_account_id", "line_item_line_item_type",
+        "bill_payer_account_id",
+        "lineItem/UsageAccountId", "lineItem/LineItemType",
+        "bill/PayerAccountId",
+    ),
+    "AZURE": ("SubscriptionId", "UsageDate", "MeterName"),
+    "GCP":   ("billing_account_id", "project_id", "service_description"),
+}
+
+# Bump whenever any normalizer's output changes — cached unified frames
+# (src/ingestion/cache.py) written by an older version are then ignored.
+NORMALIZER_VERSION = "7"
@@ -1,5 +1,39 @@
 import pandas as pd
 
+from src.normalization.schema import CATEGORICAL_COLUMNS
+
+
+def categorize(df):
+    """Dictionary-encode the unified schema's string key columns."""
+    to_encode = {
+        col: "category" for col in CATEGORICAL_COLUMNS
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    # copy=False leaves the other columns' data shared with df
+    return df.astype(to_encode, copy=False) if to_encode else df
+
+
+def to_billing_days(values, date_format=None):
+    """
+    Parse billing dates into a midnight-normalized datetime64 Series.
+
+    Columns the reader already typed as timestamps are not re-parsed.
+    Timezone-aware values keep their wall-clock day, matching what
+    `.dt.date` used to return. `date_format` is the provider's known
+    format ("ISO8601", "%Y%m%d", ...); None lets pandas infer it.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        dates = values
+    else:
+        dates = pd.to_datetime(values, errors="coerce", format=date_format)
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            # Mixed UTC offsets come back as objects; align them on UTC
+            dates = pd.to_datetime(values, errors="coerce", format=date_format, utc=True)
+
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.dt.normalize()
+
 
 def enforce_schema(df):
     """
@@ -15,7 +49,7 @@ def enforce_schema(df):
         df["usage"] = pd.to_numeric(df["usage"], errors="coerce")
 
     if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
+        df["date"] = to_billing_days(df["date"])
 
     # --- Drop ONLY truly invalid rows ---
     df = df.dropna(subset=["date", "service", "cost"])
@@ -25,4 +59,4 @@ def enforce_schema(df):
         if col not in df.columns:
             df[col] = None
 
-    return df
\ No newline at end of file
+    return categorize(df)
\ No newline at end of file
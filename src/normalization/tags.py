@@ -0,0 +1,146 @@
+"""
+Single-pass tag parsing.
+
+Ownership metadata arrives in a different shape per provider: the AWS CUR
+has one resource_tags_user_<key> column per tag, Azure a Tags string of
+"k=v;" pairs or JSON, GCP label_<key> columns or a JSON labels column.
+build_tag_table reads every tag source on a unified frame once and returns
+a long (provider, service, resource_id, key, value) table — one row per
+resource and tag key present — which the detectors query instead of
+scanning columns row by row.
+"""
+
+import logging
+from typing import List
+
+import pandas as pd
+
+from src.normalization.schema import UNIFIED_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+# Wide tag columns (one column per key), named <prefix><key>.
+# Checked in order, so the longer AWS prefixes come first.
+TAG_COLUMN_PREFIXES = (
+    "resource_tags_user_", "resource_tags_",
+    "resourcetags/user:",  "resourcetags/",
+    "labels.", "label_",
+)
+
+# Free-form tag strings: Azure "k=v;k2=v2" or JSON, GCP JSON labels
+TAG_STRING_COLUMNS = ("tags", "labels")
+
+# Tag keys that carry ownership. Bare columns named after one of these
+# (e.g. "owner") are treated as tag columns too.
+OWNERSHIP_KEYWORDS = ("owner", "project", "environment")
+
+RESOURCE_COLUMNS = ("provider", "service", "resource_id")
+TAG_TABLE_COLUMNS = RESOURCE_COLUMNS + ("key", "value")
+
+# k=v pairs and "k": "v" JSON members
+_PAIR_PATTERN = r'"?([^";,={}:\s][^";,={}:]*?)"?\s*[=:]\s*"?([^";,{}]*)"?'
+# BigQuery-style [{"key": "k", "value": "v"}, ...] lists
+_KEY_VALUE_PATTERN = r'"key"\s*:\s*"([^"]*)"\s*,\s*"value"\s*:\s*"([^"]*)"'
+
+
+# ===================== COLUMNS =====================
+
+def is_ownership_key(name: str) -> bool:
+    lowered = str(name).lower()
+    return any(k in lowered for k in OWNERSHIP_KEYWORDS)
+
+
+def _is_wide_tag_column(name: str) -> bool:
+    lowered = str(name).lower()
+    if lowered in TAG_STRING_COLUMNS:
+        return False
+    return lowered.startswith(TAG_COLUMN_PREFIXES) or is_ownership_key(lowered)
+
+
+def is_tag_column(name: str) -> bool:
+    """True for any column build_tag_table reads."""
+    return str(name).lower() in TAG_STRING_COLUMNS or _is_wide_tag_column(name)
+
+
+def tag_key(column: str) -> str:
+    """Tag key for a wide tag column: lower-cased, provider prefix removed."""
+    lowered = column.lower()
+    for prefix in TAG_COLUMN_PREFIXES:
+        if lowered.startswith(prefix):
+            return lowered[len(prefix):]
+    return lowered
+
+
+# ===================== PARSING =====================
+
+def _wide_tags(df: pd.DataFrame, id_cols: List[str], columns: List[str]) -> pd.DataFrame:
+    # Line items repeat a resource's tags every day — melt each distinct row once
+    frame = df[id_cols + columns].drop_duplicates()
+    long = frame.melt(id_vars=id_cols, value_vars=columns, var_name="key", value_name="value")
+    long["key"] = long["key"].map(tag_key)
+    return long
+
+
+def _string_tags(df: pd.DataFrame, id_cols: List[str], column: str) -> pd.DataFrame:
+    frame = df[id_cols + [column]].dropna(subset=[column]).drop_duplicates()
+    if frame.empty:
+        return pd.DataFrame(columns=id_cols + ["key", "value"])
+
+    # Parse each distinct tag string once, then join the pairs back
+    codes, uniques = pd.factorize(frame[column].astype(str))
+    uniques = pd.Series(uniques)
+    is_kv_list = uniques.str.contains('"key"', regex=False)
+    pairs = pd.concat([
+        uniques[~is_kv_list].str.extractall(_PAIR_PATTERN),
+        uniques[is_kv_list].str.extractall(_KEY_VALUE_PATTERN),
+    ])
+    pairs.columns = ["key", "value"]
+    pairs = pairs.droplevel("match")
+    pairs["key"] = pairs["key"].str.strip().str.lower()
+
+    resources = frame[id_cols].reset_index(drop=True)
+    resources["_code"] = codes
+    return resources.merge(pairs, left_on="_code", right_index=True).drop(columns="_code")
+
+
+def build_tag_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Long tag table for a unified frame: one row per distinct
+    (provider, service, resource_id, key, value). Null and blank
+    values are dropped; placeholder values such as "unknown" are kept
+    for the detectors to judge.
+    """
+    id_cols = [c for c in RESOURCE_COLUMNS if c in df.columns]
+    wide = [c for c in df.columns if c not in UNIFIED_SCHEMA and _is_wide_tag_column(c)]
+    strings = [c for c in df.columns if str(c).lower() in TAG_STRING_COLUMNS]
+
+    parts = []
+    if wide:
+        parts.append(_wide_tags(df, id_cols, wide))
+    parts.extend(_string_tags(df, id_cols, c) for c in strings)
+    if not parts:
+        return pd.DataFrame(columns=list(TAG_TABLE_COLUMNS))
+
+    tags = pd.concat(parts, ignore_index=True)
+    tags = tags.dropna(subset=["value"])
+    tags["value"] = tags["value"].astype(str).str.strip()
+    tags = tags[tags["value"] != ""]
+    tags = tags.reindex(columns=list(TAG_TABLE_COLUMNS)).drop_duplicates(ignore_index=True)
+    tags["key"] = tags["key"].astype("category")
+
+    logger.info(
+        f"Tags: {len(tags):,} resource tags across {tags['key'].nunique()} keys "
+        f"from {len(wide) + len(strings)} columns"
+    )
+    return tags
+
+
+# ===================== QUERIES =====================
+
+def ownership_tags(tags: pd.DataFrame) -> pd.DataFrame:
+    """Rows of a tag table whose key carries ownership."""
+    if tags.empty:
+        return tags
+    return tags[tags["key"].map(is_ownership_key).astype(bool)]
@@ -11,6 +11,8 @@ import logging
 from datetime import datetime, date
 from typing import List, Dict
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 REPORTS_DIR = "data/outputs/reports"
@@ -21,6 +23,8 @@ DELTA_FILE  = os.path.join(REPORTS_DIR, "latest_leak_ids.json")
 
 class _DateEncoder(json.JSONEncoder):
     def default(self, obj):
+        if isinstance(obj, pd.Timestamp):
+            return obj.date().isoformat()
         if isinstance(obj, date):
             return obj.isoformat()
         return super().default(obj)
@@ -12,21 +12,12 @@ logger = logging.getLogger(__name__)
 
 # ===================== IMPORTS =====================
 
-from src.normalization.aws_normalizer import normalize_aws
-from src.normalization.azure_normalizer import normalize_azure
-from src.normalization.gcp_normalizer import normalize_gcp
-
-from src.intelligence.feature_engineering.cost_features import (
-    daily_cost_per_service,
-    cost_trend_per_service,
-    resource_lifespan,
-    usage_cost_ratio,
-)
-from src.intelligence.feature_engineering.anomaly_features import (
-    compute_cost_zscore,
-    compute_30day_forecast,
-)
-from src.intelligence.severity.cost_context import build_cost_percentiles
+from src.normalization.aggregation import aggregate_daily
+from src.normalization.normalize import detect_provider, load_polars_backend, normalize_billing_df
+from src.normalization.tags import build_tag_table
+
+from src.intelligence.feature_engineering.anomaly_features import compute_30day_forecast
+from src.intelligence.feature_engineering.feature_context import FeatureContext
 
 from src.intelligence.leak_detection.rule_based import (
     detect_idle_resources,
@@ -39,6 +30,7 @@ from src.intelligence.leak_detection.structural import (
     detect_idle_databases,
     detect_snapshot_sprawl,
     detect_untagged_resources,
+    exclude_live_lineage,
 )
 from src.intelligence.leak_detection.ri_detector import detect_reserved_instance_waste
 
@@ -50,33 +42,7 @@ from src.output.pretty_printer import select_primary_leaks
 
 # ===================== HELPERS =====================
 
-def detect_provider(df: pd.DataFrame, override: Optional[str] = None) -> str:
-    if override:
-        return override.upper()
-
-    if "provider" in df.columns:
-        return df["provider"].iloc[0].upper()
-
-    cols = set(df.columns)
-    matches = {
-        "AWS": bool(
-            {"line_item_usage_account_id", "line_item_line_item_type",
-             "bill_payer_account_id"} & cols
-            or
-            {"lineItem/UsageAccountId", "lineItem/LineItemType",
-             "bill/PayerAccountId"} & cols
-        ),
-        "AZURE": bool({"SubscriptionId", "UsageDate", "MeterName"} & cols),
-        "GCP":   bool({"billing_account_id", "project_id", "service_description"} & cols),
-    }
-
-    matched = [k for k, v in matches.items() if v]
-    if len(matched) != 1:
-        raise ValueError(
-            f"Ambiguous or unknown billing format. Signals found: {matches}. "
-            "Specify provider explicitly."
-        )
-    return matched[0]
+BACKENDS = ("pandas", "polars")
 
 
 def dedupe_leaks(leaks: list) -> list:
@@ -95,12 +61,57 @@ def dedupe_leaks(leaks: list) -> list:
     return unique
 
 
+def _safe(fn, *a, **kw):
+    try:
+        return fn(*a, **kw)
+    except Exception as exc:
+        logger.warning(f"Detector {fn.__name__} skipped: {exc}")
+        return [] if fn.__name__ != "detect_zombie_resources" else ([], set())
+
+
+def _detect(
+    context: FeatureContext, fn, feature_args: list, *args,
+    feature_kwargs: Optional[dict] = None, **kw,
+):
+    """
+    _safe(fn, ...) with the named features as its leading arguments, and as
+    the keyword arguments in `feature_kwargs` (argument name -> feature
+    name). The features are read inside consumer(fn.__name__), so the
+    context records which ones each detector touched.
+    """
+    with context.consumer(fn.__name__):
+        named = {arg: context[name] for arg, name in (feature_kwargs or {}).items()}
+        return _safe(fn, *[context[name] for name in feature_args], *args, **named, **kw)
+
+
+def _log_feature_use(features: FeatureContext) -> None:
+    logger.debug(f"Features computed: {', '.join(features.computed) or 'none'}")
+    for consumer, names in features.accessed.items():
+        logger.debug(f"  {consumer}: {', '.join(sorted(names))}")
+
+
+def _duckdb_backend():
+    """src.duckdb_backend, or None (with a warning) when duckdb isn't installed."""
+    try:
+        from src import duckdb_backend
+    except ImportError:
+        logger.warning(
+            "duckdb package not installed — out-of-core mode unavailable. "
+            "Run: pip install duckdb"
+        )
+        return None
+    return duckdb_backend
+
+
 def _serialize(obj):
     """Recursively convert date/datetime objects to ISO strings for JSON safety."""
     if isinstance(obj, dict):
         return {k: _serialize(v) for k, v in obj.items()}
     if isinstance(obj, list):
         return [_serialize(v) for v in obj]
+    # Billing dates stay datetime64 until here; emit them as plain days
+    if isinstance(obj, pd.Timestamp):
+        return obj.date().isoformat()
     if isinstance(obj, date):
         return obj.isoformat()
     return obj
@@ -108,6 +119,63 @@ def _serialize(obj):
 
 # ===================== PIPELINE =====================
 
+def _forecast(daily_cost_df: pd.DataFrame) -> list:
+    try:
+        forecasts = compute_30day_forecast(daily_cost_df)
+        logger.info(f"Forecast computed for {len(forecasts)} services")
+        return forecasts
+    except Exception as exc:
+        logger.warning(f"Forecast failed (non-fatal): {exc}")
+        return []
+
+
+def _build_response(
+    all_leaks: list,
+    features: FeatureContext,
+    forecasts: list,
+    pipeline_stats: dict,
+    use_llm: bool,
+    llm_max: int,
+    api_key: Optional[str],
+) -> dict:
+    """Score, select, optionally enrich and summarize the detected leaks."""
+    # ---- SCORING ----
+    with features.consumer("score_leaks"):
+        scored_leaks = score_leaks(
+            all_leaks, features["daily_cost"], features["resource_features"],
+        )
+    primary_leaks = select_primary_leaks(scored_leaks)
+    _log_feature_use(features)
+
+    # ---- LLM ENRICHMENT ----
+    if use_llm:
+        logger.info("Enriching with Claude AI recommendations...")
+        primary_leaks = enrich_leaks_with_llm(
+            primary_leaks,
+            api_key=api_key,
+            max_leaks=llm_max,
+        )
+
+    # ---- BUILD RESPONSE ----
+    total_monthly = sum(l.get("estimated_monthly_waste", 0) for l in primary_leaks)
+
+    summary = {
+        "total_leaks":                       len(primary_leaks),
+        "high":   sum(1 for l in primary_leaks if l.get("severity") == "HIGH"),
+        "medium": sum(1 for l in primary_leaks if l.get("severity") == "MEDIUM"),
+        "low":    sum(1 for l in primary_leaks if l.get("severity") == "LOW"),
+        "estimated_monthly_waste_usd":        round(total_monthly, 2),
+        "estimated_annual_waste_usd":         round(total_monthly * 12, 2),
+    }
+
+    return {
+        "summary":        summary,
+        "leaks":          _serialize(primary_leaks),
+        "forecasts":      _serialize(forecasts),
+        "pipeline_stats": pipeline_stats,
+    }
+
+
 def run_pipeline_from_df(
     raw_df: pd.DataFrame,
     provider: Optional[str] = None,
@@ -117,98 +185,92 @@ def run_pipeline_from_df(
     no_forecast: bool = False,
     top_untagged: int = 20,
     already_normalized: bool = False,
+    already_daily: bool = False,
+    backend: str = "pandas",
 ) -> dict:
     """
     Run the full leak detection pipeline on a DataFrame.
 
     Args:
         raw_df:             Raw billing DataFrame (or pre-normalized when already_normalized=True).
-        provider:           Provider override ("aws"/"azure"/"gcp"). Auto-detected if None.
+        provider:           Provider override ("aws"/"azure"/"gcp"). Auto-detected if None;
+                            a pre-normalized frame then keeps its per-row providers,
+                            so one run can cover several clouds.
         use_llm:            Enrich HIGH/MEDIUM leaks with Claude AI recommendations.
         llm_max:            Max leaks to send to LLM.
         api_key:            Anthropic API key (falls back to ANTHROPIC_API_KEY env var).
         no_forecast:        Skip 30-day cost forecast.
         top_untagged:       Max untagged resource leaks to surface.
         already_normalized: True when raw_df is already in unified schema format
-                            (e.g. built from AWS Cost Explorer API). Skips normalization
-                            and RI detection (which needs raw CUR columns).
+                            (e.g. built from AWS Cost Explorer API or a CUR manifest).
+                            Skips normalization; RI detection runs only if the frame
+                            carries the CUR item-type / reservation columns.
+        already_daily:      True when the pre-normalized frame is already at daily
+                            grain (normalize_billing_df output, a cache entry);
+                            skips the aggregate_daily pass.
+        backend:            "pandas", or "polars" to run normalization and feature
+                            engineering as multi-threaded Polars lazy queries
+                            (falls back to pandas when polars isn't installed).
 
     Returns:
         dict with keys: summary, leaks, forecasts, pipeline_stats
     """
 
-    def _safe(fn, *a, **kw):
-        try:
-            return fn(*a, **kw)
-        except Exception as exc:
-            logger.warning(f"Detector {fn.__name__} skipped: {exc}")
-            return [] if fn.__name__ != "detect_zombie_resources" else ([], set())
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Use one of {BACKENDS}.")
 
     # ---- NORMALIZATION ----
+    total_records = len(raw_df)
     if already_normalized:
         normalized_df = raw_df.copy()
-        detected_provider = (provider or "AWS").upper()
-        normalized_df["provider"] = detected_provider
-        logger.info(f"Skipping normalization (pre-normalized). Provider: {detected_provider}")
+        if provider or "provider" not in normalized_df.columns:
+            normalized_df["provider"] = (provider or "AWS").upper()
+        # Pre-normalized input may still be hourly, or concatenated parts
+        if not already_daily:
+            normalized_df = aggregate_daily(normalized_df)
     else:
-        try:
-            detected_provider = detect_provider(raw_df, provider)
-        except ValueError as exc:
-            raise
-
-        logger.info(f"Provider: {detected_provider}")
-
-        try:
-            if detected_provider == "AWS":
-                normalized_df = normalize_aws(raw_df)
-            elif detected_provider == "AZURE":
-                normalized_df = normalize_azure(raw_df)
-            elif detected_provider == "GCP":
-                normalized_df = normalize_gcp(raw_df)
-            else:
-                raise ValueError(f"Unsupported provider: {detected_provider}")
-        except Exception as exc:
-            raise ValueError(f"Normalization failed: {exc}") from exc
-
-        normalized_df["provider"] = detected_provider
+        normalized_df = normalize_billing_df(raw_df, detect_provider(raw_df, provider), backend)
+
+    providers = sorted(normalized_df["provider"].dropna().unique()) or [(provider or "AWS").upper()]
+    detected_provider = ", ".join(providers)
+    if already_normalized:
+        logger.info(f"Skipping normalization (pre-normalized). Provider: {detected_provider}")
 
     logger.info(f"Records to analyze: {len(normalized_df):,}")
 
     # ---- FEATURE ENGINEERING ----
-    daily_cost_df    = daily_cost_per_service(normalized_df)
-    daily_cost_df    = compute_cost_zscore(daily_cost_df)
-    _                = cost_trend_per_service(daily_cost_df)
-    lifespan_results = resource_lifespan(normalized_df)
-    ratio_results    = usage_cost_ratio(normalized_df)
-    percentiles      = build_cost_percentiles(normalized_df)
-
-    if not ratio_results:
+    # Built lazily, on first read by a detector or the scorer
+    polars_backend = load_polars_backend() if backend == "polars" else None
+    precomputed = polars_backend.compute_features(normalized_df) if polars_backend else None
+    if precomputed is not None:
+        daily_cost_df, resource_df = precomputed
+        features = FeatureContext(normalized_df, daily_cost=daily_cost_df, resource_features=resource_df)
+    else:
+        features = FeatureContext(normalized_df)
+
+    if features["resource_features"]["usage_to_cost_ratio"].isna().all():
         logger.warning("No usage data found — zombie/idle detectors will produce no results.")
 
     # ---- 30-DAY FORECAST ----
-    forecasts = []
-    if not no_forecast:
-        try:
-            forecasts = compute_30day_forecast(daily_cost_df)
-            logger.info(f"Forecast computed for {len(forecasts)} services")
-        except Exception as exc:
-            logger.warning(f"Forecast failed (non-fatal): {exc}")
+    forecasts = [] if no_forecast else _forecast(features["daily_cost"])
 
     # ---- LEAK DETECTION ----
-    zombie_leaks, zombie_ids = _safe(
-        detect_zombie_resources, lifespan_results, ratio_results, percentiles
+    zombie_leaks, zombie_ids = _detect(
+        features, detect_zombie_resources, ["resource_features", "cost_percentiles"]
     )
-    idle_leaks      = _safe(detect_idle_resources,      lifespan_results, ratio_results, daily_cost_df, zombie_ids)
-    runaway_leaks   = _safe(detect_runaway_costs,       daily_cost_df, ratio_results)
-    always_on_leaks = _safe(detect_always_on_high_cost, daily_cost_df, normalized_df)
-    orphaned_leaks  = _safe(detect_orphaned_storage,    normalized_df)
-    idle_db_leaks   = _safe(detect_idle_databases,      lifespan_results, ratio_results, daily_cost_df, normalized_df)
-    snapshot_leaks  = _safe(detect_snapshot_sprawl,     normalized_df)
-    untagged_leaks  = _safe(detect_untagged_resources,  normalized_df, daily_cost_df, top_untagged)
+    idle_leaks      = _detect(features, detect_idle_resources,      ["resource_features", "daily_cost"], zombie_ids)
+    runaway_leaks   = _detect(features, detect_runaway_costs,       ["daily_cost", "resource_features"])
+    always_on_leaks = _detect(features, detect_always_on_high_cost, ["daily_cost", "normalized", "tag_table"])
+    orphaned_leaks  = _detect(features, detect_orphaned_storage,    ["normalized", "lineage"])
+    idle_db_leaks   = _detect(features, detect_idle_databases,      ["resource_features"])
+    snapshot_leaks  = _detect(features, detect_snapshot_sprawl,     ["normalized", "lineage"])
+    untagged_leaks  = _detect(features, detect_untagged_resources,  ["normalized"], top_n=top_untagged,
+                              feature_kwargs={"tag_table": "tag_table"})
 
     ri_leaks = []
-    if detected_provider == "AWS" and not already_normalized:
-        ri_leaks = _safe(detect_reserved_instance_waste, raw_df)
+    if "AWS" in providers:
+        # normalize_aws carries the RI columns, so the raw frame isn't needed
+        ri_leaks = _detect(features, detect_reserved_instance_waste, ["normalized"])
 
     all_leaks = dedupe_leaks(
         zombie_leaks + idle_leaks + runaway_leaks + always_on_leaks
@@ -217,42 +279,100 @@ def run_pipeline_from_df(
     )
     logger.info(f"Unique leaks: {len(all_leaks)}")
 
-    # ---- SCORING ----
-    scored_leaks  = score_leaks(all_leaks, daily_cost_df, lifespan_results)
-    primary_leaks = select_primary_leaks(scored_leaks)
+    pipeline_stats = {
+        "provider":                   detected_provider,
+        "providers":                  providers,
+        "total_records":              total_records,
+        "normalized_records":         len(normalized_df),
+        "forecast_services":          len(forecasts),
+        "llm_enabled":                use_llm,
+        "backend":                    "polars" if polars_backend else "pandas",
+    }
 
-    # ---- LLM ENRICHMENT ----
-    if use_llm:
-        logger.info("Enriching with Claude AI recommendations...")
-        primary_leaks = enrich_leaks_with_llm(
-            primary_leaks,
-            api_key=api_key,
-            max_leaks=llm_max,
-        )
+    return _build_response(
+        all_leaks, features, forecasts, pipeline_stats, use_llm, llm_max, api_key,
+    )
 
-    # ---- BUILD RESPONSE ----
-    total_monthly = sum(l.get("estimated_monthly_waste", 0) for l in primary_leaks)
 
-    summary = {
-        "total_leaks":                       len(primary_leaks),
-        "high":   sum(1 for l in primary_leaks if l.get("severity") == "HIGH"),
-        "medium": sum(1 for l in primary_leaks if l.get("severity") == "MEDIUM"),
-        "low":    sum(1 for l in primary_leaks if l.get("severity") == "LOW"),
-        "estimated_monthly_waste_usd":        round(total_monthly, 2),
-        "estimated_annual_waste_usd":         round(total_monthly * 12, 2),
-    }
+def run_pipeline_out_of_core(
+    paths: list,
+    use_llm: bool = False,
+    llm_max: int = 10,
+    api_key: Optional[str] = None,
+    no_forecast: bool = False,
+    top_untagged: int = 20,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    spill_dir: Optional[str] = None,
+    memory_limit: Optional[str] = None,
+) -> dict:
+    """
+    Run the pipeline on AWS CUR files too large to load into memory.
+
+    Normalization, feature engineering and the structural detectors run
+    as DuckDB SQL over the files (see src/duckdb_backend.py), spilling to
+    `spill_dir` beyond `memory_limit` (e.g. "8GB"); the remaining
+    detectors and scoring work on the aggregated results.
+
+    Returns:
+        dict with keys: summary, leaks, forecasts, pipeline_stats
+
+    Raises:
+        ValueError: duckdb isn't installed, or the inputs aren't a usable AWS CUR
+    """
+    duckdb_backend = _duckdb_backend()
+    if duckdb_backend is None:
+        raise ValueError("Out-of-core mode requires the duckdb package")
+
+    # ---- NORMALIZATION / FEATURES / STRUCTURAL JOINS (SQL) ----
+    analysis = duckdb_backend.analyze(
+        paths, since=since, until=until, spill_dir=spill_dir, memory_limit=memory_limit,
+    )
+    # Per-resource cost totals stand in for the normalized frame
+    features = FeatureContext(
+        analysis["resource_totals"],
+        daily_cost=analysis["daily_cost_df"],
+        resource_features=analysis["resource_df"],
+        tag_table=build_tag_table(analysis["tag_rows"]),
+    )
+
+    if features["resource_features"]["usage_to_cost_ratio"].isna().all():
+        logger.warning("No usage data found — zombie/idle detectors will produce no results.")
+
+    # ---- 30-DAY FORECAST ----
+    forecasts = [] if no_forecast else _forecast(features["daily_cost"])
+
+    # ---- LEAK DETECTION ----
+    zombie_leaks, zombie_ids = _detect(
+        features, detect_zombie_resources, ["resource_features", "cost_percentiles"]
+    )
+    idle_leaks      = _detect(features, detect_idle_resources,      ["resource_features", "daily_cost"], zombie_ids)
+    runaway_leaks   = _detect(features, detect_runaway_costs,       ["daily_cost", "resource_features"])
+    always_on_leaks = _detect(features, detect_always_on_high_cost, ["daily_cost", "normalized", "tag_table"])
+    orphaned_leaks  = _detect(features, exclude_live_lineage,       ["lineage"], analysis["orphaned_leaks"])
+    idle_db_leaks   = _detect(features, detect_idle_databases,      ["resource_features"])
+    snapshot_leaks  = _detect(features, detect_snapshot_sprawl,     ["normalized", "lineage"])
+    untagged_leaks  = _detect(features, detect_untagged_resources,  ["normalized"], top_n=top_untagged,
+                              feature_kwargs={"tag_table": "tag_table"})
+    ri_leaks        = _safe(detect_reserved_instance_waste, analysis["ri_rows"])
+
+    all_leaks = dedupe_leaks(
+        zombie_leaks + idle_leaks + runaway_leaks + always_on_leaks
+        + orphaned_leaks + idle_db_leaks + snapshot_leaks
+        + untagged_leaks + ri_leaks
+    )
+    logger.info(f"Unique leaks: {len(all_leaks)}")
 
     pipeline_stats = {
-        "provider":                   detected_provider,
-        "total_records":              len(raw_df),
-        "normalized_records":         len(normalized_df),
+        "provider":                   "AWS",
+        "providers":                  ["AWS"],
+        "total_records":              analysis["line_items"],
+        "normalized_records":         analysis["daily_rows"],
         "forecast_services":          len(forecasts),
         "llm_enabled":                use_llm,
+        "backend":                    "duckdb",
     }
 
-    return {
-        "summary":        summary,
-        "leaks":          _serialize(primary_leaks),
-        "forecasts":      _serialize(forecasts),
-        "pipeline_stats": pipeline_stats,
-    }
+    return _build_response(
+        all_leaks, features, forecasts, pipeline_stats, use_llm, llm_max, api_key,
+    )
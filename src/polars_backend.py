@@ -0,0 +1,217 @@
+"""
+Polars execution backend.
+
+Lazy-query versions of the heavy pandas stages: AWS normalization, daily
+pre-aggregation, daily cost per service, rolling z-scores and per-resource
+features. Queries run on Polars' multi-threaded engine and results come
+back in the same unified schema and shapes the pandas stages produce, so
+detectors and scoring are unchanged.
+
+Optional: requires `pip install "polars>=1.21"`. Importing this module
+raises ImportError without it — the pipeline then stays on pandas
+(see src/pipeline.py).
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import pandas as pd
+import polars as pl
+
+from src.intelligence.feature_engineering.cost_features import RESOURCE_FEATURE_COLUMNS
+from src.normalization.aggregation import (
+    CREDIT_LINE_ITEM_TYPES,
+    DAILY_GRAIN,
+    GRAIN_EXTRAS,
+    SUM_COLUMNS,
+)
+from src.normalization.aws_normalizer import (
+    CUR_TO_UNIFIED,
+    _SLASH_TO_UNDERSCORE,
+    aws_output_columns,
+)
+from src.normalization.schema import ITEM_TYPE_COLUMN, RI_SUM_COLUMNS
+from src.normalization.schema_enforcer import categorize
+
+logger = logging.getLogger(__name__)
+
+# ===================== CONFIG =====================
+
+SERVICE_KEYS = ["provider", "service"]
+RESOURCE_KEYS = ["provider", "service", "resource_id"]
+
+
+# ===================== CONVERSION =====================
+
+def to_lazy(df: pd.DataFrame) -> pl.LazyFrame:
+    """Unified pandas frame as a LazyFrame, categoricals decoded to strings."""
+    return pl.from_pandas(df).lazy().with_columns(pl.col(pl.Categorical).cast(pl.String))
+
+
+def _day_expr(name: str, dtype) -> pl.Expr:
+    """Billing day as midnight Datetime(ns), keeping the wall-clock day like to_billing_days."""
+    col = pl.col(name)
+    if dtype == pl.String:
+        # ISO 8601 timestamps all start with the calendar day
+        day = col.str.slice(0, 10).str.to_date("%Y-%m-%d", strict=False)
+    elif isinstance(dtype, pl.Datetime) and dtype.time_zone is not None:
+        day = col.dt.replace_time_zone(None).dt.date()
+    else:
+        day = col.cast(pl.Date)
+    return day.cast(pl.Datetime("ns")).alias(name)
+
+
+# ===================== NORMALIZATION =====================
+
+def normalize_aws_lazy(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """normalize_aws as a lazy query: projection, Tax filter, EBS relabel, typing."""
+    names = lf.collect_schema().names()
+    if "lineItem/UnblendedCost" in names:
+        lf = lf.rename({k: v for k, v in _SLASH_TO_UNDERSCORE.items() if k in names})
+        names = lf.collect_schema().names()
+
+    if "line_item_line_item_type" in names:
+        lf = lf.filter(pl.col("line_item_line_item_type").ne_missing("Tax"))
+
+    lf = lf.rename({k: v for k, v in CUR_TO_UNIFIED.items() if k in names})
+    names = lf.collect_schema().names()
+
+    if "service" in names:
+        service = pl.col("service").replace({"Amazon Elastic Block Store": "AmazonEBS"})
+        if "product_product_name" in names:
+            is_ebs = (
+                pl.col("product_product_name")
+                .str.contains("Elastic Block Store", literal=True)
+                .fill_null(False)
+            )
+            service = pl.when(is_ebs).then(pl.lit("AmazonEBS")).otherwise(service)
+        lf = lf.with_columns(service.alias("service"))
+
+    lf = lf.select(aws_output_columns(names))
+    schema = lf.collect_schema()
+
+    typed = [pl.col(c).cast(pl.Float64, strict=False) for c in ("cost", "usage") if c in schema]
+    if "date" in schema:
+        typed.append(_day_expr("date", schema["date"]))
+    lf = lf.with_columns(*typed, pl.lit("AWS").alias("provider"))
+
+    lf = lf.drop_nulls([c for c in ("date", "service", "cost") if c in schema])
+    missing = [c for c in ("usage", "resource_id", "region") if c not in schema]
+    if missing:
+        lf = lf.with_columns(pl.lit(None, dtype=pl.String).alias(c) for c in missing)
+    return lf
+
+
+def aggregate_daily_lazy(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """aggregate_daily as a lazy query."""
+    names = lf.collect_schema().names()
+    keys = [c for c in DAILY_GRAIN + GRAIN_EXTRAS if c in names]
+    sums = [c for c in SUM_COLUMNS if c in names]
+    carried = [c for c in names if c not in keys and c not in sums]
+
+    summed = [
+        # All-null groups stay null, matching sum(min_count=1)
+        pl.when(pl.col(c).is_not_null().any())
+        .then(pl.col(c).cast(pl.Float64, strict=False).sum())
+        .alias(c)
+        for c in sums
+    ]
+    firsts = [pl.col(c).drop_nulls().first().alias(c) for c in carried]
+
+    daily = lf.group_by(keys, maintain_order=True).agg(summed + firsts)
+    if "cost" in names:
+        # As aggregate_daily: zero-cost rows go only without usage or as credits
+        no_signal = pl.col("usage").fill_null(0) == 0 if "usage" in names else pl.lit(True)
+        if ITEM_TYPE_COLUMN in names:
+            no_signal = no_signal | pl.col(ITEM_TYPE_COLUMN).is_in(CREDIT_LINE_ITEM_TYPES).fill_null(False)
+        daily = daily.filter(~((pl.col("cost") == 0).fill_null(False) & no_signal))
+    return daily.select(names)
+
+
+def normalize_aws(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars counterpart of normalize_aws + aggregate_daily: the unified
+    daily frame, categorized, as pandas.
+    """
+    lf = pl.from_pandas(raw_df).lazy()
+    # RI amounts arrive as text when the CSV wasn't read with types
+    ri = [c for c in RI_SUM_COLUMNS if c in raw_df.columns]
+    if ri:
+        lf = lf.with_columns(pl.col(c).cast(pl.Float64, strict=False) for c in ri)
+    daily = aggregate_daily_lazy(normalize_aws_lazy(lf)).collect()
+    logger.info(f"Polars normalization: {len(raw_df):,} → {daily.height:,} rows")
+    return categorize(daily.to_pandas())
+
+
+# ===================== FEATURES =====================
+
+def daily_cost_lazy(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """daily_cost_per_service as a lazy query."""
+    return (
+        lf.group_by(["date"] + SERVICE_KEYS)
+        .agg(pl.col("cost").sum().alias("daily_cost"))
+        .sort(SERVICE_KEYS + ["date"])
+        .select(["date"] + SERVICE_KEYS + ["daily_cost"])
+    )
+
+
+def cost_zscore_lazy(daily: pl.LazyFrame) -> pl.LazyFrame:
+    """compute_cost_zscore: rolling 7-day baseline of the previous days per service."""
+    previous = pl.col("daily_cost").shift(1).over(SERVICE_KEYS)
+    return (
+        daily.sort(SERVICE_KEYS + ["date"])
+        .with_columns(previous.alias("_previous"))
+        .with_columns(
+            pl.col("_previous").rolling_mean(7, min_samples=3).over(SERVICE_KEYS).alias("rolling_mean"),
+            pl.col("_previous").rolling_std(7, min_samples=3).over(SERVICE_KEYS).alias("rolling_std"),
+        )
+        .with_columns(
+            ((pl.col("daily_cost") - pl.col("rolling_mean")) / (pl.col("rolling_std") + 0.01))
+            .alias("z_score")
+        )
+        .drop("_previous")
+    )
+
+
+def resource_features_lazy(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """resource_features: one grouped aggregation per (provider, service, resource_id)."""
+    has_usage = pl.col("usage").is_not_null()
+    usage_cost = pl.col("cost").filter(has_usage).sum()
+    return (
+        lf.drop_nulls(["resource_id"])
+        .group_by(RESOURCE_KEYS)
+        .agg(
+            pl.col("date").n_unique().alias("days_active"),
+            pl.col("cost").sum().alias("total_cost"),
+            # All-null usage stays null, matching sum(min_count=1)
+            pl.when(has_usage.any()).then(pl.col("usage").sum()).alias("total_usage"),
+            pl.when(has_usage.any() & (usage_cost != 0))
+            .then(pl.col("usage").sum() / usage_cost)
+            .alias("usage_to_cost_ratio"),
+            pl.col("date").min().alias("first_seen"),
+            pl.col("date").max().alias("last_seen"),
+        )
+        .sort(RESOURCE_KEYS)
+    )
+
+
+def compute_features(normalized_df: pd.DataFrame) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    (daily_cost_df with z-scores, resource_features table) — the pandas
+    feature stages' outputs — from one multi-threaded collect. None for
+    an empty frame or one missing usage/resource_id, where the pandas
+    stages' special cases apply.
+    """
+    if normalized_df.empty or not {"usage", "resource_id"} <= set(normalized_df.columns):
+        return None
+
+    lf = to_lazy(normalized_df)
+    daily, resources = pl.collect_all([
+        cost_zscore_lazy(daily_cost_lazy(lf)),
+        resource_features_lazy(lf),
+    ])
+    resource_df = (
+        categorize(resources.to_pandas())
+        .set_index(RESOURCE_KEYS)[RESOURCE_FEATURE_COLUMNS]
+    )
+    return daily.to_pandas(), resource_df
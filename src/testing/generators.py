@@ -0,0 +1,204 @@
+"""
+Seeded synthetic frames shaped like the pipeline's intermediate tables,
+sized by argument. The equivalence tests and the benchmarks/ timing runs
+feed them to both the vectorized code and src/testing/reference_impls.py.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.intelligence.feature_engineering.cost_features import RESOURCE_KEYS
+
+
+# ===================== compute_cost_zscore =====================
+
+def daily_costs(n_series: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """daily_cost_per_service-shaped frame with categorical keys, in date order."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=n_days)
+    df = pd.DataFrame({
+        "date":       np.repeat(dates, n_series),
+        "provider":   np.tile([["AWS", "AZURE", "GCP"][i % 3] for i in range(n_series)], n_days),
+        "service":    np.tile([f"service-{i:06d}" for i in range(n_series)], n_days),
+        "daily_cost": rng.gamma(2.0, 25.0, n_series * n_days),
+    })
+    return df.astype({"provider": "category", "service": "category"})
+
+
+# ===================== compute_30day_forecast =====================
+
+def trending_costs(n_series: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """daily_costs with a per-series linear trend and some unbilled days."""
+    df = daily_costs(n_series, n_days, seed)
+    rng = np.random.default_rng(seed + 1)
+    day = (df["date"] - df["date"].min()).dt.days.to_numpy()
+    drift = rng.normal(0.0, 2.0, n_series)[df["service"].cat.codes.to_numpy()]
+    cost = 40.0 + drift * day + df["daily_cost"].to_numpy() / 5
+    cost[rng.random(len(df)) < 0.05] = 0.0
+    return df.assign(daily_cost=np.maximum(cost, 0.0))
+
+
+# ===================== detect_zombie_resources =====================
+
+def resource_table(n_resources: int, n_services: int, seed: int = 0, categorical: bool = True) -> pd.DataFrame:
+    """resource_features-shaped table; some resources report no usage."""
+    rng = np.random.default_rng(seed)
+    service = rng.integers(0, n_services, n_resources)
+    ratio = rng.lognormal(-2.0, 1.5, n_resources)
+    ratio[rng.random(n_resources) < 0.1] = np.nan
+    df = pd.DataFrame({
+        "provider":            [["AWS", "AZURE", "GCP"][s % 3] for s in service],
+        "service":             [f"service-{s:04d}" for s in service],
+        "resource_id":         [f"res-{i:07d}" for i in range(n_resources)],
+        "days_active":         rng.integers(1, 31, n_resources),
+        "usage_to_cost_ratio": ratio,
+    })
+    if categorical:
+        df = df.astype({c: "category" for c in RESOURCE_KEYS})
+    return df.set_index(RESOURCE_KEYS).sort_index()
+
+
+# ===================== detect_orphaned_storage =====================
+
+def billing_rows(n_rows: int, seed: int = 0, categorical: bool = True) -> pd.DataFrame:
+    """
+    Normalized-shaped frame over 60 days: resources of fixed service and
+    region, about 40 rows each. Compute runs in six of eight regions, so
+    storage elsewhere (or without a region) is orphaned. Some rows lack a
+    resource_id.
+    """
+    rng = np.random.default_rng(seed)
+    services = np.array(["AmazonEC2", "AmazonEBS", "AmazonS3", "AmazonRDS", "Virtual Machines", "Disk Storage"])
+    providers = np.array(["AWS", "AWS", "AWS", "AWS", "AZURE", "AZURE"])
+    regions = np.array([f"region-{i}" for i in range(8)] + [None, ""], dtype=object)
+
+    n_ids = max(n_rows // 40, 1)
+    kind = rng.choice(len(services), n_ids, p=[0.2, 0.35, 0.2, 0.1, 0.05, 0.1])
+    is_compute_kind = np.isin(kind, [0, 4])
+    region = np.where(
+        is_compute_kind,
+        regions[rng.integers(0, 6, n_ids)],
+        regions[rng.integers(0, len(regions), n_ids)],
+    )
+
+    resource = rng.integers(0, n_ids, n_rows)
+    resource_id = np.array([f"res-{i:07d}" for i in range(n_ids)], dtype=object)[resource]
+    resource_id[rng.random(n_rows) < 0.01] = None
+
+    df = pd.DataFrame({
+        "date":        pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60, n_rows), unit="D"),
+        "provider":    providers[kind[resource]],
+        "service":     services[kind[resource]],
+        "resource_id": resource_id,
+        "region":      region[resource],
+        "cost":        rng.gamma(2.0, 1.0, n_rows),
+    })
+    if categorical:
+        df = df.astype({c: "category" for c in ("provider", "service", "resource_id", "region")})
+    return df
+
+
+# ===================== detect_snapshot_sprawl =====================
+
+def snapshot_rows(n_rows: int, seed: int = 0, categorical: bool = True) -> pd.DataFrame:
+    """
+    Normalized-shaped frame over 60 days: instances, databases, volumes and
+    snapshots, about 40 rows each. A tenth of the snapshot IDs also bill
+    under EC2. Some rows lack a resource_id.
+    """
+    rng = np.random.default_rng(seed)
+    services = np.array(["AmazonEC2", "AmazonRDS", "AmazonEBS", "EBS Snapshot", "Azure Backup"])
+    providers = np.array(["AWS", "AWS", "AWS", "AWS", "AZURE"])
+    prefixes = np.array(["i", "db", "vol", "snap", "bak"])
+
+    n_ids = max(n_rows // 40, 1)
+    kind = rng.choice(len(services), n_ids, p=[0.3, 0.1, 0.3, 0.2, 0.1])
+    ids = np.array([f"{prefixes[k]}-{i:07d}" for i, k in enumerate(kind)], dtype=object)
+
+    resource = rng.integers(0, n_ids, n_rows)
+    row_kind = kind[resource]
+    # Some snapshot IDs also appear under a compute service
+    snapshots = np.flatnonzero(kind == 3)
+    shared = snapshots[rng.random(len(snapshots)) < 0.1]
+    relabel = np.isin(resource, shared) & (rng.random(n_rows) < 0.2)
+    row_kind = np.where(relabel, 0, row_kind)
+
+    resource_id = ids[resource]
+    resource_id[rng.random(n_rows) < 0.01] = None
+
+    df = pd.DataFrame({
+        "date":        pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 60, n_rows), unit="D"),
+        "provider":    providers[row_kind],
+        "service":     services[row_kind],
+        "resource_id": resource_id,
+        "cost":        rng.gamma(2.0, 1.0, n_rows),
+    })
+    if categorical:
+        df = df.astype({c: "category" for c in ("provider", "service", "resource_id")})
+    return df
+
+
+# ===================== detect_untagged_resources =====================
+
+def tagged_rows(n_rows: int, seed: int = 0, categorical: bool = True) -> pd.DataFrame:
+    """
+    Normalized-shaped frame: resources of fixed service and owner tag,
+    about 4 rows each. A third of the resources have no owner, or a
+    placeholder one; costs repeat so the top-N has ties. Some rows lack a
+    resource_id, and some services cost nothing.
+    """
+    rng = np.random.default_rng(seed)
+    services = np.array(["AmazonEC2", "AmazonEBS", "AmazonS3", "AmazonRDS", "Free Tier"])
+    owners = np.array(["team-a", "team-b", "team-c", "team-d", None, "unknown", ""], dtype=object)
+
+    n_ids = max(n_rows // 4, 1)
+    kind = rng.integers(0, len(services), n_ids)
+    owner = owners[rng.choice(len(owners), n_ids, p=[0.2, 0.2, 0.15, 0.15, 0.2, 0.05, 0.05])]
+
+    resource = rng.integers(0, n_ids, n_rows)
+    resource_id = np.array([f"res-{i:07d}" for i in range(n_ids)], dtype=object)[resource]
+    resource_id[rng.random(n_rows) < 0.01] = None
+    cost = rng.integers(0, 40, n_rows) / 4
+    cost[kind[resource] == 4] = 0.0
+
+    df = pd.DataFrame({
+        "provider":                 "AWS",
+        "service":                  services[kind[resource]],
+        "resource_id":              resource_id,
+        "cost":                     cost,
+        "resource_tags_user_owner": owner[resource],
+    })
+    if categorical:
+        df = df.astype({c: "category" for c in ("provider", "service", "resource_id")})
+    return df
+
+
+# ===================== detect_always_on_high_cost =====================
+
+def service_rows(n_rows: int, n_services: int, seed: int = 0, categorical: bool = True) -> pd.DataFrame:
+    """
+    Normalized-shaped frame over 30 days: compute, database and storage
+    services billing every day, half of them above the always-on cost
+    threshold. A third of the services carry an owner tag on some rows.
+    """
+    rng = np.random.default_rng(seed)
+    prefixes = np.array(["ec2", "rds", "s3"])
+    names = np.array([f"{prefixes[i % 3]}-{i:05d}" for i in range(n_services)], dtype=object)
+    owned = rng.random(n_services) < 1 / 3
+    # Mean daily cost per service: 20 or 150, against the 50/day threshold
+    scale = rng.choice([20.0, 150.0], n_services) / 2 * n_services * 30 / n_rows
+
+    service = rng.integers(0, n_services, n_rows)
+    owner = np.where(owned[service] & (rng.random(n_rows) < 0.2), "team-a", None)
+
+    df = pd.DataFrame({
+        "date":                     pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 30, n_rows), unit="D"),
+        "provider":                 np.where(service % 5 == 0, "AZURE", "AWS"),
+        "service":                  names[service],
+        "resource_id":              [f"res-{s:05d}" for s in service],
+        "cost":                     rng.gamma(2.0, scale[service]),
+        "resource_tags_user_owner": owner,
+    })
+    if categorical:
+        df = df.astype({c: "category" for c in ("provider", "service", "resource_id")})
+    return df
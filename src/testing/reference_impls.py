@@ -0,0 +1,314 @@
+"""
+Reference implementations the vectorized detectors and features replaced.
+The equivalence tests and the benchmarks/ timing runs check the current
+code against them on the frames in src/testing/generators.py.
+"""
+
+import logging
+from typing import Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+from src.intelligence.leak_detection.rule_based import (
+    ALWAYS_ON_MIN_DAILY_COST,
+    ALWAYS_ON_PRESENCE_RATIO,
+    ZOMBIE_MIN_DAYS,
+    get_service_category,
+)
+from src.intelligence.leak_detection.structural import (
+    MISSING_TAG_VALUES,
+    is_block_storage,
+    is_compute,
+    is_snapshot,
+    orphaned_storage_leak,
+    snapshot_sprawl_leak,
+)
+from src.normalization.tags import ownership_tags
+
+logger = logging.getLogger(__name__)
+
+
+# ===================== compute_cost_zscore =====================
+
+def zscore_per_service(daily_cost_df: pd.DataFrame) -> pd.DataFrame:
+    """The original implementation: sort, copy and window each service, then concat."""
+    result = []
+    for _, g in daily_cost_df.groupby(["provider", "service"], observed=True):
+        g = g.sort_values("date").copy()
+        shifted = g["daily_cost"].shift(1)
+        g["rolling_mean"] = shifted.rolling(7, min_periods=3).mean()
+        g["rolling_std"]  = shifted.rolling(7, min_periods=3).std()
+        g["z_score"] = (g["daily_cost"] - g["rolling_mean"]) / (g["rolling_std"] + 0.01)
+        result.append(g)
+    return pd.concat(result, ignore_index=True)
+
+
+# ===================== compute_30day_forecast =====================
+
+def forecast_per_service(daily_cost_df: pd.DataFrame) -> list:
+    """The original implementation: one np.polyfit per (provider, service)."""
+    forecasts = []
+
+    for (provider, service), g in daily_cost_df.groupby(["provider", "service"], observed=True):
+        if g["daily_cost"].sum() < 0.01:
+            continue
+        g = g.sort_values("date").copy()
+        g = g[g["daily_cost"] > 0]
+        if len(g) < 3:
+            continue
+
+        x = np.arange(len(g), dtype=float)
+        y = g["daily_cost"].values.astype(float)
+
+        try:
+            slope, intercept = np.polyfit(x, y, 1)
+        except Exception as e:
+            logger.debug(f"Forecast failed for {provider}/{service}: {e}")
+            continue
+
+        mean_cost = float(y.mean())
+        if mean_cost > 0 and float(y.std()) / mean_cost > 1.0:
+            continue
+
+        projected_daily   = intercept + slope * (len(g) + 30)
+        if projected_daily < 0:
+            projected_daily = mean_cost
+        projected_monthly = round(projected_daily * 30, 2)
+
+        last_n           = y[-min(30, len(y)):]
+        last_30d_actual  = round(float(last_n.mean()) * 30, 2)
+        baseline         = max(last_30d_actual, 0.01)
+
+        projected_monthly = round(min(projected_monthly, baseline * 3), 2)
+
+        raw_trend = ((projected_monthly - last_30d_actual) / baseline) * 100
+        trend_pct = round(max(-150.0, min(150.0, raw_trend)), 1)
+
+        forecasts.append({
+            "provider":              provider,
+            "service":               service,
+            "projected_monthly_cost": projected_monthly,
+            "last_30d_actual":       last_30d_actual,
+            "trend_pct":             trend_pct,
+        })
+
+    forecasts.sort(key=lambda x: -x["projected_monthly_cost"])
+    return forecasts
+
+
+# ===================== detect_zombie_resources =====================
+
+def zombie_per_resource(resource_df: pd.DataFrame, cost_percentiles=None):
+    """The original implementation: the service's ratios are re-scanned and re-sorted per resource."""
+    leaks, zombie_resource_ids = [], set()
+
+    usage_lookup = resource_df["usage_to_cost_ratio"].dropna().to_dict()
+
+    for (provider, service, resource_id), days_active in resource_df["days_active"].items():
+        usage_ratio = usage_lookup.get((provider, service, resource_id))
+        if usage_ratio is None:
+            continue
+
+        if cost_percentiles:
+            service_ratios = [
+                v for (p, s, _), v in usage_lookup.items()
+                if p == provider and s == service
+            ]
+            if len(service_ratios) >= 4:
+                service_ratios_sorted = sorted(service_ratios)
+                p25_idx   = max(0, int(len(service_ratios_sorted) * 0.25) - 1)
+                threshold = service_ratios_sorted[p25_idx]
+            else:
+                threshold = {"AWS": 0.05, "AZURE": 0.10}.get(provider, 3.0)
+        else:
+            threshold = {"AWS": 0.05, "AZURE": 0.10}.get(provider, 3.0)
+
+        if days_active >= ZOMBIE_MIN_DAYS and usage_ratio < threshold:
+            zombie_resource_ids.add(resource_id)
+            leaks.append({
+                "leak_type":   "ZOMBIE_RESOURCE",
+                "provider":    provider,
+                "service":     service,
+                "resource_id": resource_id,
+                "reason": (
+                    f"Active {days_active} days with usage-to-cost ratio of "
+                    f"{usage_ratio:.4f} (below service p25 threshold {threshold:.4f})"
+                ),
+            })
+
+    return leaks, zombie_resource_ids
+
+
+# ===================== detect_orphaned_storage =====================
+
+def orphaned_storage_per_row(normalized_df: pd.DataFrame) -> List[Dict]:
+    """The original implementation: one iterrows pass building Python slot sets."""
+    leaks: List[Dict] = []
+    compute_slots: Set[tuple] = set()
+    storage_resources: Dict[str, Dict] = {}
+
+    for _, row in normalized_df.iterrows():
+        provider    = row.get("provider")
+        service     = row.get("service")
+        resource_id = row.get("resource_id")
+        date        = row.get("date")
+        region      = row.get("region", "unknown") or "unknown"
+
+        if not resource_id:
+            continue
+
+        slot = (provider, str(date), region)
+
+        if is_compute(service, provider):
+            compute_slots.add(slot)
+
+        elif is_block_storage(service, provider):
+            if resource_id not in storage_resources:
+                storage_resources[resource_id] = {
+                    "provider":    provider,
+                    "service":     service,
+                    "resource_id": resource_id,
+                    "slots":       set(),
+                }
+            storage_resources[resource_id]["slots"].add(slot)
+
+    for rid, info in storage_resources.items():
+        if not info["slots"] & compute_slots:
+            leaks.append(orphaned_storage_leak(info["provider"], info["service"], rid))
+
+    return leaks
+
+
+# ===================== detect_snapshot_sprawl =====================
+
+def snapshot_sprawl_per_row(normalized_df: pd.DataFrame) -> List[Dict]:
+    """The original implementation: one iterrows pass building Python ID sets."""
+    leaks: List[Dict] = []
+    active_resources: Set[str] = set()
+    snapshot_resources: Dict[str, Dict] = {}
+
+    for _, row in normalized_df.iterrows():
+        provider    = row.get("provider")
+        service     = row.get("service")
+        resource_id = row.get("resource_id")
+
+        if not resource_id:
+            continue
+
+        if get_service_category(service) in {"compute", "database"}:
+            active_resources.add(resource_id)
+
+        if is_snapshot(service, provider):
+            snapshot_resources.setdefault(resource_id, {
+                "provider": provider,
+                "service":  service,
+            })
+
+    for rid, info in snapshot_resources.items():
+        if rid not in active_resources:
+            leaks.append(snapshot_sprawl_leak(info["provider"], info["service"], rid))
+
+    return leaks
+
+
+# ===================== detect_untagged_resources =====================
+
+def untagged_per_row(normalized_df: pd.DataFrame, tag_table: pd.DataFrame, top_n: int = 20) -> List[Dict]:
+    """The original implementation: one iterrows pass with per-resource dict lookups."""
+    candidates: List[Dict] = []
+    seen: Set[str] = set()
+
+    owned = ownership_tags(tag_table)
+    owned = owned[~owned["value"].str.lower().isin(MISSING_TAG_VALUES)]
+    owned_ids = set(owned["resource_id"].dropna())
+
+    resource_cost = (
+        normalized_df.dropna(subset=["resource_id"])
+        .groupby("resource_id", observed=True)["cost"]
+        .sum()
+        .to_dict()
+    )
+    service_cost = (
+        normalized_df.dropna(subset=["service"])
+        .groupby(["provider", "service"], observed=True)["cost"]
+        .sum()
+        .to_dict()
+    )
+
+    for _, row in normalized_df.iterrows():
+        resource_id = row.get("resource_id")
+        if not resource_id or resource_id in seen:
+            continue
+        seen.add(resource_id)
+
+        provider = row.get("provider")
+        service  = row.get("service")
+
+        resource_total = resource_cost.get(resource_id, 0.0)
+        service_total  = service_cost.get((provider, service), 0.0)
+        if resource_total < 0.01 and service_total < 0.01:
+            continue
+
+        if resource_id not in owned_ids:
+            candidates.append({
+                "leak_type":   "UNTAGGED_RESOURCE",
+                "provider":    provider,
+                "service":     service,
+                "resource_id": resource_id,
+                "reason": (
+                    "Resource has no ownership tags "
+                    "(owner / project / environment missing)"
+                ),
+                "_cost": resource_total,
+            })
+
+    candidates.sort(key=lambda x: -x["_cost"])
+    top = candidates[:top_n]
+    for c in top:
+        c.pop("_cost", None)
+    return top
+
+
+# ===================== detect_always_on_high_cost =====================
+
+def always_on_per_service(normalized_df: pd.DataFrame, daily_cost_df: pd.DataFrame) -> List[Dict]:
+    """The original implementation: the whole frame is masked for each qualifying service."""
+    leaks: List[Dict] = []
+
+    total_days = daily_cost_df["date"].nunique()
+    days_present = daily_cost_df.groupby(["provider", "service"])["date"].nunique().to_dict()
+    avg_cost = daily_cost_df.groupby(["provider", "service"])["daily_cost"].mean().to_dict()
+
+    for (provider, service), cost in avg_cost.items():
+        if get_service_category(service) not in {"compute", "database"}:
+            continue
+        if cost < ALWAYS_ON_MIN_DAILY_COST:
+            continue
+
+        presence_ratio = days_present.get((provider, service), 0) / max(total_days, 1)
+        if presence_ratio < ALWAYS_ON_PRESENCE_RATIO:
+            continue
+
+        rows = normalized_df[
+            (normalized_df["provider"] == provider) &
+            (normalized_df["service"]  == service)
+        ]
+        owner_cols = [
+            c for c in rows.columns
+            if any(k in c.lower() for k in ["owner", "project", "environment"])
+        ]
+        if any(rows[c].notna().any() for c in owner_cols):
+            continue
+
+        leaks.append({
+            "leak_type": "ALWAYS_ON_HIGH_COST",
+            "provider":  provider,
+            "service":   service,
+            "reason": (
+                f"Always-on service costing ${cost:.2f}/day "
+                f"with no ownership metadata"
+            ),
+        })
+
+    return leaks
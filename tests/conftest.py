@@ -77,16 +77,21 @@ def daily_cost_df(normalized_df):
     return compute_cost_zscore(df)
 
 
-@pytest.fixture
-def lifespan_results(normalized_df):
-    from src.intelligence.feature_engineering.cost_features import resource_lifespan
-    return resource_lifespan(normalized_df)
+def make_resource_features(rows: list[dict]) -> pd.DataFrame:
+    """resource_features-shaped table from per-resource row dicts."""
+    from src.intelligence.feature_engineering.cost_features import RESOURCE_KEYS
+    defaults = {"provider": "AWS", "service": "ec2", "resource_id": "res-001",
+                "days_active": 1, "total_cost": 0.0, "usage_to_cost_ratio": None}
+    df = pd.DataFrame([{**defaults, **row} for row in rows],
+                      columns=RESOURCE_KEYS + list(defaults)[3:])
+    df["usage_to_cost_ratio"] = df["usage_to_cost_ratio"].astype(float)
+    return df.set_index(RESOURCE_KEYS)
 
 
 @pytest.fixture
-def usage_ratio_data(normalized_df):
-    from src.intelligence.feature_engineering.cost_features import usage_cost_ratio
-    return usage_cost_ratio(normalized_df)
+def resource_df(normalized_df):
+    from src.intelligence.feature_engineering.cost_features import resource_features
+    return resource_features(normalized_df)
 
 
 @pytest.fixture
@@ -0,0 +1,84 @@
+"""Tests for src/ingestion/arrow_reader.py — pyarrow engine with provider schemas."""
+
+import io
+import logging
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.ingestion.arrow_reader import read_csv_arrow
+from src.ingestion.csv_loader import read_billing_csv
+
+
+def _cur_csv() -> bytes:
+    return (
+        b"line_item_usage_start_date,line_item_usage_account_id,line_item_line_item_type,"
+        b"product_servicecode,line_item_unblended_cost,line_item_usage_amount,pricing_term\n"
+        b"2024-03-01T00:00:00Z,012345678901,Usage,AmazonEC2,1.5,2,OnDemand\n"
+        b"2024-03-02T00:00:00Z,012345678901,Usage,AmazonEC2,,3,OnDemand\n"
+    )
+
+
+class TestReadCsvArrow:
+    def test_applies_aws_types(self):
+        df = read_csv_arrow(io.BytesIO(_cur_csv()))
+        assert pd.api.types.is_datetime64_any_dtype(df["line_item_usage_start_date"])
+        assert df["line_item_unblended_cost"].dtype == "float64"
+        assert df["line_item_usage_account_id"].iloc[0] == "012345678901"
+
+    def test_cur_timestamps_parse_without_fallback(self, caplog):
+        data = _cur_csv().replace(b"T00:00:00Z,012", b"T00:00:00.000Z,012", 1)
+        with caplog.at_level(logging.WARNING, logger="src.ingestion.arrow_reader"):
+            df = read_csv_arrow(io.BytesIO(data))
+        assert "Typed parse failed" not in caplog.text
+        assert str(df["line_item_usage_start_date"].dt.tz) == "UTC"
+        assert df["line_item_usage_amount"].dtype == "float64"
+
+    def test_empty_cells_become_null(self):
+        df = read_csv_arrow(io.BytesIO(_cur_csv()))
+        assert df["line_item_unblended_cost"].isna().sum() == 1
+
+    def test_projects_columns(self):
+        df = read_csv_arrow(io.BytesIO(_cur_csv()))
+        assert "pricing_term" not in df.columns
+
+    def test_gcp_timestamps_with_zone_suffix(self):
+        data = (b"usage_start_time,service_description,cost,billing_account_id\n"
+                b"2024-03-01 00:00:00 UTC,Compute Engine,4.0,ABC-123\n")
+        df = read_csv_arrow(io.BytesIO(data))
+        assert pd.api.types.is_datetime64_any_dtype(df["usage_start_time"])
+
+    def test_bad_value_falls_back_to_inferred_types(self):
+        data = (b"line_item_usage_start_date,line_item_usage_account_id,line_item_unblended_cost\n"
+                b"2024-03-01,012345678901,invalid\n")
+        df = read_csv_arrow(io.BytesIO(data))
+        assert len(df) == 1
+        assert df["line_item_unblended_cost"].iloc[0] == "invalid"
+
+    def test_date_window(self):
+        df = read_csv_arrow(io.BytesIO(_cur_csv()), since=date(2024, 3, 2))
+        assert len(df) == 1
+
+    def test_date_window_after_fallback(self):
+        # Zone-less CUR timestamps don't fit the UTC type and are re-read untyped
+        data = (b"line_item_usage_start_date,line_item_unblended_cost\n"
+                b"2024-03-01T00:00:00,1.0\n2024-03-02T00:00:00,1.0\n")
+        df = read_csv_arrow(io.BytesIO(data), until=date(2024, 3, 1))
+        assert len(df) == 1
+
+    def test_nrows(self):
+        df = read_csv_arrow(io.BytesIO(_cur_csv()), nrows=1)
+        assert len(df) == 1
+
+
+class TestReadBillingCsv:
+    def test_engines_agree_on_values(self):
+        by_pandas = read_billing_csv(io.BytesIO(_cur_csv()), engine="pandas")
+        by_arrow  = read_billing_csv(io.BytesIO(_cur_csv()), engine="pyarrow")
+        assert list(by_pandas.columns) == list(by_arrow.columns)
+        assert by_pandas["line_item_usage_amount"].tolist() == by_arrow["line_item_usage_amount"].tolist()
+
+    def test_unknown_engine_raises(self):
+        with pytest.raises(ValueError, match="Unknown CSV engine"):
+            read_billing_csv(io.BytesIO(_cur_csv()), engine="polars")
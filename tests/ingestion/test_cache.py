@@ -0,0 +1,131 @@
+"""Tests for src/ingestion/cache.py — content-addressed normalized-data cache."""
+
+import io
+import os
+import time
+from datetime import date
+
+import pandas as pd
+
+from src.ingestion import cache
+from src.ingestion.cache import (
+    cache_entries,
+    cache_key,
+    evict,
+    load_cached,
+    purge,
+    store_cached,
+)
+
+
+def _normalized(n: int = 5) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date":        pd.date_range("2024-03-01", periods=n, freq="D"),
+        "provider":    "AWS",
+        "service":     "AmazonEC2",
+        "cost":        [float(i) for i in range(n)],
+        "usage":       1.0,
+        "resource_id": [f"i-{i}" for i in range(n)],
+        "region":      None,
+    })
+
+
+# ===================== cache_key =====================
+
+class TestCacheKey:
+    def test_same_content_same_key(self, tmp_path):
+        path = tmp_path / "cur.csv"
+        path.write_bytes(b"a,b\n1,2\n")
+        assert cache_key([str(path)]) == cache_key([io.BytesIO(b"a,b\n1,2\n")])
+
+    def test_content_changes_key(self):
+        assert cache_key([io.BytesIO(b"a\n1\n")]) != cache_key([io.BytesIO(b"a\n2\n")])
+
+    def test_params_change_key(self):
+        src = b"a\n1\n"
+        base = cache_key([io.BytesIO(src)])
+        assert cache_key([io.BytesIO(src)], since=date(2024, 3, 1)) != base
+        assert cache_key([io.BytesIO(src)], provider=None) == base
+
+    def test_engine_and_backend_change_key(self):
+        src = b"a\n1\n"
+        pandas_key = cache_key([io.BytesIO(src)], engine="pandas", backend="pandas")
+        assert cache_key([io.BytesIO(src)], engine="pandas", backend="polars") != pandas_key
+        assert cache_key([io.BytesIO(src)], engine="pyarrow", backend="pandas") != pandas_key
+
+    def test_normalizer_version_changes_key(self, monkeypatch):
+        before = cache_key([io.BytesIO(b"a\n1\n")])
+        monkeypatch.setattr(cache, "NORMALIZER_VERSION", "test")
+        assert cache_key([io.BytesIO(b"a\n1\n")]) != before
+
+    def test_file_object_rewound(self):
+        buffer = io.BytesIO(b"a\n1\n")
+        cache_key([buffer])
+        assert buffer.tell() == 0
+
+
+# ===================== load / store =====================
+
+class TestLoadStore:
+    def test_miss_returns_none(self, tmp_path):
+        assert load_cached("missing", str(tmp_path)) is None
+
+    def test_round_trip(self, tmp_path):
+        df = _normalized()
+        store_cached("k", df, str(tmp_path))
+        cached = load_cached("k", str(tmp_path))
+        pd.testing.assert_frame_equal(cached, df)
+
+    def test_dates_stay_datetime64(self, tmp_path):
+        store_cached("k", _normalized(), str(tmp_path))
+        assert load_cached("k", str(tmp_path))["date"].dtype == "datetime64[ns]"
+
+    def test_uncacheable_frame_skipped(self, tmp_path):
+        df = _normalized()
+        df["mixed"] = [1, "a", 2.0, None, object()]
+        assert store_cached("k", df, str(tmp_path)) is None
+        assert os.listdir(tmp_path) == []
+
+    def test_corrupt_entry_discarded(self, tmp_path):
+        (tmp_path / "k.arrow").write_bytes(b"not arrow")
+        assert load_cached("k", str(tmp_path)) is None
+        assert not (tmp_path / "k.arrow").exists()
+
+
+# ===================== maintenance =====================
+
+class TestEviction:
+    def _fill(self, cache_dir, keys):
+        for i, key in enumerate(keys):
+            store_cached(key, _normalized(), cache_dir)
+            stamp = time.time() - 100 + i
+            os.utime(os.path.join(cache_dir, key + ".arrow"), (stamp, stamp))
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        self._fill(str(tmp_path), ["a", "b", "c"])
+        load_cached("a", str(tmp_path))  # a becomes most recent
+        size = cache_entries(str(tmp_path))[0]["size"]
+        removed = evict(str(tmp_path), max_bytes=2 * size)
+        assert removed == ["b"]
+
+    def test_store_enforces_bound(self, tmp_path):
+        self._fill(str(tmp_path), ["a", "b"])
+        size = cache_entries(str(tmp_path))[0]["size"]
+        store_cached("c", _normalized(), str(tmp_path), max_bytes=size)
+        assert [e["key"] for e in cache_entries(str(tmp_path))] == ["c"]
+
+    def test_purge_older_than(self, tmp_path):
+        self._fill(str(tmp_path), ["a", "b"])
+        old = time.time() - 3 * 86400
+        os.utime(tmp_path / "a.arrow", (old, old))
+        assert purge(str(tmp_path), older_than_days=1) == ["a"]
+        assert purge(str(tmp_path)) == ["b"]
+
+
+class TestCacheCli:
+    def test_list_and_purge(self, tmp_path, capsys):
+        store_cached("abc", _normalized(), str(tmp_path))
+        cache.main(["--dir", str(tmp_path), "list"])
+        assert "1 entries" in capsys.readouterr().out
+        cache.main(["--dir", str(tmp_path), "purge"])
+        assert "Removed 1 entries" in capsys.readouterr().out
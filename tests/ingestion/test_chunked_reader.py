@@ -0,0 +1,114 @@
+"""Tests for src/ingestion/chunked_reader.py — column projection and chunked reads."""
+
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.ingestion.chunked_reader import (
+    iter_csv_chunks,
+    keep_column,
+    read_csv_projected,
+)
+
+
+def _cur_csv(n_rows: int = 10) -> bytes:
+    header = ("line_item_usage_start_date,line_item_usage_account_id,"
+              "product_servicecode,line_item_unblended_cost,"
+              "resource_tags_user_owner,pricing_term,product_sku")
+    rows = [header]
+    for i in range(n_rows):
+        rows.append(f"2024-03-{i % 28 + 1:02d},012345678901,AmazonEC2,{i}.5,team-a,OnDemand,SKU{i}")
+    return "\n".join(rows).encode()
+
+
+# ===================== keep_column =====================
+
+class TestKeepColumn:
+    def test_keeps_cur_columns(self):
+        assert keep_column("line_item_unblended_cost")
+        assert keep_column("lineItem/UnblendedCost")
+
+    def test_keeps_azure_and_gcp_candidates(self):
+        assert keep_column("CostInBillingCurrency")
+        assert keep_column("usage_start_time")
+
+    def test_keeps_tag_columns(self):
+        assert keep_column("resource_tags_user_cost_center")
+        assert keep_column("labels.owner")
+
+    def test_drops_unused_columns(self):
+        assert not keep_column("pricing_term")
+        assert not keep_column("product_sku")
+
+
+# ===================== read_csv_projected =====================
+
+class TestReadCsvProjected:
+    def test_drops_unprojected_columns(self):
+        df = read_csv_projected(io.BytesIO(_cur_csv()))
+        assert "pricing_term" not in df.columns
+        assert "product_sku" not in df.columns
+        assert "resource_tags_user_owner" in df.columns
+
+    def test_project_false_keeps_everything(self):
+        df = read_csv_projected(io.BytesIO(_cur_csv()), project=False)
+        assert "product_sku" in df.columns
+
+    def test_concatenates_all_chunks(self):
+        df = read_csv_projected(io.BytesIO(_cur_csv(25)), chunksize=4)
+        assert len(df) == 25
+
+    def test_account_id_kept_as_string(self):
+        df = read_csv_projected(io.BytesIO(_cur_csv()))
+        assert df["line_item_usage_account_id"].iloc[0] == "012345678901"
+
+    def test_cost_is_numeric(self):
+        df = read_csv_projected(io.BytesIO(_cur_csv()))
+        assert df["line_item_unblended_cost"].dtype == "float64"
+
+    def test_unknown_format_reads_all_columns(self):
+        df = read_csv_projected(io.BytesIO(b"foo,bar\n1,2\n"))
+        assert list(df.columns) == ["foo", "bar"]
+
+    def test_empty_source_raises(self):
+        with pytest.raises(pd.errors.EmptyDataError):
+            read_csv_projected(io.BytesIO(b""))
+
+
+# ===================== iter_csv_chunks =====================
+
+class TestIterCsvChunks:
+    def test_yields_bounded_chunks(self):
+        chunks = list(iter_csv_chunks(io.BytesIO(_cur_csv(10)), chunksize=3))
+        assert [len(c) for c in chunks] == [3, 3, 3, 1]
+
+    def test_invalid_cost_coerced_to_nan(self):
+        data = b"line_item_unblended_cost\n1.0\ninvalid\n"
+        chunk = next(iter_csv_chunks(io.BytesIO(data)))
+        assert chunk["line_item_unblended_cost"].isna().sum() == 1
+
+
+# ===================== date window =====================
+
+class TestDateWindow:
+    def _csv(self) -> bytes:
+        rows = ["line_item_usage_start_date,line_item_unblended_cost"]
+        rows += [f"2024-03-{d:02d}T{h:02d}:00:00Z,1.0" for d in range(1, 31) for h in (0, 12)]
+        return "\n".join(rows).encode()
+
+    def test_filters_each_chunk(self):
+        df = read_csv_projected(
+            io.BytesIO(self._csv()), chunksize=7,
+            since=date(2024, 3, 10), until=date(2024, 3, 16),
+        )
+        assert len(df) == 14
+
+    def test_open_ended_window(self):
+        df = read_csv_projected(io.BytesIO(self._csv()), until=date(2024, 3, 2))
+        assert len(df) == 4
+
+    def test_window_ignored_without_date_column(self):
+        df = read_csv_projected(io.BytesIO(b"cost\n1\n2\n"), since=date(2024, 1, 1))
+        assert len(df) == 2
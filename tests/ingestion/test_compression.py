@@ -0,0 +1,126 @@
+"""Tests for src/ingestion/compression.py — streaming decompression and zip archives."""
+
+import gzip
+import io
+import zipfile
+
+import pyarrow as pa
+import pytest
+
+from src.ingestion.compression import (
+    iter_archive_members,
+    open_decompressed,
+    split_compression,
+)
+from src.ingestion.csv_loader import load_billing_archive, load_billing_file, load_csv
+
+AWS_CSV = (
+    "line_item_usage_start_date,line_item_usage_account_id,product_servicecode,"
+    "line_item_unblended_cost\n"
+    + "".join(f"2024-03-{d:02d},012345678901,AmazonEC2,{d}.0\n" for d in range(1, 11))
+).encode()
+
+AZURE_CSV = (
+    "SubscriptionId,UsageDate,MeterName,CostInUSD\n"
+    + "".join(f"sub-1,2024-03-{d:02d},Compute,{d}.0\n" for d in range(1, 6))
+).encode()
+
+
+def _zstd(data: bytes) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(sink, "zstd") as out:
+        out.write(data)
+    return sink.getvalue().to_pybytes()
+
+
+# ===================== split_compression =====================
+
+class TestSplitCompression:
+    def test_compressed_csv(self):
+        assert split_compression("cur.csv.gz") == (".csv", "gzip")
+        assert split_compression("cur.CSV.ZST") == (".csv", "zstd")
+
+    def test_uncompressed(self):
+        assert split_compression("cur.parquet") == (".parquet", None)
+
+    def test_zip(self):
+        assert split_compression("exports.zip") == ("", "zip")
+
+
+# ===================== open_decompressed =====================
+
+class TestOpenDecompressed:
+    def test_gzip_stream_rewinds(self):
+        stream = open_decompressed(io.BytesIO(gzip.compress(AWS_CSV)), "gzip")
+        first = stream.readline()
+        stream.seek(0)
+        assert stream.readline() == first
+        assert first.startswith(b"line_item_usage_start_date")
+
+    def test_zstd_round_trip(self):
+        stream = open_decompressed(io.BytesIO(_zstd(AWS_CSV)), "zstd")
+        assert stream.read() == AWS_CSV
+
+    def test_only_rewind_supported(self):
+        stream = open_decompressed(io.BytesIO(gzip.compress(AWS_CSV)), "gzip")
+        with pytest.raises(io.UnsupportedOperation):
+            stream.seek(10)
+
+    def test_unknown_codec_raises(self):
+        with pytest.raises(ValueError):
+            open_decompressed(io.BytesIO(b""), "bz2")
+
+
+# ===================== loaders =====================
+
+class TestCompressedLoaders:
+    @pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+    def test_load_csv_gz(self, tmp_path, engine):
+        path = tmp_path / "cur.csv.gz"
+        path.write_bytes(gzip.compress(AWS_CSV))
+        df = load_csv(str(path), engine=engine)
+        assert len(df) == 10
+        assert df["line_item_usage_account_id"].iloc[0] == "012345678901"
+
+    def test_load_csv_zst_chunked(self, tmp_path):
+        path = tmp_path / "cur.csv.zst"
+        path.write_bytes(_zstd(AWS_CSV))
+        assert len(load_csv(str(path), chunksize=3)) == 10
+
+    def test_single_export_zip(self, tmp_path):
+        path = tmp_path / "cur.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("cur.csv", AWS_CSV)
+        assert len(load_billing_file(str(path))) == 10
+
+
+class TestArchives:
+    @pytest.fixture
+    def archive(self, tmp_path):
+        path = tmp_path / "exports.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("aws/cur-1.csv", AWS_CSV)
+            zf.writestr("aws/cur-2.csv.gz", gzip.compress(AWS_CSV))
+            zf.writestr("azure/export.csv", AZURE_CSV)
+            zf.writestr("README.txt", b"not billing data")
+            zf.writestr("__MACOSX/aws/._cur-1.csv", b"junk")
+        return str(path)
+
+    def test_members_skip_non_exports(self, archive):
+        names = [name for name, _ in iter_archive_members(archive)]
+        assert names == ["aws/cur-1.csv", "aws/cur-2.csv.gz", "azure/export.csv"]
+
+    def test_groups_by_provider(self, archive):
+        frames = load_billing_archive(archive)
+        assert set(frames) == {"AWS", "AZURE"}
+        assert len(frames["AWS"]) == 20
+        assert len(frames["AZURE"]) == 5
+
+    def test_multi_provider_needs_provider(self, archive):
+        with pytest.raises(ValueError):
+            load_billing_file(archive)
+        assert len(load_billing_file(archive, provider="azure")) == 5
+
+    def test_missing_provider_raises(self, archive):
+        with pytest.raises(ValueError):
+            load_billing_file(archive, provider="gcp")
@@ -0,0 +1,63 @@
+"""Tests for src/ingestion/multi_cloud.py — consolidated multi-provider loads."""
+
+import zipfile
+
+import pandas as pd
+import pytest
+
+from src.ingestion.multi_cloud import load_multi_cloud
+
+
+AWS_CSV = (
+    "line_item_usage_start_date,line_item_usage_account_id,product_servicecode,"
+    "line_item_resource_id,line_item_unblended_cost,line_item_usage_amount,"
+    "line_item_line_item_type\n"
+    "2024-03-01T00:00:00Z,012345678901,AmazonEC2,i-001,1.5,1,Usage\n"
+    "2024-03-01T01:00:00Z,012345678901,AmazonEC2,i-001,1.5,1,Usage\n"
+)
+
+AZURE_CSV = (
+    "UsageDate,SubscriptionId,ServiceName,CostInUSD,Quantity,ResourceId,Region,Tags\n"
+    "2024-03-01,sub-1,Virtual Machines,10.0,100,vm-001,eastus,owner=team-a\n"
+)
+
+GCP_CSV = (
+    "usage_start_time,billing_account_id,project_id,service_description,cost,"
+    "usage_amount,resource_name,region\n"
+    "2024-03-01 00:00:00,acct-1,proj-1,Compute Engine,15.0,200,instance-1,us-central1\n"
+)
+
+
+@pytest.fixture
+def exports(tmp_path):
+    paths = []
+    for name, text in (("aws.csv", AWS_CSV), ("azure.csv", AZURE_CSV), ("gcp.csv", GCP_CSV)):
+        (tmp_path / name).write_text(text)
+        paths.append(str(tmp_path / name))
+    return paths
+
+
+class TestLoadMultiCloud:
+    def test_combines_providers(self, exports):
+        df = load_multi_cloud(exports, max_workers=1)
+        assert sorted(df["provider"].unique()) == ["AWS", "AZURE", "GCP"]
+        assert len(df) == 3
+
+    def test_serial_matches_parallel(self, exports):
+        serial   = load_multi_cloud(exports, max_workers=1)
+        parallel = load_multi_cloud(exports, max_workers=3)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_zip_bundle_normalizes_each_provider(self, exports, tmp_path):
+        bundle = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(bundle, "w") as zf:
+            for path in exports[:2]:
+                zf.write(path, arcname=path.rsplit("/", 1)[-1])
+        df = load_multi_cloud([str(bundle), exports[2]], max_workers=1)
+        assert sorted(df["provider"].unique()) == ["AWS", "AZURE", "GCP"]
+
+    def test_invalid_input_named_in_error(self, exports, tmp_path):
+        invoice = tmp_path / "invoice.csv"
+        invoice.write_text("Invoice Number,Invoice Date,Amount Due\nINV-1,2024-03-01,10\n")
+        with pytest.raises(ValueError, match="invoice.csv"):
+            load_multi_cloud([*exports, str(invoice)], max_workers=1)
@@ -0,0 +1,70 @@
+"""Tests for src/ingestion/parquet_reader.py — projection and date pushdown."""
+
+import io
+from datetime import date
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.ingestion.parquet_reader import date_filters, read_parquet_projected
+
+
+def _cur_parquet(date_values, row_group_size: int = 10) -> io.BytesIO:
+    n = len(date_values)
+    df = pd.DataFrame({
+        "line_item_usage_start_date": date_values,
+        "product_servicecode":        ["AmazonEC2"] * n,
+        "line_item_unblended_cost":   [1.0] * n,
+        "pricing_term":               ["OnDemand"] * n,
+    })
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False, row_group_size=row_group_size)
+    buf.seek(0)
+    return buf
+
+
+def _timestamps(n=60):
+    return list(pd.date_range("2024-01-01", periods=n, freq="D"))
+
+
+class TestReadParquetProjected:
+    def test_projects_columns(self):
+        df = read_parquet_projected(_cur_parquet(_timestamps()))
+        assert "pricing_term" not in df.columns
+        assert "line_item_unblended_cost" in df.columns
+
+    def test_since_until_inclusive_on_timestamps(self):
+        df = read_parquet_projected(
+            _cur_parquet(_timestamps()),
+            since=date(2024, 2, 1), until=date(2024, 2, 14),
+        )
+        assert len(df) == 14
+        assert df["line_item_usage_start_date"].min() == pd.Timestamp("2024-02-01")
+        assert df["line_item_usage_start_date"].max() == pd.Timestamp("2024-02-14")
+
+    def test_window_on_string_dates(self):
+        dates = [str(d.date()) for d in _timestamps()]
+        df = read_parquet_projected(_cur_parquet(dates), since=date(2024, 2, 20))
+        assert len(df) == 10
+
+    def test_sample_rows(self):
+        df = read_parquet_projected(_cur_parquet(_timestamps()), nrows=5)
+        assert len(df) == 5
+
+    def test_sample_rows_with_window(self):
+        df = read_parquet_projected(
+            _cur_parquet(_timestamps()), nrows=3, since=date(2024, 2, 1)
+        )
+        assert len(df) == 3
+        assert df["line_item_usage_start_date"].min() == pd.Timestamp("2024-02-01")
+
+
+class TestDateFilters:
+    def test_no_window_no_filters(self):
+        schema = pq.ParquetFile(_cur_parquet(_timestamps())).schema_arrow
+        assert date_filters(schema, None, None) is None
+
+    def test_until_is_exclusive_next_day(self):
+        schema = pq.ParquetFile(_cur_parquet(_timestamps())).schema_arrow
+        filters = date_filters(schema, None, date(2024, 1, 31))
+        assert filters == [("line_item_usage_start_date", "<", pd.Timestamp("2024-02-01"))]
@@ -0,0 +1,117 @@
+"""Tests for src/ingestion/sniffer.py — header-only format sniffing."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from src.ingestion.csv_loader import load_billing_file
+from src.ingestion.sniffer import detect_format, sniff_csv, sniff_parquet, validate_layout
+
+
+class _CountingReader(io.BytesIO):
+    """BytesIO that records how many bytes were read."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+# ===================== detect_format =====================
+
+class TestDetectFormat:
+    @pytest.mark.parametrize("columns, expected", [
+        (["line_item_unblended_cost", "line_item_usage_start_date"],  ("AWS", "CUR")),
+        (["lineItem/UnblendedCost", "lineItem/UsageStartDate"],      ("AWS", "CUR_SLASH")),
+        (["line_item_unblended_cost", "bill_payer_account_name"],     ("AWS", "CUR2")),
+        (["date", "serviceFamily", "costInUSD", "billingProfileId"],  ("AZURE", "AZURE_MCA")),
+        (["Date", "MeterCategory", "Cost", "InstanceId"],             ("AZURE", "AZURE_EA")),
+        (["UsageDate", "ServiceName", "CostInUSD"],                   ("AZURE", "AZURE_COST_MANAGEMENT")),
+        (["usage_start_time", "service_description", "cost"],        ("GCP", "GCP_FLAT")),
+    ])
+    def test_variants(self, columns, expected):
+        assert detect_format(columns) == expected
+
+    def test_invoice(self):
+        assert detect_format(["Invoice ID", "Balance Due"]) == (None, "INVOICE")
+
+    def test_unknown(self):
+        assert detect_format(["foo", "bar"]) == (None, "UNKNOWN")
+
+
+# ===================== sniff_csv =====================
+
+class TestSniffCsv:
+    def _cur(self, n_rows: int, sep: str = ",") -> bytes:
+        header = sep.join(["line_item_usage_start_date", "line_item_unblended_cost",
+                           "line_item_usage_account_id", "pricing_term"])
+        rows = [sep.join(["2024-03-01", f"{i}.0", "012345678901", "OnDemand"])
+                for i in range(n_rows)]
+        return ("\n".join([header] + rows) + "\n").encode()
+
+    def test_reads_only_the_head(self):
+        source = _CountingReader(self._cur(50_000))
+        layout = sniff_csv(source, sample_bytes=4096)
+        assert source.bytes_read == 4096
+        assert source.tell() == 0
+        assert layout["format"] == "CUR"
+        assert layout["sample_rows"] > 0
+
+    @pytest.mark.parametrize("sep", [";", "\t", "|"])
+    def test_detects_delimiter(self, sep):
+        layout = sniff_csv(io.BytesIO(self._cur(5, sep)))
+        assert layout["delimiter"] == sep
+        assert layout["provider"] == "AWS"
+
+    def test_projection_drops_unused_columns(self):
+        layout = sniff_csv(io.BytesIO(self._cur(5)))
+        assert "pricing_term" not in layout["projected"]
+        assert layout["date_column"] == "line_item_usage_start_date"
+
+    def test_strips_byte_order_mark(self):
+        data = "\ufeffUsageDate,ServiceName,CostInUSD\n2024-03-01,VM,1.0\n".encode("utf-8")
+        assert sniff_csv(io.BytesIO(data))["columns"][0] == "UsageDate"
+
+    def test_semicolon_file_loads(self, tmp_path):
+        path = tmp_path / "cur.csv"
+        path.write_bytes(self._cur(5, ";"))
+        df = load_billing_file(str(path))
+        assert len(df) == 5
+        assert df["line_item_unblended_cost"].sum() == 10.0
+
+
+class TestSniffParquet:
+    def test_reads_footer(self, tmp_path):
+        path = tmp_path / "cur.parquet"
+        pd.DataFrame({"line_item_unblended_cost": [1.0, 2.0]}).to_parquet(path)
+        layout = sniff_parquet(str(path))
+        assert layout["format"] == "CUR"
+        assert layout["sample_rows"] == 2
+
+
+# ===================== validate_layout =====================
+
+class TestValidateLayout:
+    def test_valid_export(self):
+        assert validate_layout(sniff_csv(io.BytesIO(b"cost,service\n1,ec2\n")))[0]
+
+    def test_rejects_invoice(self):
+        layout = sniff_csv(io.BytesIO(b"Invoice ID,Invoice Amount\nINV-1,10\n"))
+        assert validate_layout(layout) == (False, "File is an invoice, not a cost and usage export")
+
+    def test_rejects_header_only(self):
+        assert not validate_layout(sniff_csv(io.BytesIO(b"cost,service\n")))[0]
+
+    def test_rejects_no_cost_columns(self):
+        assert not validate_layout(sniff_csv(io.BytesIO(b"foo,bar\n1,2\n")))[0]
+
+    def test_invoice_file_rejected_by_loader(self, tmp_path):
+        path = tmp_path / "invoice.csv"
+        path.write_bytes(b"Invoice ID,Invoice Amount\nINV-1,10\n")
+        with pytest.raises(ValueError, match="invoice"):
+            load_billing_file(str(path))
@@ -0,0 +1,112 @@
+"""Tests for src/intelligence/feature_engineering/anomaly_features.py"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.intelligence.feature_engineering.anomaly_features import (
+    compute_30day_forecast,
+    compute_cost_zscore,
+)
+from src.testing.generators import trending_costs
+from src.testing.reference_impls import (
+    forecast_per_service,
+    zscore_per_service as _zscore_per_service,
+)
+
+
+def _daily_costs(n_services: int = 30, n_days: int = 25, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-03-01", periods=n_days)
+    df = pd.DataFrame({
+        "date":       np.tile(dates, n_services),
+        "provider":   np.repeat([["AWS", "AZURE", "GCP"][i % 3] for i in range(n_services)], n_days),
+        "service":    np.repeat([f"svc-{i:03d}" for i in range(n_services)], n_days),
+        "daily_cost": rng.gamma(2.0, 10.0, n_services * n_days),
+    })
+    # Services billing on only some days, and shuffled input order
+    df = df.sample(frac=0.8, random_state=seed)
+    return df
+
+
+# ===================== compute_cost_zscore =====================
+
+class TestComputeCostZscore:
+    def test_matches_per_service_rolling(self):
+        df = _daily_costs()
+        pd.testing.assert_frame_equal(compute_cost_zscore(df), _zscore_per_service(df))
+
+    def test_matches_with_categorical_keys(self):
+        df = _daily_costs().astype({"provider": "category", "service": "category"})
+        pd.testing.assert_frame_equal(compute_cost_zscore(df), _zscore_per_service(df))
+
+    def test_baseline_excludes_current_day(self):
+        df = pd.DataFrame({
+            "date":       pd.date_range("2024-03-01", periods=5),
+            "provider":   "AWS",
+            "service":    "ec2",
+            "daily_cost": [10.0, 10.0, 10.0, 10.0, 100.0],
+        })
+        result = compute_cost_zscore(df)
+        assert result["z_score"].iloc[:3].isna().all()
+        assert result["rolling_mean"].iloc[4] == pytest.approx(10.0)
+        assert result["z_score"].iloc[4] == pytest.approx(90.0 / 0.01)
+
+    def test_windows_do_not_cross_services(self):
+        df = pd.DataFrame({
+            "date":       list(pd.date_range("2024-03-01", periods=4)) * 2,
+            "provider":   "AWS",
+            "service":    ["a"] * 4 + ["b"] * 4,
+            "daily_cost": [1.0, 2.0, 3.0, 4.0, 50.0, 60.0, 70.0, 80.0],
+        })
+        result = compute_cost_zscore(df)
+        b = result[result["service"] == "b"]
+        assert b["rolling_mean"].isna().tolist() == [True, True, True, False]
+        assert b["rolling_mean"].iloc[3] == pytest.approx(60.0)
+
+    def test_empty_frame_passthrough(self):
+        df = pd.DataFrame(columns=["date", "provider", "service", "daily_cost"])
+        assert compute_cost_zscore(df).empty
+
+
+# ===================== compute_30day_forecast =====================
+
+def _series(costs, service="ec2", provider="AWS") -> pd.DataFrame:
+    return pd.DataFrame({
+        "date":       pd.date_range("2024-03-01", periods=len(costs)),
+        "provider":   provider,
+        "service":    service,
+        "daily_cost": costs,
+    })
+
+
+class TestCompute30DayForecast:
+    def test_matches_per_service_polyfit(self):
+        df = trending_costs(n_series=500, n_days=45, seed=3)
+        assert compute_30day_forecast(df) == forecast_per_service(df)
+
+    def test_matches_on_shuffled_object_keys(self):
+        df = trending_costs(n_series=200, n_days=20, seed=5)
+        df = df.astype({"provider": str, "service": str}).sample(frac=1.0, random_state=1)
+        assert compute_30day_forecast(df) == forecast_per_service(df)
+
+    def test_linear_series_projects_trend(self):
+        # 10, 11, ..., 19 → day 40 of the fit is 50, capped at 3x last-30-day actual
+        result = compute_30day_forecast(_series([10.0 + i for i in range(10)]))
+        assert len(result) == 1
+        assert result[0]["last_30d_actual"] == pytest.approx(14.5 * 30)
+        assert result[0]["projected_monthly_cost"] == pytest.approx(min(50.0 * 30, 14.5 * 90))
+
+    def test_too_few_billed_days_skipped(self):
+        assert compute_30day_forecast(_series([5.0, 0.0, 6.0, 0.0])) == []
+
+    def test_noisy_series_skipped(self):
+        assert compute_30day_forecast(_series([1.0, 1.0, 1.0, 1.0, 100.0])) == []
+
+    def test_sorted_by_projection(self):
+        df = pd.concat([_series([5.0] * 6, "s3"), _series([50.0] * 6, "rds")])
+        assert [f["service"] for f in compute_30day_forecast(df)] == ["rds", "s3"]
+
+    def test_empty_frame(self):
+        df = pd.DataFrame(columns=["date", "provider", "service", "daily_cost"])
+        assert compute_30day_forecast(df) == []
@@ -0,0 +1,90 @@
+"""Tests for src/intelligence/feature_engineering/cost_features.py"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.intelligence.feature_engineering.cost_features import (
+    RESOURCE_FEATURE_COLUMNS,
+    RESOURCE_KEYS,
+    resource_features,
+)
+
+
+# ===================== resource_features =====================
+
+class TestResourceFeatures:
+    def _make_df(self, rows):
+        df = pd.DataFrame(rows)
+        df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    def test_one_row_per_resource(self):
+        df = self._make_df([
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 10.0, "usage": 5.0},
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 10.0, "usage": 5.0},
+            {"date": date(2024, 3, 3), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 20.0, "usage": 10.0},
+        ])
+        features = resource_features(df)
+        assert list(features.index.names) == RESOURCE_KEYS
+        assert list(features.columns) == RESOURCE_FEATURE_COLUMNS
+
+        row = features.loc[("AWS", "ec2", "i-001")]
+        assert row["days_active"] == 2
+        assert row["total_cost"] == pytest.approx(40.0)
+        assert row["total_usage"] == pytest.approx(20.0)
+        assert row["usage_to_cost_ratio"] == pytest.approx(0.5)
+        assert row["first_seen"] == pd.Timestamp("2024-03-01")
+        assert row["last_seen"] == pd.Timestamp("2024-03-03")
+
+    def test_ratio_uses_cost_of_rows_with_usage(self):
+        df = self._make_df([
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 10.0, "usage": 5.0},
+            {"date": date(2024, 3, 2), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 30.0, "usage": None},
+        ])
+        row = resource_features(df).loc[("AWS", "ec2", "i-001")]
+        assert row["total_cost"] == pytest.approx(40.0)
+        assert row["usage_to_cost_ratio"] == pytest.approx(0.5)
+
+    def test_no_usage_gives_nan_ratio(self):
+        df = self._make_df([
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "s3",
+             "resource_id": "bucket-1", "cost": 1.0, "usage": None},
+        ])
+        row = resource_features(df).loc[("AWS", "s3", "bucket-1")]
+        assert np.isnan(row["total_usage"])
+        assert np.isnan(row["usage_to_cost_ratio"])
+
+    def test_zero_cost_gives_nan_ratio(self):
+        df = self._make_df([
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 5.0, "usage": 1.0},
+            {"date": date(2024, 3, 2), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": -5.0, "usage": 1.0},
+        ])
+        assert np.isnan(resource_features(df)["usage_to_cost_ratio"].iloc[0])
+
+    def test_rows_without_resource_id_skipped(self):
+        df = self._make_df([
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": None, "cost": 5.0, "usage": 1.0},
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "cost": 5.0, "usage": 1.0},
+        ])
+        features = resource_features(df)
+        assert features.index.get_level_values("resource_id").tolist() == ["i-001"]
+
+    def test_missing_resource_id_column(self):
+        df = self._make_df([
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2", "cost": 5.0},
+        ])
+        features = resource_features(df)
+        assert features.empty
+        assert list(features.columns) == RESOURCE_FEATURE_COLUMNS
@@ -0,0 +1,69 @@
+"""Tests for src/intelligence/feature_engineering/feature_context.py"""
+
+import pytest
+
+from src.intelligence.feature_engineering.feature_context import FeatureContext
+from src.intelligence.leak_detection.rule_based import detect_always_on_high_cost
+from src.intelligence.leak_detection.structural import detect_untagged_resources
+
+
+@pytest.fixture
+def context(normalized_df):
+    return FeatureContext(normalized_df)
+
+
+# ===================== FeatureContext =====================
+
+class TestFeatureContext:
+    def test_nothing_computed_up_front(self, context):
+        assert context.computed == []
+
+    def test_computes_on_first_read_and_memoizes(self, context):
+        first = context["cost_trend"]
+        assert context["cost_trend"] is first
+        assert context.computed == ["daily_cost", "cost_trend"]
+
+    def test_unread_features_never_computed(self, context):
+        context["resource_features"]
+        assert "cost_trend" not in context.computed
+        assert "tag_table" not in context.computed
+
+    def test_precomputed_values_are_used(self, normalized_df, daily_cost_df):
+        context = FeatureContext(normalized_df, daily_cost=daily_cost_df)
+        assert context["daily_cost"] is daily_cost_df
+        assert context.computed == []
+
+    def test_records_reads_per_consumer(self, context):
+        with context.consumer("detector_a"):
+            context["daily_cost"]
+        with context.consumer("detector_b"):
+            context["cost_trend"]
+            context["tag_table"]
+        context["resource_features"]  # outside any consumer
+
+        assert context.accessed == {
+            "detector_a": {"daily_cost"},
+            "detector_b": {"cost_trend", "tag_table"},
+        }
+
+    def test_unknown_feature(self, context):
+        with pytest.raises(KeyError):
+            context["no_such_feature"]
+
+    def test_unknown_precomputed_feature(self, normalized_df):
+        with pytest.raises(ValueError, match="Unknown features"):
+            FeatureContext(normalized_df, no_such_feature=1)
+
+
+# ===================== SHARED USE =====================
+
+class TestSharedFeatures:
+    def test_tag_table_built_once_for_its_consumers(self, context, normalized_df, daily_cost_df):
+        with context.consumer("detect_always_on_high_cost"):
+            always_on = detect_always_on_high_cost(daily_cost_df, normalized_df, context["tag_table"])
+        with context.consumer("detect_untagged_resources"):
+            untagged = detect_untagged_resources(normalized_df, tag_table=context["tag_table"])
+
+        assert always_on == detect_always_on_high_cost(daily_cost_df, normalized_df)
+        assert untagged == detect_untagged_resources(normalized_df)
+        assert context.computed == ["tag_table"]
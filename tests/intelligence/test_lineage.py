@@ -0,0 +1,153 @@
+"""Tests for src/intelligence/feature_engineering/lineage.py"""
+
+import numpy as np
+import pandas as pd
+
+from src.intelligence.feature_engineering.lineage import (
+    KIND_DATABASE,
+    KIND_INSTANCE,
+    KIND_OTHER,
+    KIND_SNAPSHOT,
+    KIND_VOLUME,
+    build_lineage_index,
+    canonical_resource_ids,
+    has_live_parent,
+    is_lineage_key,
+    resource_nodes,
+)
+
+
+def _frame(rows):
+    defaults = {
+        "provider": "AWS", "service": "AmazonEC2", "region": "us-east-1",
+        "resource_tags_user_source_resource": None,
+    }
+    return pd.DataFrame([{**defaults, **row} for row in rows])
+
+
+def _kinds(lineage):
+    return dict(zip(lineage["ids"], lineage["kind"]))
+
+
+# ===================== IDENTIFIERS =====================
+
+class TestCanonicalResourceIds:
+    def test_arns_reduce_to_their_resource_id(self):
+        ids = canonical_resource_ids([
+            "arn:aws:ec2:us-east-1:123456789012:volume/vol-001",
+            "arn:aws:ec2:us-east-1::snapshot/snap-001",
+            "arn:aws:rds:us-east-1:123456789012:db:orders",
+            "arn:aws:s3:::my-bucket",
+        ])
+        assert list(ids) == ["vol-001", "snap-001", "orders", "my-bucket"]
+
+    def test_bare_ids_and_missing_values(self):
+        ids = canonical_resource_ids(pd.Series(["i-001", None, "i-001"], dtype="category"))
+        assert list(ids) == ["i-001", None, "i-001"]
+
+    def test_lineage_keys(self):
+        assert is_lineage_key("source_volume")
+        assert is_lineage_key("Source-Volume")
+        assert is_lineage_key("aws_backup_source_resource")
+        assert is_lineage_key("attached_to")
+        assert not is_lineage_key("owner")
+        assert not is_lineage_key("source")
+
+
+# ===================== INDEX =====================
+
+class TestBuildLineageIndex:
+    def test_kinds_from_ids_and_arns(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "i-001"},
+            {"resource_id": "arn:aws:ec2:us-east-1:123456789012:volume/vol-001"},
+            {"resource_id": "snap-001"},
+            {"resource_id": "arn:aws:rds:us-east-1:123456789012:db:orders"},
+            {"resource_id": "my-bucket"},
+        ]))
+        assert _kinds(lineage) == {
+            "i-001": KIND_INSTANCE, "vol-001": KIND_VOLUME, "snap-001": KIND_SNAPSHOT,
+            "orders": KIND_DATABASE, "my-bucket": KIND_OTHER,
+        }
+
+    def test_kinds_from_usage_type(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "backup-1", "line_item_usage_type": "USE1-EBS:SnapshotUsage"},
+            {"resource_id": "disk-1",   "line_item_usage_type": "EBS:VolumeUsage.gp3"},
+            {"resource_id": "disk-1",   "line_item_usage_type": None},
+            {"resource_id": "host-1",   "line_item_usage_type": "BoxUsage:t3.micro"},
+        ]))
+        assert _kinds(lineage) == {
+            "backup-1": KIND_SNAPSHOT, "disk-1": KIND_VOLUME, "host-1": KIND_INSTANCE,
+        }
+
+    def test_arn_and_bare_id_are_one_node(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "vol-001"},
+            {"resource_id": "arn:aws:ec2:us-east-1:123456789012:volume/vol-001"},
+        ]))
+        assert list(lineage["ids"]) == ["vol-001"]
+
+    def test_tag_references_link_snapshot_volume_instance(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "i-001"},
+            {"resource_id": "vol-001",  "resource_tags_user_source_resource": "i-001"},
+            {"resource_id": "snap-001", "resource_tags_user_source_resource": "vol-001"},
+            {"resource_id": "snap-002", "resource_tags_user_source_resource": "vol-deleted"},
+        ]))
+        nodes = resource_nodes(lineage, ["snap-001", "vol-001", "i-001", "snap-002", "vol-unknown"])
+        parents = lineage["ids"][lineage["parent"][nodes[:2]]]
+        assert list(parents) == ["vol-001", "i-001"]
+        assert list(has_live_parent(lineage, nodes)) == [True, True, False, False, False]
+
+    def test_only_valid_edges_are_kept(self):
+        # An instance doesn't descend from a volume; untyped resources get no parent
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "vol-001"},
+            {"resource_id": "i-001",     "resource_tags_user_source_resource": "vol-001"},
+            {"resource_id": "my-bucket", "resource_tags_user_source_resource": "i-001"},
+        ]))
+        assert (lineage["parent"] == -1).all()
+
+    def test_other_tag_keys_are_not_edges(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "i-001"},
+            {"resource_id": "vol-001", "resource_tags_user_owner": "i-001"},
+        ]))
+        assert (lineage["parent"] == -1).all()
+
+    def test_volume_and_instance_share_provider_and_region(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "i-001", "region": "us-west-2"},
+            {"resource_id": "i-002", "provider": "AZURE"},
+            {"resource_id": "vol-001", "resource_tags_user_source_resource": "i-001"},
+            {"resource_id": "vol-002", "resource_tags_user_source_resource": "i-002"},
+        ]))
+        assert (lineage["parent"] == -1).all()
+
+    def test_snapshot_copied_to_another_region_keeps_its_source(self):
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "vol-001"},
+            {"resource_id": "snap-001", "region": "us-west-2", "resource_tags_user_source_resource": "vol-001"},
+        ]))
+        nodes = resource_nodes(lineage, ["snap-001"])
+        assert list(has_live_parent(lineage, nodes)) == [True]
+
+    def test_untagged_cur_has_no_edges(self):
+        # IDs, ARNs and usage types set each node's kind but never link nodes
+        lineage = build_lineage_index(_frame([
+            {"resource_id": "i-001",    "line_item_usage_type": "BoxUsage:t3.micro"},
+            {"resource_id": "arn:aws:ec2:us-east-1:123456789012:volume/vol-001",
+             "line_item_usage_type": "EBS:VolumeUsage.gp3"},
+            {"resource_id": "arn:aws:ec2:us-east-1::snapshot/snap-001",
+             "line_item_usage_type": "EBS:SnapshotUsage"},
+        ]))
+        assert _kinds(lineage) == {
+            "i-001": KIND_INSTANCE, "vol-001": KIND_VOLUME, "snap-001": KIND_SNAPSHOT,
+        }
+        assert (lineage["parent"] == -1).all()
+
+    def test_without_resource_ids(self):
+        lineage = build_lineage_index(pd.DataFrame({"provider": ["AWS"], "resource_id": [None]}))
+        assert len(lineage["ids"]) == 0
+        assert has_live_parent(lineage, np.array([-1])).tolist() == [False]
@@ -12,7 +12,9 @@ from src.intelligence.leak_detection.rule_based import (
     detect_runaway_costs,
     detect_zombie_resources,
     get_service_category,
+    zombie_ratio_thresholds,
 )
+from tests.conftest import make_resource_features
 
 
 # ===================== get_service_category =====================
@@ -52,60 +54,72 @@ class TestGetServiceCategory:
 # ===================== detect_zombie_resources =====================
 
 class TestDetectZombieResources:
-    def _make_lifespan(self, days_active, provider="AWS", service="ec2", resource_id="i-001"):
-        return [{"provider": provider, "service": service,
-                 "resource_id": resource_id, "days_active": days_active}]
-
-    def _make_usage(self, ratio, provider="AWS", service="ec2", resource_id="i-001"):
-        return [{"provider": provider, "service": service,
-                 "resource_id": resource_id, "usage_to_cost_ratio": ratio}]
+    def _make_resources(self, days_active, ratio, provider="AWS", service="ec2", resource_id="i-001"):
+        return make_resource_features([{
+            "provider": provider, "service": service, "resource_id": resource_id,
+            "days_active": days_active, "usage_to_cost_ratio": ratio,
+        }])
 
     def test_detects_long_running_low_usage(self):
-        lifespan = self._make_lifespan(days_active=20)
-        usage    = self._make_usage(ratio=0.001)
-        leaks, zombie_ids = detect_zombie_resources(lifespan, usage)
+        resources = self._make_resources(days_active=20, ratio=0.001)
+        leaks, zombie_ids = detect_zombie_resources(resources)
         assert len(leaks) == 1
         assert leaks[0]["leak_type"] == "ZOMBIE_RESOURCE"
         assert leaks[0]["resource_id"] == "i-001"
         assert "i-001" in zombie_ids
 
     def test_no_leak_for_young_resource(self):
-        lifespan = self._make_lifespan(days_active=ZOMBIE_MIN_DAYS - 1)
-        usage    = self._make_usage(ratio=0.001)
-        leaks, _ = detect_zombie_resources(lifespan, usage)
+        resources = self._make_resources(days_active=ZOMBIE_MIN_DAYS - 1, ratio=0.001)
+        leaks, _ = detect_zombie_resources(resources)
         assert leaks == []
 
     def test_no_leak_for_high_usage_ratio(self):
         # High usage-to-cost ratio means the resource is actively used
-        lifespan = self._make_lifespan(days_active=20)
-        usage    = self._make_usage(ratio=50.0)
-        leaks, _ = detect_zombie_resources(lifespan, usage)
+        resources = self._make_resources(days_active=20, ratio=50.0)
+        leaks, _ = detect_zombie_resources(resources)
         assert leaks == []
 
     def test_no_leak_when_usage_missing(self):
-        lifespan = self._make_lifespan(days_active=20)
-        leaks, _ = detect_zombie_resources(lifespan, [])
+        resources = self._make_resources(days_active=20, ratio=None)
+        leaks, _ = detect_zombie_resources(resources)
         assert leaks == []
 
     def test_empty_inputs(self):
-        leaks, zombie_ids = detect_zombie_resources([], [])
+        leaks, zombie_ids = detect_zombie_resources(make_resource_features([]))
         assert leaks == []
         assert zombie_ids == set()
 
     def test_multiple_resources_independent(self):
-        lifespan = [
-            {"provider": "AWS", "service": "ec2", "resource_id": "i-001", "days_active": 20},
-            {"provider": "AWS", "service": "ec2", "resource_id": "i-002", "days_active": 20},
-        ]
-        usage = [
-            {"provider": "AWS", "service": "ec2", "resource_id": "i-001", "usage_to_cost_ratio": 0.001},
-            {"provider": "AWS", "service": "ec2", "resource_id": "i-002", "usage_to_cost_ratio": 100.0},
-        ]
-        leaks, zombie_ids = detect_zombie_resources(lifespan, usage)
+        resources = make_resource_features([
+            {"resource_id": "i-001", "days_active": 20, "usage_to_cost_ratio": 0.001},
+            {"resource_id": "i-002", "days_active": 20, "usage_to_cost_ratio": 100.0},
+        ])
+        leaks, zombie_ids = detect_zombie_resources(resources)
         assert len(leaks) == 1
         assert "i-001" in zombie_ids
         assert "i-002" not in zombie_ids
 
+    def test_missing_ratios_left_out_of_service_p25(self):
+        # Resources without usage don't take part in the percentile threshold
+        rows = [{"resource_id": f"i-{i}", "days_active": 20, "usage_to_cost_ratio": float(i)}
+                for i in range(1, 5)]
+        rows.append({"resource_id": "i-none", "days_active": 20, "usage_to_cost_ratio": None})
+        leaks, zombie_ids = detect_zombie_resources(make_resource_features(rows), {"ec2": {}})
+        assert zombie_ids == set()
+
+    def test_service_p25_threshold(self):
+        rows = [{"resource_id": f"i-{i}", "days_active": 20, "usage_to_cost_ratio": r}
+                for i, r in enumerate([0.4, 0.1, 0.3, 0.2, 0.5])]
+        leaks, zombie_ids = detect_zombie_resources(make_resource_features(rows), {"ec2": {}})
+        # n=5 → sorted position max(0, int(1.25) - 1) = 0, so nothing is below 0.1
+        assert zombie_ids == set()
+        thresholds = zombie_ratio_thresholds(make_resource_features(rows))
+        assert thresholds.to_dict() == {("AWS", "ec2"): 0.1}
+
+    def test_small_service_has_no_p25(self):
+        rows = [{"resource_id": f"i-{i}", "usage_to_cost_ratio": 0.5} for i in range(3)]
+        assert zombie_ratio_thresholds(make_resource_features(rows)).empty
+
 
 # ===================== detect_idle_resources =====================
 
@@ -117,45 +131,38 @@ class TestDetectIdleResources:
                 for i in range(n_days)]
         return pd.DataFrame(rows)
 
+    def _make_resources(self, resource_id, service="ec2"):
+        return make_resource_features([{"service": service, "resource_id": resource_id,
+                                        "days_active": 5, "usage_to_cost_ratio": 1.0}])
+
     def test_detects_idle_compute(self):
-        lifespan = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-idle", "days_active": 5}]
-        usage    = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-idle", "usage_to_cost_ratio": 1.0}]
-        daily_df = self._make_daily_cost_df()
+        resources = self._make_resources("i-idle")
+        daily_df  = self._make_daily_cost_df()
 
-        leaks = detect_idle_resources(lifespan, usage, daily_df, excluded_resource_ids=set())
+        leaks = detect_idle_resources(resources, daily_df, excluded_resource_ids=set())
         assert len(leaks) == 1
         assert leaks[0]["leak_type"] == "IDLE_RESOURCE"
+        assert leaks[0]["reason"] == "Low usage detected over 5 days"
 
     def test_excludes_zombie_ids(self):
-        lifespan = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-zombie", "days_active": 5}]
-        usage    = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-zombie", "usage_to_cost_ratio": 1.0}]
-        daily_df = self._make_daily_cost_df()
+        resources = self._make_resources("i-zombie")
+        daily_df  = self._make_daily_cost_df()
 
-        leaks = detect_idle_resources(lifespan, usage, daily_df, excluded_resource_ids={"i-zombie"})
+        leaks = detect_idle_resources(resources, daily_df, excluded_resource_ids={"i-zombie"})
         assert leaks == []
 
     def test_skips_non_compute_services(self):
-        lifespan = [{"provider": "AWS", "service": "s3",
-                     "resource_id": "bucket-1", "days_active": 5}]
-        usage    = [{"provider": "AWS", "service": "s3",
-                     "resource_id": "bucket-1", "usage_to_cost_ratio": 1.0}]
-        daily_df = self._make_daily_cost_df(service="s3")
+        resources = self._make_resources("bucket-1", service="s3")
+        daily_df  = self._make_daily_cost_df(service="s3")
 
-        leaks = detect_idle_resources(lifespan, usage, daily_df, excluded_resource_ids=set())
+        leaks = detect_idle_resources(resources, daily_df, excluded_resource_ids=set())
         assert leaks == []
 
     def test_skips_low_cost_services(self):
-        lifespan = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-cheap", "days_active": 5}]
-        usage    = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-cheap", "usage_to_cost_ratio": 1.0}]
-        daily_df = self._make_daily_cost_df(daily_cost=0.001)  # below min daily cost
+        resources = self._make_resources("i-cheap")
+        daily_df  = self._make_daily_cost_df(daily_cost=0.001)  # below min daily cost
 
-        leaks = detect_idle_resources(lifespan, usage, daily_df, excluded_resource_ids=set())
+        leaks = detect_idle_resources(resources, daily_df, excluded_resource_ids=set())
         assert leaks == []
 
 
@@ -173,7 +180,7 @@ class TestDetectRunawayCosts:
         # 100% → 1000% growth — well above 30% threshold, no z_score column
         costs = [2.0, 4.0, 8.0, 16.0, 100.0]
         df = self._make_daily_df(costs)
-        leaks = detect_runaway_costs(df, usage_ratio_data=[])
+        leaks = detect_runaway_costs(df)
         assert len(leaks) == 1
         assert leaks[0]["leak_type"] == "RUNAWAY_COST"
         assert leaks[0]["service"] == "ec2"
@@ -181,23 +188,22 @@ class TestDetectRunawayCosts:
     def test_no_leak_for_stable_costs(self):
         costs = [10.0, 10.0, 10.0, 10.0, 10.0]
         df = self._make_daily_df(costs)
-        leaks = detect_runaway_costs(df, usage_ratio_data=[])
+        leaks = detect_runaway_costs(df)
         assert leaks == []
 
     def test_no_leak_for_low_cost_service(self):
         # Below RUNAWAY_MIN_DAILY_COST average
         costs = [0.01, 0.02, 0.05, 0.10, 1.00]
         df = self._make_daily_df(costs)
-        leaks = detect_runaway_costs(df, usage_ratio_data=[])
+        leaks = detect_runaway_costs(df)
         assert leaks == []
 
     def test_no_leak_for_high_usage_ratio(self):
         # A service with legitimate high usage is excluded
         costs = [2.0, 5.0, 10.0, 50.0, 200.0]
         df = self._make_daily_df(costs)
-        usage = [{"provider": "AWS", "service": "ec2", "resource_id": "",
-                  "usage_to_cost_ratio": 100.0}]
-        leaks = detect_runaway_costs(df, usage_ratio_data=usage)
+        resources = make_resource_features([{"usage_to_cost_ratio": 100.0}])
+        leaks = detect_runaway_costs(df, resources)
         assert leaks == []
 
     def test_detects_via_zscore(self):
@@ -208,18 +214,18 @@ class TestDetectRunawayCosts:
         df["rolling_mean"] = 10.0
         df["rolling_std"]  = 1.0
         df["z_score"] = (df["daily_cost"] - df["rolling_mean"]) / (df["rolling_std"] + 0.01)
-        leaks = detect_runaway_costs(df, usage_ratio_data=[])
+        leaks = detect_runaway_costs(df)
         assert any(l["leak_type"] == "RUNAWAY_COST" for l in leaks)
 
     def test_not_enough_days_skipped(self):
         costs = [10.0, 20.0]  # below RUNAWAY_MIN_DAYS (3)
         df = self._make_daily_df(costs)
-        leaks = detect_runaway_costs(df, usage_ratio_data=[])
+        leaks = detect_runaway_costs(df)
         assert leaks == []
 
     def test_empty_df(self):
         df = pd.DataFrame(columns=["date", "provider", "service", "daily_cost"])
-        leaks = detect_runaway_costs(df, usage_ratio_data=[])
+        leaks = detect_runaway_costs(df)
         assert leaks == []
 
 
@@ -276,3 +282,9 @@ class TestDetectAlwaysOnHighCost:
         leaks = detect_always_on_high_cost(daily_df, norm_df)
         # Average cost will be low due to zero-cost days
         assert leaks == []
+
+    def test_owner_of_another_provider_does_not_count(self):
+        daily_df, norm_df = self._make_dfs(service="ec2", daily_cost=75.0)
+        other = norm_df.assign(provider="AZURE", resource_id="res-002", owner="team-a")
+        leaks = detect_always_on_high_cost(daily_df, pd.concat([norm_df, other]))
+        assert [(l["provider"], l["service"]) for l in leaks] == [("AWS", "ec2")]
@@ -1,16 +1,18 @@
 """Tests for src/intelligence/leak_detection/structural.py"""
 
-from datetime import date, timedelta
+from datetime import date
 
 import pandas as pd
 import pytest
 
+from src.intelligence.feature_engineering.cost_features import resource_features
 from src.intelligence.leak_detection.structural import (
     detect_idle_databases,
     detect_orphaned_storage,
     detect_snapshot_sprawl,
     detect_untagged_resources,
 )
+from tests.conftest import make_resource_features
 
 
 # ===================== detect_orphaned_storage =====================
@@ -61,72 +63,82 @@ class TestDetectOrphanedStorage:
         df = pd.DataFrame(columns=["date", "provider", "service", "resource_id", "region"])
         assert detect_orphaned_storage(df) == []
 
+    def test_blank_and_missing_regions_share_unknown_slot(self):
+        rows = [
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "region": None},
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ebs",
+             "resource_id": "vol-001", "region": ""},
+        ]
+        assert detect_orphaned_storage(self._make_df(rows)) == []
+
+    def test_storage_covered_on_any_day_is_not_orphaned(self):
+        rows = [
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ebs",
+             "resource_id": "vol-001", "region": "us-east-1"},
+            {"date": date(2024, 3, 2), "provider": "AWS", "service": "ebs",
+             "resource_id": "vol-001", "region": "us-east-1"},
+            {"date": date(2024, 3, 2), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "region": "us-east-1"},
+        ]
+        assert detect_orphaned_storage(self._make_df(rows)) == []
+
+    def test_tagged_instance_in_another_region_does_not_count(self):
+        rows = [
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ec2",
+             "resource_id": "i-001", "region": "us-west-2", "resource_tags_user_attached_to": None},
+            {"date": date(2024, 3, 1), "provider": "AWS", "service": "ebs",
+             "resource_id": "vol-001", "region": "us-east-1", "resource_tags_user_attached_to": "i-001"},
+        ]
+        assert len(detect_orphaned_storage(self._make_df(rows))) == 1
+
 
 # ===================== detect_idle_databases =====================
 
 class TestDetectIdleDatabases:
-    def _make_norm_df(self, provider="AWS", service="rds", resource_id="db-001",
-                      cost_per_day=30.0, n_days=10):
-        end = date(2024, 3, 31)
-        rows = [{"date": end - timedelta(days=i), "provider": provider,
-                 "service": service, "resource_id": resource_id,
-                 "cost": cost_per_day, "usage": 0.01}
-                for i in range(n_days)]
-        return pd.DataFrame(rows)
-
-    def _make_daily_df(self, provider="AWS", service="rds", daily_cost=30.0, n_days=10):
-        end = date(2024, 3, 31)
-        rows = [{"date": end - timedelta(days=i), "provider": provider,
-                 "service": service, "daily_cost": daily_cost}
-                for i in range(n_days)]
-        return pd.DataFrame(rows)
+    def _make_resources(self, service="rds", resource_id="db-001", ratio=0.01,
+                        cost_per_day=30.0, n_days=10):
+        return make_resource_features([{
+            "service": service, "resource_id": resource_id, "days_active": n_days,
+            "total_cost": cost_per_day * n_days, "usage_to_cost_ratio": ratio,
+        }])
 
     def test_detects_idle_database(self):
-        norm_df  = self._make_norm_df()
-        daily_df = self._make_daily_df()
-        lifespan = [{"provider": "AWS", "service": "rds",
-                     "resource_id": "db-001", "days_active": 10}]
-        usage    = [{"provider": "AWS", "service": "rds",
-                     "resource_id": "db-001", "usage_to_cost_ratio": 0.01}]
-
-        leaks = detect_idle_databases(lifespan, usage, daily_df, norm_df)
+        leaks = detect_idle_databases(self._make_resources())
         assert len(leaks) == 1
         assert leaks[0]["leak_type"] == "IDLE_DATABASE"
         assert leaks[0]["estimated_monthly_waste"] == pytest.approx(30.0 * 30, abs=1)
 
     def test_no_leak_for_active_db(self):
-        norm_df  = self._make_norm_df()
-        daily_df = self._make_daily_df()
-        lifespan = [{"provider": "AWS", "service": "rds",
-                     "resource_id": "db-001", "days_active": 10}]
-        usage    = [{"provider": "AWS", "service": "rds",
-                     "resource_id": "db-001", "usage_to_cost_ratio": 5.0}]  # above threshold
-
-        leaks = detect_idle_databases(lifespan, usage, daily_df, norm_df)
+        leaks = detect_idle_databases(self._make_resources(ratio=5.0))  # above threshold
         assert leaks == []
 
     def test_no_leak_for_non_database_service(self):
-        norm_df  = self._make_norm_df(service="ec2")
-        daily_df = self._make_daily_df(service="ec2")
-        lifespan = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-001", "days_active": 10}]
-        usage    = [{"provider": "AWS", "service": "ec2",
-                     "resource_id": "i-001", "usage_to_cost_ratio": 0.01}]
-
-        leaks = detect_idle_databases(lifespan, usage, daily_df, norm_df)
+        leaks = detect_idle_databases(self._make_resources(service="ec2", resource_id="i-001"))
         assert leaks == []
 
     def test_no_leak_for_new_db(self):
-        norm_df  = self._make_norm_df(n_days=3)
-        daily_df = self._make_daily_df(n_days=3)
-        lifespan = [{"provider": "AWS", "service": "rds",
-                     "resource_id": "db-001", "days_active": 3}]  # below 7-day minimum
-        usage    = [{"provider": "AWS", "service": "rds",
-                     "resource_id": "db-001", "usage_to_cost_ratio": 0.01}]
-
-        leaks = detect_idle_databases(lifespan, usage, daily_df, norm_df)
+        leaks = detect_idle_databases(self._make_resources(n_days=3))  # below 7-day minimum
+        assert leaks == []
+
+    def test_no_leak_for_cheap_db(self):
+        leaks = detect_idle_databases(self._make_resources(cost_per_day=0.5))
         assert leaks == []
 
+    def test_daily_cost_sums_the_rows_of_a_day(self):
+        # Two $8 rows a day: $16 per billed day, over the minimum, though
+        # each row on its own is under it
+        days = pd.date_range("2024-03-01", periods=10)
+        df = pd.DataFrame({
+            "date": list(days) * 2,
+            "provider": "AWS", "service": "rds", "resource_id": "db-001", "region": "us-east-1",
+            "line_item_line_item_type": ["Usage"] * 10 + ["DiscountedUsage"] * 10,
+            "cost": 8.0, "usage": 0.1,
+        })
+        leaks = detect_idle_databases(resource_features(df))
+        assert len(leaks) == 1
+        assert leaks[0]["estimated_monthly_waste"] == pytest.approx(16.0 * 30, abs=1)
+
 
 # ===================== detect_snapshot_sprawl =====================
 
@@ -148,6 +160,36 @@ class TestDetectSnapshotSprawl:
         leaks = detect_snapshot_sprawl(pd.DataFrame(rows))
         assert leaks == []
 
+    def test_no_leak_when_arn_and_bare_id_name_the_same_parent(self):
+        rows = [
+            {"provider": "AWS", "service": "AmazonEC2",
+             "resource_id": "arn:aws:ec2:us-east-1:123456789012:snapshot/snap-001"},
+            {"provider": "AWS", "service": "snapshot", "resource_id": "snap-001"},
+        ]
+        assert detect_snapshot_sprawl(pd.DataFrame(rows)) == []
+
+    def test_no_leak_when_tagged_source_volume_is_billing(self):
+        rows = [
+            {"provider": "AWS", "service": "AmazonEBS", "resource_id": "vol-001",
+             "resource_tags_user_source_volume": None},
+            {"provider": "AWS", "service": "snapshot", "resource_id": "snap-001",
+             "resource_tags_user_source_volume": "vol-001"},
+            {"provider": "AWS", "service": "snapshot", "resource_id": "snap-002",
+             "resource_tags_user_source_volume": "vol-gone"},
+        ]
+        leaks = detect_snapshot_sprawl(pd.DataFrame(rows))
+        assert [l["resource_id"] for l in leaks] == ["snap-002"]
+
+    def test_untagged_snapshot_is_not_linked_to_billing_volume(self):
+        # Without a lineage tag only the snapshot's own ID can find a parent
+        rows = [
+            {"provider": "AWS", "service": "AmazonEC2", "resource_id": "i-001"},
+            {"provider": "AWS", "service": "AmazonEBS", "resource_id": "vol-001"},
+            {"provider": "AWS", "service": "snapshot",  "resource_id": "snap-001"},
+        ]
+        leaks = detect_snapshot_sprawl(pd.DataFrame(rows))
+        assert [l["resource_id"] for l in leaks] == ["snap-001"]
+
     def test_skips_rows_without_resource_id(self):
         rows = [
             {"provider": "AWS", "service": "snapshot", "resource_id": None},
@@ -219,3 +261,8 @@ class TestDetectUntaggedResources:
     def test_empty_df(self):
         df = pd.DataFrame(columns=["provider", "service", "resource_id", "cost"])
         assert detect_untagged_resources(df) == []
+
+    def test_cost_ties_keep_first_seen_order(self):
+        df = self._make_df(["i-003", "i-001", "i-002"])
+        leaks = detect_untagged_resources(df, top_n=2)
+        assert [l["resource_id"] for l in leaks] == ["i-003", "i-001"]
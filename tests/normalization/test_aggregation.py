@@ -0,0 +1,78 @@
+"""Tests for src/normalization/aggregation.py — daily pre-aggregation."""
+
+import pandas as pd
+import pytest
+
+from src.normalization.aggregation import aggregate_daily
+
+
+def _hourly(hours: int = 24, cost: float = 0.5) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date":        [pd.Timestamp(2024, 3, 1)] * hours,
+        "provider":    "AWS",
+        "service":     "AmazonEC2",
+        "cost":        cost,
+        "usage":       1.0,
+        "resource_id": "i-001",
+        "region":      "us-east-1",
+        "resource_tags_user_owner": ["team-a"] + [None] * (hours - 1),
+    })
+
+
+class TestAggregateDaily:
+    def test_collapses_hours_to_one_row(self):
+        result = aggregate_daily(_hourly())
+        assert len(result) == 1
+        assert result["cost"].iloc[0] == pytest.approx(12.0)
+        assert result["usage"].iloc[0] == pytest.approx(24.0)
+
+    def test_tags_carried_forward(self):
+        result = aggregate_daily(_hourly())
+        assert result["resource_tags_user_owner"].iloc[0] == "team-a"
+
+    def test_keeps_columns_and_categoricals(self):
+        df = _hourly()
+        result = aggregate_daily(df)
+        assert list(result.columns) == list(df.columns)
+        assert isinstance(result["service"].dtype, pd.CategoricalDtype)
+
+    def test_drops_zero_cost_rows_without_usage(self):
+        df = pd.concat([_hourly(2), _hourly(2).assign(resource_id="i-002", cost=0.0, usage=None)])
+        result = aggregate_daily(df)
+        assert list(result["resource_id"]) == ["i-001"]
+
+    def test_keeps_zero_cost_usage(self):
+        # DiscountedUsage: an instance covered by a Reserved Instance bills nothing
+        df = _hourly(2).assign(cost=0.0, line_item_line_item_type="DiscountedUsage")
+        result = aggregate_daily(df)
+        assert len(result) == 1
+        assert result["usage"].iloc[0] == pytest.approx(2.0)
+
+    def test_offsetting_credit_dropped(self):
+        df = _hourly(2).assign(cost=[5.0, -5.0], line_item_line_item_type="Credit")
+        assert aggregate_daily(df).empty
+
+    def test_blank_resource_ids_kept(self):
+        df = pd.concat([_hourly(2), _hourly(2).assign(resource_id=None)])
+        result = aggregate_daily(df)
+        assert len(result) == 2
+        assert result["cost"].sum() == pytest.approx(2.0)
+
+    def test_all_null_usage_stays_null(self):
+        result = aggregate_daily(_hourly(3).assign(usage=None))
+        assert pd.isna(result["usage"].iloc[0])
+
+    def test_item_types_kept_apart(self):
+        df = _hourly(4).assign(
+            line_item_line_item_type=["Usage", "Usage", "SavingsPlanNegation", "SavingsPlanNegation"],
+            reservation_unused_recurring_fee=["0", "0", "1.5", "2.5"],
+        )
+        result = aggregate_daily(df).set_index("line_item_line_item_type")
+        assert len(result) == 2
+        assert result.loc["SavingsPlanNegation", "reservation_unused_recurring_fee"] == pytest.approx(4.0)
+
+    def test_reaggregation_is_idempotent(self):
+        df = pd.concat([_hourly(), _hourly()], ignore_index=True)
+        once = aggregate_daily(df)
+        twice = aggregate_daily(pd.concat([aggregate_daily(_hourly()), aggregate_daily(_hourly())]))
+        pd.testing.assert_frame_equal(once, twice)
@@ -0,0 +1,80 @@
+"""Tests for src/normalization/normalize.py — provider detection and normalization."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.intelligence.leak_detection.structural import detect_orphaned_storage
+from src.normalization.normalize import detect_provider, normalize_billing_df
+
+
+# ===================== detect_provider =====================
+
+class TestDetectProvider:
+    def test_aws_columns(self):
+        df = pd.DataFrame(columns=["line_item_usage_account_id", "line_item_line_item_type", "cost"])
+        assert detect_provider(df) == "AWS"
+
+    def test_azure_columns(self):
+        df = pd.DataFrame(columns=["SubscriptionId", "UsageDate", "MeterName"])
+        assert detect_provider(df) == "AZURE"
+
+    def test_gcp_columns(self):
+        df = pd.DataFrame(columns=["billing_account_id", "project_id", "service_description"])
+        assert detect_provider(df) == "GCP"
+
+    def test_override_lowercases(self):
+        df = pd.DataFrame(columns=["line_item_usage_account_id"])
+        assert detect_provider(df, override="aws") == "AWS"
+
+    def test_override_ignores_columns(self):
+        # Even if columns look like Azure, override wins
+        df = pd.DataFrame(columns=["SubscriptionId", "UsageDate", "MeterName"])
+        assert detect_provider(df, override="gcp") == "GCP"
+
+    def test_provider_column_present(self):
+        df = pd.DataFrame({"provider": ["azure"]})
+        assert detect_provider(df) == "AZURE"
+
+    def test_ambiguous_raises(self):
+        df = pd.DataFrame(columns=["some_unknown_column"])
+        with pytest.raises(ValueError, match="Ambiguous or unknown"):
+            detect_provider(df)
+
+    def test_multiple_matched_raises(self):
+        # Columns from both AWS and Azure — ambiguous
+        df = pd.DataFrame(columns=[
+            "line_item_usage_account_id",  # AWS signal
+            "SubscriptionId",              # Azure signal
+        ])
+        with pytest.raises(ValueError):
+            detect_provider(df)
+
+
+# ===================== normalize_billing_df =====================
+
+class TestNormalizeBillingDf:
+    def test_ri_covered_instance_still_counts_as_compute(self):
+        # DiscountedUsage bills nothing, but the instance is running
+        end = date(2024, 3, 31)
+        rows = []
+        for i in range(10):
+            day = end - timedelta(days=i)
+            for rid, service, item_type, cost in (
+                ("i-ri",  "AmazonEC2", "DiscountedUsage", 0.0),
+                ("vol-1", "AmazonEBS", "Usage",           0.4),
+            ):
+                rows.append({
+                    "line_item_usage_start_date": f"{day}T00:00:00Z",
+                    "line_item_usage_account_id": "012345678901",
+                    "line_item_line_item_type":   item_type,
+                    "product_servicecode":        service,
+                    "line_item_resource_id":      rid,
+                    "line_item_usage_amount":     24.0,
+                    "line_item_unblended_cost":   cost,
+                    "product_region":             "us-east-1",
+                })
+        normalized = normalize_billing_df(pd.DataFrame(rows), "aws")
+        assert set(normalized["resource_id"]) == {"i-ri", "vol-1"}
+        assert detect_orphaned_storage(normalized) == []
@@ -8,7 +8,7 @@ import pytest
 from src.normalization.aws_normalizer import normalize_aws
 from src.normalization.azure_normalizer import normalize_azure
 from src.normalization.gcp_normalizer import normalize_gcp
-from src.normalization.schema_enforcer import enforce_schema
+from src.normalization.schema_enforcer import categorize, enforce_schema, to_billing_days
 
 
 # ===================== enforce_schema =====================
@@ -70,6 +70,55 @@ class TestEnforceSchema:
         result = enforce_schema(df)
         assert len(result) == 2
 
+    def test_key_columns_are_categorical(self):
+        df = pd.DataFrame({
+            "date": [date(2024, 1, 1), date(2024, 1, 2)],
+            "service": ["ec2", "ec2"],
+            "cost": [10.0, 5.0],
+            "resource_id": ["i-1", "i-1"],
+        })
+        result = enforce_schema(df)
+        for col in ["service", "resource_id", "region"]:
+            assert isinstance(result[col].dtype, pd.CategoricalDtype)
+        assert list(result["service"].cat.categories) == ["ec2"]
+
+
+# ===================== categorize =====================
+
+class TestCategorize:
+    def test_groupby_on_codes_skips_empty_combinations(self):
+        df = categorize(pd.DataFrame({
+            "provider": ["AWS", "AZURE"],
+            "service":  ["ec2", "Virtual Machines"],
+            "cost":     [1.0, 2.0],
+        }))
+        grouped = df.groupby(["provider", "service"], observed=True)["cost"].sum()
+        assert len(grouped) == 2
+
+    def test_already_categorical_untouched(self):
+        df = categorize(pd.DataFrame({"service": ["ec2"]}))
+        assert categorize(df) is df
+
+
+# ===================== to_billing_days =====================
+
+class TestToBillingDays:
+    def test_date_objects_become_datetime64(self):
+        result = to_billing_days(pd.Series([date(2024, 1, 1), None]))
+        assert result.dtype == "datetime64[ns]"
+        assert result.iloc[0] == pd.Timestamp(2024, 1, 1)
+        assert pd.isna(result.iloc[1])
+
+    def test_timezone_keeps_wall_clock_day(self):
+        result = to_billing_days(pd.Series(["2024-01-01T23:30:00+05:00"]))
+        assert result.dt.tz is None
+        assert result.iloc[0] == pd.Timestamp(2024, 1, 1)
+
+    def test_typed_timestamps_not_reparsed(self):
+        typed = pd.Series(pd.to_datetime(["2024-01-01 06:00", "2024-01-02 18:00"]))
+        result = to_billing_days(typed, "%Y%m%d")
+        assert list(result) == [pd.Timestamp(2024, 1, 1), pd.Timestamp(2024, 1, 2)]
+
 
 # ===================== normalize_aws =====================
 
@@ -94,7 +143,30 @@ class TestNormalizeAWS:
 
     def test_date_parsed_correctly(self):
         result = normalize_aws(self._make_cur_df(1))
-        assert isinstance(result["date"].iloc[0], date)
+        assert result["date"].dtype == "datetime64[ns]"
+        assert result["date"].iloc[0] == pd.Timestamp(2024, 3, 31)
+
+    def test_cur_timestamps_truncated_to_day(self):
+        df = self._make_cur_df(2)
+        df["line_item_usage_start_date"] = ["2024-03-31T13:00:00Z", "2024-03-30T00:00:00Z"]
+        result = normalize_aws(df)
+        assert list(result["date"]) == [pd.Timestamp(2024, 3, 31), pd.Timestamp(2024, 3, 30)]
+
+    def test_output_projected_to_schema_and_extras(self):
+        df = self._make_cur_df()
+        df["line_item_line_item_type"] = "Usage"
+        df["reservation_unused_quantity"] = 0.0
+        df["resource_tags_user_owner"] = "team-a"
+        df["line_item_usage_account_id"] = "012345678901"
+        df["pricing_term"] = "OnDemand"
+        df["product_instance_type"] = "m5.large"
+        result = normalize_aws(df)
+        assert "line_item_line_item_type" in result.columns
+        assert "reservation_unused_quantity" in result.columns
+        assert "resource_tags_user_owner" in result.columns
+        assert list(result["line_item_usage_account_id"]) == ["012345678901"] * 3
+        assert "pricing_term" not in result.columns
+        assert "product_instance_type" not in result.columns
 
     def test_cost_is_numeric(self):
         result = normalize_aws(self._make_cur_df())
@@ -220,9 +292,9 @@ class TestNormalizeAzure:
         result = normalize_azure(df)
         assert result["cost"].iloc[0] == pytest.approx(10.0)
 
-    def test_tag_extraction(self):
+    def test_tags_kept_for_tag_table(self):
         result = normalize_azure(self._make_azure_df(1))
-        assert "labels.owner" in result.columns
+        assert result["tags"].iloc[0] == "Owner=team-a;Environment=prod"
 
     def test_provider_column_set(self):
         result = normalize_azure(self._make_azure_df())
@@ -0,0 +1,74 @@
+"""Tests for src/normalization/tags.py — single-pass tag table."""
+
+import pandas as pd
+
+from src.normalization.tags import build_tag_table, is_tag_column, ownership_tags, tag_key
+
+
+def _frame(**tag_columns) -> pd.DataFrame:
+    n = len(next(iter(tag_columns.values())))
+    return pd.DataFrame({
+        "provider":    ["AWS"] * n,
+        "service":     ["ec2"] * n,
+        "resource_id": [f"i-{i}" for i in range(n)],
+        "cost":        [1.0] * n,
+        **tag_columns,
+    })
+
+
+def _pairs(tags: pd.DataFrame) -> set:
+    return set(zip(tags["resource_id"], tags["key"], tags["value"]))
+
+
+# ===================== columns =====================
+
+class TestTagColumns:
+    def test_provider_prefixes_stripped(self):
+        assert tag_key("resource_tags_user_Owner") == "owner"
+        assert tag_key("resourceTags/user:CostCenter") == "costcenter"
+        assert tag_key("label_environment") == "environment"
+        assert tag_key("labels.team") == "team"
+
+    def test_is_tag_column(self):
+        assert is_tag_column("Tags")
+        assert is_tag_column("resource_tags_user_team")
+        assert is_tag_column("owner")
+        assert not is_tag_column("pricing_term")
+
+
+# ===================== build_tag_table =====================
+
+class TestBuildTagTable:
+    def test_aws_wide_columns(self):
+        tags = build_tag_table(_frame(resource_tags_user_owner=["team-a", None]))
+        assert _pairs(tags) == {("i-0", "owner", "team-a")}
+
+    def test_azure_key_value_string(self):
+        tags = build_tag_table(_frame(tags=["Owner=team-a;Environment=prod", ""]))
+        assert _pairs(tags) == {("i-0", "owner", "team-a"), ("i-0", "environment", "prod")}
+
+    def test_azure_json_string(self):
+        tags = build_tag_table(_frame(tags=['{"project": "billing", "env": "dev"}']))
+        assert _pairs(tags) == {("i-0", "project", "billing"), ("i-0", "env", "dev")}
+
+    def test_gcp_key_value_list(self):
+        labels = '[{"key": "owner", "value": "data"}, {"key": "env", "value": "prod"}]'
+        tags = build_tag_table(_frame(labels=[labels]))
+        assert _pairs(tags) == {("i-0", "owner", "data"), ("i-0", "env", "prod")}
+
+    def test_repeated_line_items_collapse(self):
+        df = pd.concat([_frame(tags=["owner=a"])] * 30, ignore_index=True)
+        assert len(build_tag_table(df)) == 1
+
+    def test_no_tag_columns(self):
+        tags = build_tag_table(_frame(region=["us-east-1"]))
+        assert tags.empty
+        assert list(tags.columns) == ["provider", "service", "resource_id", "key", "value"]
+
+
+# ===================== ownership_tags =====================
+
+class TestOwnershipTags:
+    def test_keeps_only_ownership_keys(self):
+        tags = build_tag_table(_frame(tags=["owner=a;cost-center=42;Environment=prod"]))
+        assert set(ownership_tags(tags)["key"]) == {"owner", "environment"}
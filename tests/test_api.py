@@ -1,5 +1,7 @@
 """Tests for FastAPI endpoints in src/api.py."""
 
+import asyncio
+import gzip
 import io
 from datetime import date, timedelta
 
@@ -7,6 +9,7 @@ import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
 
+from src import api
 from src.api import app
 
 client = TestClient(app)
@@ -111,6 +114,40 @@ class TestUploadEndpoint:
         assert resp.status_code == 200
         assert resp.json()["pipeline_stats"]["provider"] == "AZURE"
 
+    def test_pyarrow_engine_returns_200(self):
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv", io.BytesIO(_aws_cur_csv()), "text/csv")},
+            data={"no_forecast": "true", "engine": "pyarrow"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["pipeline_stats"]["provider"] == "AWS"
+
+    def test_unknown_engine_returns_400(self):
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv", io.BytesIO(_aws_cur_csv()), "text/csv")},
+            data={"engine": "nope"},
+        )
+        assert resp.status_code == 400
+
+    def test_date_window_limits_records(self):
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv", io.BytesIO(_aws_cur_csv()), "text/csv")},
+            data={"no_forecast": "true", "since": "2024-03-18"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["pipeline_stats"]["total_records"] == 14
+
+    def test_invalid_date_window_returns_400(self):
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv", io.BytesIO(_aws_cur_csv()), "text/csv")},
+            data={"since": "last tuesday"},
+        )
+        assert resp.status_code == 400
+
     def test_empty_file_returns_400(self):
         resp = client.post(
             "/api/analyze/upload",
@@ -118,6 +155,23 @@ class TestUploadEndpoint:
         )
         assert resp.status_code == 400
 
+    def test_invoice_rejected_before_parsing(self):
+        invoice = b"Invoice ID,Billing Period,Invoice Amount\nINV-1,2024-03,120.00\n"
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("invoice.csv", io.BytesIO(invoice), "text/csv")},
+        )
+        assert resp.status_code == 400
+        assert "invoice" in resp.json()["detail"]
+
+    def test_gzip_upload_returns_200(self):
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv.gz", io.BytesIO(gzip.compress(_aws_cur_csv())), "application/gzip")},
+            data={"no_forecast": "true"},
+        )
+        assert resp.status_code == 200
+
     def test_garbage_file_returns_400_or_422(self):
         resp = client.post(
             "/api/analyze/upload",
@@ -157,6 +211,64 @@ class TestUploadEndpoint:
         assert resp.status_code == 200
 
 
+# ===================== UPLOAD CACHE =====================
+
+class TestUploadCache:
+    def _post(self):
+        return client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv", io.BytesIO(_aws_cur_csv()), "text/csv")},
+            data={"no_forecast": "true", "use_cache": "true"},
+        )
+
+    def test_disabled_without_server_cache_dir(self, monkeypatch):
+        monkeypatch.setattr(api, "CACHE_DIR", None)
+        assert self._post().status_code == 400
+
+    def test_stores_in_server_cache_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(api, "CACHE_DIR", str(tmp_path))
+        first, second = self._post(), self._post()
+        assert first.status_code == second.status_code == 200
+        assert first.json()["leaks"] == second.json()["leaks"]
+        assert len(list(tmp_path.iterdir())) == 1
+
+
+# ===================== UPLOAD SPOOLING =====================
+
+class TestSpoolUpload:
+    def _upload(self, data: bytes):
+        from fastapi import UploadFile
+        return UploadFile(io.BytesIO(data), filename="cur.csv")
+
+    def test_spools_and_rewinds(self):
+        spool = asyncio.run(api.spool_upload(self._upload(_aws_cur_csv())))
+        assert spool.read() == _aws_cur_csv()
+
+    def test_large_upload_rolls_to_disk(self, monkeypatch):
+        monkeypatch.setattr(api, "UPLOAD_SPOOL_BYTES", 64)
+        monkeypatch.setattr(api, "UPLOAD_CHUNK_BYTES", 16)
+        spool = asyncio.run(api.spool_upload(self._upload(_aws_cur_csv())))
+        assert spool._rolled
+
+    def test_oversized_upload_rejected(self):
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(api.spool_upload(self._upload(_aws_cur_csv()), max_bytes=100))
+        assert exc_info.value.status_code == 413
+
+    def test_zstd_upload_returns_200(self):
+        import pyarrow as pa
+        sink = pa.BufferOutputStream()
+        with pa.CompressedOutputStream(sink, "zstd") as out:
+            out.write(_aws_cur_csv())
+        resp = client.post(
+            "/api/analyze/upload",
+            files={"file": ("cur.csv.zst", io.BytesIO(sink.getvalue().to_pybytes()), "application/zstd")},
+            data={"no_forecast": "true", "engine": "pyarrow"},
+        )
+        assert resp.status_code == 200
+
+
 # ===================== AWS CREDENTIALS ENDPOINT =====================
 
 class TestAWSCredentialsEndpoint:
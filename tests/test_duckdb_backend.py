@@ -0,0 +1,160 @@
+"""Tests for src/duckdb_backend.py — out-of-core results match the in-memory pipeline."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.normalization.normalize import normalize_billing_df
+from src.pipeline import run_pipeline_from_df, run_pipeline_out_of_core
+from src.intelligence.feature_engineering.cost_features import resource_features
+from src.intelligence.leak_detection.ri_detector import detect_reserved_instance_waste
+from src.intelligence.leak_detection.structural import (
+    detect_orphaned_storage,
+    detect_snapshot_sprawl,
+)
+
+try:
+    import duckdb  # noqa: F401
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+
+def _raw_cur(n_days: int = 20) -> pd.DataFrame:
+    end = date(2024, 3, 31)
+    resources = [
+        # (resource_id, service, region, hourly cost, usage, owner, usage type)
+        ("i-001",    "AmazonEC2", "us-east-1", 4.0,  10.0, "team-a",  "BoxUsage:m5.large"),
+        ("vol-001",  "AmazonEBS", "us-east-1", 0.5,  1.0,  None,      "EBS:VolumeUsage.gp3"),
+        ("vol-002",  "AmazonEBS", "eu-west-1", 0.8,  1.0,  None,      "EBS:VolumeUsage.gp3"),  # no compute in eu-west-1
+        ("snap-001", "AWSBackup-Snapshot", "us-east-1", 0.3, 1.0, None, "EBS:SnapshotUsage"),
+        ("db-001",   "AmazonRDS", "us-east-1", 9.0,  0.1,  "unknown", "InstanceUsage:db.r5.large"),
+    ]
+    rows = []
+    for i in range(n_days):
+        day = end - timedelta(days=n_days - 1 - i)
+        for hour in (0, 12):
+            for rid, service, region, cost, usage, owner, usage_type in resources:
+                rows.append({
+                    "line_item_usage_start_date": f"{day}T{hour:02d}:00:00Z",
+                    "line_item_usage_account_id": "012345678901",
+                    "line_item_line_item_type":   "Usage",
+                    "line_item_usage_type":       usage_type,
+                    "product_servicecode":        service,
+                    "line_item_resource_id":      rid,
+                    "line_item_usage_amount":     usage,
+                    "line_item_unblended_cost":   cost * (1 + i / 10),
+                    "product_region":             region,
+                    "reservation_unused_quantity":      None,
+                    "reservation_unused_recurring_fee": None,
+                    "resource_tags_user_owner":   owner,
+                })
+    rows.append({**rows[0], "line_item_line_item_type": "Tax", "line_item_unblended_cost": 9.0})
+    # Zero cost: kept as RI-covered usage, dropped without usage
+    rows.append({**rows[0], "line_item_line_item_type": "DiscountedUsage", "line_item_unblended_cost": 0.0})
+    rows.append({**rows[0], "line_item_line_item_type": "Credit", "line_item_unblended_cost": 0.0,
+                 "line_item_usage_amount": None})
+    rows.append({**rows[0], "line_item_line_item_type": "SavingsPlanNegation",
+                 "line_item_resource_id": None, "line_item_unblended_cost": 40.0})
+    rows.append({**rows[0], "line_item_line_item_type": "RIFee", "line_item_resource_id": None,
+                 "line_item_unblended_cost": 30.0, "reservation_unused_quantity": 5,
+                 "reservation_unused_recurring_fee": 25.0})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def cur_csv(tmp_path):
+    path = tmp_path / "cur.csv"
+    _raw_cur().to_csv(path, index=False)
+    return str(path)
+
+
+class TestWithoutDuckdb:
+    @pytest.mark.skipif(HAS_DUCKDB, reason="duckdb installed")
+    def test_out_of_core_raises(self, cur_csv):
+        with pytest.raises(ValueError, match="duckdb"):
+            run_pipeline_out_of_core([cur_csv])
+
+
+class TestOutOfCore:
+    @pytest.fixture(autouse=True)
+    def _duckdb(self):
+        pytest.importorskip("duckdb")
+
+    @pytest.fixture
+    def analysis(self, cur_csv):
+        from src.duckdb_backend import analyze
+        return analyze([cur_csv])
+
+    @pytest.fixture
+    def normalized(self):
+        return normalize_billing_df(_raw_cur(), "aws")
+
+    def test_daily_rows_match_pandas(self, analysis, normalized):
+        assert analysis["daily_rows"] == len(normalized)
+        assert analysis["line_items"] == len(_raw_cur()) - 2  # Tax and the zero-cost credit dropped
+
+    def test_features_match_pandas(self, analysis, normalized):
+        pd.testing.assert_frame_equal(
+            analysis["resource_df"], resource_features(normalized),
+            check_dtype=False, check_index_type=False,
+        )
+
+    def test_structural_detectors_match_pandas(self, analysis, normalized):
+        ids = lambda leaks: sorted(l["resource_id"] for l in leaks)
+        assert ids(analysis["orphaned_leaks"]) == ids(detect_orphaned_storage(normalized)) == ["vol-002"]
+        # Snapshots are checked in pandas, on the resource-grain totals
+        assert ids(detect_snapshot_sprawl(analysis["resource_totals"])) == \
+            ids(detect_snapshot_sprawl(normalized)) == ["snap-001"]
+
+    def test_ri_rows_cover_ri_detector(self, analysis, normalized):
+        assert detect_reserved_instance_waste(analysis["ri_rows"]) == detect_reserved_instance_waste(normalized)
+
+    def test_pipeline_matches_in_memory(self, cur_csv):
+        expected = run_pipeline_from_df(_raw_cur(), provider="aws")
+        result = run_pipeline_out_of_core([cur_csv])
+        assert result["leaks"] == expected["leaks"]
+        assert result["forecasts"] == expected["forecasts"]
+        assert result["pipeline_stats"]["backend"] == "duckdb"
+
+    def test_parquet_slash_headers_and_date_window(self, tmp_path):
+        from src.duckdb_backend import analyze
+        from src.normalization.aws_normalizer import _SLASH_TO_UNDERSCORE
+
+        to_slash = {v: k for k, v in _SLASH_TO_UNDERSCORE.items()}
+        path = tmp_path / "cur.parquet"
+        _raw_cur().rename(columns=to_slash).to_parquet(path, index=False)
+
+        result = analyze([str(path)], since=date(2024, 3, 25), until=date(2024, 3, 30))
+        days = result["daily_cost_df"]["date"]
+        assert days.min() == pd.Timestamp("2024-03-25")
+        assert days.max() == pd.Timestamp("2024-03-30")
+
+    def test_gzip_parts_are_combined(self, tmp_path):
+        from src.duckdb_backend import analyze
+
+        raw = _raw_cur()
+        half = len(raw) // 2
+        raw.iloc[:half].to_csv(tmp_path / "part-1.csv.gz", index=False)
+        raw.iloc[half:].to_csv(tmp_path / "part-2.csv.gz", index=False)
+
+        result = analyze([str(tmp_path / "part-1.csv.gz"), str(tmp_path / "part-2.csv.gz")])
+        assert result["daily_rows"] == len(normalize_billing_df(raw, "aws"))
+
+    def test_non_aws_input_raises(self, tmp_path):
+        from src.duckdb_backend import analyze
+
+        path = tmp_path / "azure.csv"
+        pd.DataFrame({"SubscriptionId": ["s"], "UsageDate": ["2024-03-01"],
+                      "MeterName": ["m"], "Cost": [1.0]}).to_csv(path, index=False)
+        with pytest.raises(ValueError, match="AWS CUR"):
+            analyze([str(path)])
+
+    def test_scratch_directory_removed(self, cur_csv, tmp_path):
+        from src.duckdb_backend import analyze
+
+        spill = tmp_path / "spill"
+        spill.mkdir()
+        analyze([cur_csv], spill_dir=str(spill), memory_limit="256MB")
+        assert list(spill.iterdir()) == []
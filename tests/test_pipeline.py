@@ -1,54 +1,15 @@
-"""Tests for src/pipeline.py — provider detection, deduplication, pipeline integration."""
+"""Tests for src/pipeline.py — deduplication, pipeline integration."""
 
 from datetime import date, timedelta
 
 import pandas as pd
 import pytest
 
-from src.pipeline import dedupe_leaks, detect_provider, run_pipeline_from_df
-
-
-# ===================== detect_provider =====================
-
-class TestDetectProvider:
-    def test_aws_columns(self):
-        df = pd.DataFrame(columns=["line_item_usage_account_id", "line_item_line_item_type", "cost"])
-        assert detect_provider(df) == "AWS"
-
-    def test_azure_columns(self):
-        df = pd.DataFrame(columns=["SubscriptionId", "UsageDate", "MeterName"])
-        assert detect_provider(df) == "AZURE"
-
-    def test_gcp_columns(self):
-        df = pd.DataFrame(columns=["billing_account_id", "project_id", "service_description"])
-        assert detect_provider(df) == "GCP"
-
-    def test_override_lowercases(self):
-        df = pd.DataFrame(columns=["line_item_usage_account_id"])
-        assert detect_provider(df, override="aws") == "AWS"
-
-    def test_override_ignores_columns(self):
-        # Even if columns look like Azure, override wins
-        df = pd.DataFrame(columns=["SubscriptionId", "UsageDate", "MeterName"])
-        assert detect_provider(df, override="gcp") == "GCP"
-
-    def test_provider_column_present(self):
-        df = pd.DataFrame({"provider": ["azure"]})
-        assert detect_provider(df) == "AZURE"
-
-    def test_ambiguous_raises(self):
-        df = pd.DataFrame(columns=["some_unknown_column"])
-        with pytest.raises(ValueError, match="Ambiguous or unknown"):
-            detect_provider(df)
-
-    def test_multiple_matched_raises(self):
-        # Columns from both AWS and Azure — ambiguous
-        df = pd.DataFrame(columns=[
-            "line_item_usage_account_id",  # AWS signal
-            "SubscriptionId",              # Azure signal
-        ])
-        with pytest.raises(ValueError):
-            detect_provider(df)
+from src.pipeline import (
+    _serialize,
+    dedupe_leaks,
+    run_pipeline_from_df,
+)
 
 
 # ===================== dedupe_leaks =====================
@@ -89,6 +50,16 @@ class TestDedupeLeaks:
         assert len(dedupe_leaks([leak_a, leak_b])) == 1
 
 
+# ===================== _serialize =====================
+
+class TestSerialize:
+    def test_billing_timestamp_becomes_iso_day(self):
+        assert _serialize({"d": [pd.Timestamp(2024, 3, 1)]}) == {"d": ["2024-03-01"]}
+
+    def test_date_object_still_supported(self):
+        assert _serialize(date(2024, 3, 1)) == "2024-03-01"
+
+
 # ===================== run_pipeline_from_df =====================
 
 class TestRunPipelineFromDf:
@@ -140,6 +111,15 @@ class TestRunPipelineFromDf:
         )
         assert result["pipeline_stats"]["provider"] == "AWS"
 
+    def test_already_daily_skips_aggregation(self):
+        hourly = pd.concat([self._make_df(), self._make_df()], ignore_index=True)
+        stats = [
+            run_pipeline_from_df(hourly, provider="AWS", no_forecast=True,
+                                 already_normalized=True, already_daily=daily)["pipeline_stats"]
+            for daily in (False, True)
+        ]
+        assert [s["normalized_records"] for s in stats] == [20, 40]
+
     def test_no_dates_in_output(self):
         """All date objects must be serialized to ISO strings."""
         import datetime
@@ -184,3 +164,45 @@ class TestRunPipelineFromDf:
         )
         s = result["summary"]
         assert abs(s["estimated_annual_waste_usd"] - s["estimated_monthly_waste_usd"] * 12) < 0.01
+
+    def test_ri_detection_on_normalized_input(self):
+        # Manifest loads arrive normalized but still carry the CUR line item type
+        df = self._make_df()
+        df["line_item_line_item_type"] = "Usage"
+        df.loc[0, "line_item_line_item_type"] = "SavingsPlanNegation"
+        df.loc[0, "cost"] = 50.0
+        result = run_pipeline_from_df(
+            df,
+            provider="AWS",
+            no_forecast=True,
+            already_normalized=True,
+        )
+        assert any(l["leak_type"] == "RI_SAVINGS_PLAN_WASTE" for l in result["leaks"])
+
+    def test_ri_detection_on_raw_cur(self):
+        n = 5
+        raw = pd.DataFrame({
+            "line_item_usage_start_date":       ["2024-03-01T00:00:00Z"] * n,
+            "line_item_usage_account_id":       ["012345678901"] * n,
+            "line_item_line_item_type":         ["Usage"] * n,
+            "product_servicecode":              ["AmazonEC2"] * n,
+            "line_item_resource_id":            [f"i-{i}" for i in range(n)],
+            "line_item_usage_amount":           [1.0] * n,
+            "line_item_unblended_cost":         [5.0] * n,
+            "product_region":                   ["us-east-1"] * n,
+            "reservation_unused_quantity":      [0, 0, 0, 4, 0],
+            "reservation_unused_recurring_fee": [0, 0, 0, 80.0, 0],
+        })
+        result = run_pipeline_from_df(raw, provider="aws", no_forecast=True)
+        assert any(l["leak_type"] == "RI_UNUSED_RESERVATION" for l in result["leaks"])
+
+    def test_multi_provider_frame_keeps_row_providers(self):
+        aws = self._make_df()
+        azure = self._make_df().assign(provider="AZURE", service="Virtual Machines")
+        result = run_pipeline_from_df(
+            pd.concat([aws, azure], ignore_index=True),
+            no_forecast=True,
+            already_normalized=True,
+        )
+        assert result["pipeline_stats"]["providers"] == ["AWS", "AZURE"]
+        assert {l["provider"] for l in result["leaks"]} <= {"AWS", "AZURE"}
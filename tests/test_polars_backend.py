@@ -0,0 +1,81 @@
+"""Tests for src/polars_backend.py — parity with the pandas stages."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.normalization.normalize import normalize_billing_df
+from src.pipeline import run_pipeline_from_df
+from src.intelligence.feature_engineering.anomaly_features import compute_cost_zscore
+from src.intelligence.feature_engineering.cost_features import (
+    daily_cost_per_service,
+    resource_features,
+)
+
+
+def _raw_cur(n_days: int = 12) -> pd.DataFrame:
+    end = date(2024, 3, 31)
+    rows = []
+    for i in range(n_days):
+        day = end - timedelta(days=n_days - 1 - i)
+        for hour in (0, 12):
+            for rid, service, cost in (("i-001", "AmazonEC2", 3.0 + i), ("vol-001", "AmazonEBS", 0.5)):
+                rows.append({
+                    "line_item_usage_start_date": f"{day}T{hour:02d}:00:00Z",
+                    "line_item_usage_account_id": "012345678901",
+                    "line_item_line_item_type":   "Usage",
+                    "product_servicecode":        service,
+                    "line_item_resource_id":      rid,
+                    "line_item_usage_amount":     1.0,
+                    "line_item_unblended_cost":   cost,
+                    "product_region":             "us-east-1",
+                    "resource_tags_user_owner":   "team-a" if rid == "i-001" else None,
+                })
+    rows.append({**rows[0], "line_item_line_item_type": "Tax", "line_item_unblended_cost": 9.0})
+    # Zero cost: kept as RI-covered usage, dropped without usage
+    rows.append({**rows[0], "line_item_line_item_type": "DiscountedUsage", "line_item_unblended_cost": 0.0})
+    rows.append({**rows[0], "line_item_line_item_type": "Credit", "line_item_unblended_cost": 0.0,
+                 "line_item_usage_amount": None})
+    return pd.DataFrame(rows)
+
+
+class TestBackendSelection:
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError):
+            run_pipeline_from_df(_raw_cur(), provider="aws", backend="spark")
+
+    def test_polars_run_matches_pandas(self):
+        # Passes whether or not polars is installed — without it the run falls back
+        pandas_result = run_pipeline_from_df(_raw_cur(), provider="aws", no_forecast=True)
+        polars_result = run_pipeline_from_df(_raw_cur(), provider="aws", no_forecast=True,
+                                             backend="polars")
+        assert polars_result["leaks"] == pandas_result["leaks"]
+        assert polars_result["summary"] == pandas_result["summary"]
+
+
+class TestPolarsParity:
+    @pytest.fixture(autouse=True)
+    def _polars(self):
+        pytest.importorskip("polars")
+
+    def test_normalization_matches_pandas(self):
+        expected = normalize_billing_df(_raw_cur(), "aws")
+        result = normalize_billing_df(_raw_cur(), "aws", backend="polars")
+        pd.testing.assert_frame_equal(result, expected, check_categorical=False)
+
+    def test_features_match_pandas(self):
+        from src.polars_backend import compute_features
+
+        normalized = normalize_billing_df(_raw_cur(), "aws")
+        daily, resources = compute_features(normalized)
+
+        expected_daily = compute_cost_zscore(daily_cost_per_service(normalized))
+        pd.testing.assert_frame_equal(
+            daily.reset_index(drop=True),
+            expected_daily.astype({"provider": str, "service": str}).reset_index(drop=True),
+            check_dtype=False,
+        )
+        pd.testing.assert_frame_equal(
+            resources, resource_features(normalized), check_dtype=False, check_index_type=False,
+        )